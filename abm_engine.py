@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+abm_engine.py — Motor ABM genérico local con salidas seleccionables.
+
+Misma parametrización que el motor de caso_clima (grid_size, diffusion, noise,
+macro_coupling, forcing_series, forcing_scale, damping, ode_alpha/ode_beta,
+assimilation_series/assimilation_strength), pero el bucle de pasos vive aquí
+para poder controlar qué se guarda:
+
+    x_ij(t+1) = x_ij + D·(⟨x⟩_vecinos − x_ij) + fs·F_t + κ·(m_t − x_ij)
+                − γ·x_ij + σ·ξ_ij + λ·(a_t − x_ij)
+    m(t+1)    = m + α·(F_t − β·m)
+
+- ``outputs=("tbar",)`` evita construir la historia de la retícula.
+- Si se pide ``"grid"``, la historia se escribe en un arreglo preasignado y
+  mapeado en memoria (``GridHistory``) en lugar de listas anidadas, de modo
+  que el RSS pico no crece con grid_size² × steps. Quien la pide la libera
+  con ``close_outputs(result)`` (o ``with result["grid"]``).
+- ``observers`` recibe ``observe(t, grid, forcing_t)`` en cada paso para
+  calcular indicadores en línea (ver online_indicators.py).
+
+La actualización por defecto (``kernel="rows"``, ``_step_rows``) es un
+estencil de 5 puntos en Python puro aplicado fila a fila: las filas vecinas
+y desplazadas se recorren con ``zip`` en comprensiones de listas y el ruido
+de cada fila se sortea en bloque. No está vectorizado (no hay numpy): evita
+la indexación por celda y rinde 1.1–2.5× el kernel celda a celda (ver
+bench_abm.py). Costo O(N²) por paso con N = grid_size y memoria O(N²) para
+el estado. Opciones en ``params``:
+
+    boundary        "periodic" (toro, por defecto) o "fixed" (vecinos fuera
+                    de la retícula valen ``boundary_value``, por defecto t0)
+    dtype           "float64" (por defecto) o "float32": el estado y la
+                    historia se guardan en ``array('f')``, la mitad de memoria
+
+``kernel="cell"`` conserva la actualización celda a celda original como
+referencia: la parte determinista coincide hasta redondeo y el ruido sólo
+en distribución (lo verifica tests/test_abm_engine.py).
+"""
+
+import math
+import mmap
+import random
+import tempfile
+from array import array
+
+_TAU = 2.0 * math.pi
+_sqrt, _log, _cos, _sin = math.sqrt, math.log, math.cos, math.sin
+
+DEFAULT_OUTPUTS = ("tbar", "grid", "forcing")
+
+# A partir de este número de valores (steps × n × n) la historia va a disco
+# aunque no se haya pedido explícitamente un archivo
+MEMMAP_THRESHOLD = 1_000_000
+
+
+class GridHistory:
+    """Historia (steps, n, n) de la retícula respaldada por un archivo mmap.
+
+    Se comporta como una secuencia de fotogramas: ``history[t]`` devuelve la
+    retícula del paso t como lista de filas, materializada sólo al acceder,
+    así las métricas post-hoc que esperan ``grid[t][i][j]`` siguen funcionando.
+    ``close()`` (o salir del bloque ``with``) libera el mapeo y el archivo.
+    """
+
+    def __init__(self, steps, n, path=None, typecode="d"):
+        self.steps = steps
+        self.n = n
+        self.typecode = typecode
+        self.path = path
+        size = max(1, steps * n * n) * array(typecode).itemsize
+        if path is None:
+            self._fh = tempfile.TemporaryFile(prefix="grid_history_")
+        else:
+            self._fh = open(path, "w+b")
+        self._fh.truncate(size)
+        self._mm = mmap.mmap(self._fh.fileno(), size)
+        self._view = memoryview(self._mm).cast(typecode)
+        self._len = 0
+
+    def append(self, grid):
+        if self._len >= self.steps:
+            raise IndexError("GridHistory llena")
+        n = self.n
+        off = self._len * n * n
+        for i, row in enumerate(grid):
+            self._view[off + i * n: off + (i + 1) * n] = array(self.typecode, row)
+        self._len += 1
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, t):
+        if isinstance(t, slice):
+            return [self[k] for k in range(*t.indices(self._len))]
+        if t < 0:
+            t += self._len
+        if not 0 <= t < self._len:
+            raise IndexError(t)
+        n = self.n
+        off = t * n * n
+        return [self._view[off + i * n: off + (i + 1) * n].tolist() for i in range(n)]
+
+    def __iter__(self):
+        for t in range(self._len):
+            yield self[t]
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if self._mm is None:
+            return
+        self._view.release()
+        self._mm.close()
+        self._fh.close()
+        self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def close_outputs(result):
+    """Libera la historia mapeada de un resultado de ``simulate_abm``, si la hay."""
+    history = result.get("grid")
+    if isinstance(history, GridHistory):
+        history.close()
+
+
+def _step_cells(grid, n, params, forcing_t, macro, assim_t, rng):
+    """Actualiza la retícula celda por celda (frontera periódica)."""
+    diff = params["diffusion"]
+    fs = params["forcing_scale"]
+    kappa = params["macro_coupling"]
+    damp = params["damping"]
+    sigma = params["noise"]
+    lam = params.get("assimilation_strength", 0.0) if assim_t is not None else 0.0
+    drive = fs * forcing_t
+
+    new = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        up = grid[i - 1]
+        row = grid[i]
+        down = grid[(i + 1) % n]
+        for j in range(n):
+            x = row[j]
+            nb = 0.25 * (up[j] + down[j] + row[j - 1] + row[(j + 1) % n])
+            v = x + diff * (nb - x) + drive + kappa * (macro - x) - damp * x
+            v += sigma * rng.gauss(0.0, 1.0)
+            if lam:
+                v += lam * (assim_t - x)
+            new[i][j] = v
+    return new
+
+
+def normal_row(rand, n, mu, sigma):
+    """n normales N(mu, sigma²) por Box-Muller en bloque (≈2× más rápido que gauss)."""
+    half = (n + 1) // 2
+    radius = [sigma * _sqrt(-2.0 * _log(1.0 - rand())) for _ in range(half)]
+    angle = [_TAU * rand() for _ in range(half)]
+    row = [mu + r * _cos(a) for r, a in zip(radius, angle)]
+    row += [mu + r * _sin(a) for r, a in zip(radius, angle)]
+    return row[:n]
+
+
+def _step_rows(grid, n, coef, bias, sigma, rand, boundary, fill, pack):
+    """Un paso del estencil de 5 puntos, fila a fila en Python puro: O(n²) por paso.
+
+    x' = c0·x + cd·(arriba + abajo + izq + der) + bias + σ·ξ. El ruido de cada
+    fila se sortea en bloque, así que coincide con ``_step_cells`` en
+    distribución pero no en la secuencia exacta de números aleatorios.
+    """
+    c0, cd = coef
+    periodic = boundary == "periodic"
+    edge = grid[0][:0] + pack([fill]) if pack else [fill]
+    fill_row = pack([fill] * n) if pack else [fill] * n
+    new = []
+    for i in range(n):
+        row = grid[i]
+        if periodic:
+            up = grid[i - 1]
+            down = grid[i + 1 - n]
+            left = row[-1:] + row[:-1]
+            right = row[1:] + row[:1]
+        else:
+            up = grid[i - 1] if i > 0 else fill_row
+            down = grid[i + 1] if i < n - 1 else fill_row
+            left = edge + row[:-1]
+            right = row[1:] + edge
+        if sigma:
+            shock = normal_row(rand, n, bias, sigma)
+            vals = [c0 * x + cd * (u + d + l + r) + z
+                    for x, u, d, l, r, z in zip(row, up, down, left, right, shock)]
+        else:
+            vals = [c0 * x + cd * (u + d + l + r) + bias
+                    for x, u, d, l, r in zip(row, up, down, left, right)]
+        new.append(pack(vals) if pack else vals)
+    return new
+
+
+def simulate_abm(params, steps, seed=0, outputs=DEFAULT_OUTPUTS, history_path=None,
+                 observers=(), kernel="rows"):
+    """Simula el ABM y devuelve sólo las salidas pedidas.
+
+    outputs: subconjunto de ``("tbar", "grid", "forcing")``.
+    history_path: archivo donde mapear la historia de la retícula; si es None
+    se usa un temporal cuando la historia supera ``MEMMAP_THRESHOLD`` valores.
+    observers: objetos con ``observe(t, grid, forcing_t)``, llamados con la
+    retícula de cada paso (la misma que quedaría en la historia).
+    kernel: "rows" (por defecto, fila a fila) o "cell" (referencia, sólo
+    periódica/float64).
+    """
+    unknown = set(outputs) - set(DEFAULT_OUTPUTS)
+    if unknown:
+        raise ValueError(f"Salidas desconocidas: {sorted(unknown)}")
+    boundary = params.get("boundary", "periodic")
+    if boundary not in ("periodic", "fixed"):
+        raise ValueError(f"Frontera desconocida: {boundary}")
+    dtype = params.get("dtype", "float64")
+    if dtype not in ("float64", "float32"):
+        raise ValueError(f"dtype no soportado: {dtype}")
+    if kernel not in ("rows", "cell"):
+        raise ValueError(f"Kernel desconocido: {kernel}")
+    if kernel == "cell" and (boundary != "periodic" or dtype != "float64"):
+        raise ValueError("kernel='cell' sólo admite frontera periódica y float64")
+    typecode = "f" if dtype == "float32" else "d"
+    pack = (lambda vals: array("f", vals)) if typecode == "f" else None
+
+    rng = random.Random(seed)
+    n = params["grid_size"]
+    forcing = params["forcing_series"]
+    assim = params.get("assimilation_series")
+    alpha = params.get("ode_alpha", 0.0)
+    beta = params.get("ode_beta", 0.0)
+
+    h0 = params.get("h0", 0.0) * params["noise"]
+    grid = [[params["t0"] + h0 * rng.gauss(0.0, 1.0) for _ in range(n)] for _ in range(n)]
+    if pack:
+        grid = [pack(row) for row in grid]
+    macro = params["t0"]
+
+    history = None
+    if "grid" in outputs:
+        if history_path is not None or steps * n * n >= MEMMAP_THRESHOLD or pack:
+            history = GridHistory(steps, n, path=history_path, typecode=typecode)
+        else:
+            history = []
+
+    # Coeficientes del estencil: x' = c0·x + cd·Σvecinos + bias + σ·ξ
+    diff = params["diffusion"]
+    kappa = params["macro_coupling"]
+    sigma = params["noise"]
+    lam = params.get("assimilation_strength", 0.0) if assim is not None else 0.0
+    c0 = 1.0 - diff - kappa - params["damping"] - lam
+    coef = (c0, 0.25 * diff)
+    fill = params.get("boundary_value", params["t0"])
+    rand = rng.random
+
+    tbar = []
+    inv_cells = 1.0 / (n * n)
+    try:
+        for t in range(steps):
+            tbar.append(sum(map(sum, grid)) * inv_cells)
+            if history is not None:
+                history.append(grid)
+            for obs in observers:
+                obs.observe(t, grid, forcing[t])
+            assim_t = assim[t] if assim is not None else None
+            if kernel == "cell":
+                grid = _step_cells(grid, n, params, forcing[t], macro, assim_t, rng)
+            else:
+                bias = params["forcing_scale"] * forcing[t] + kappa * macro
+                if lam:
+                    bias += lam * assim_t
+                grid = _step_rows(grid, n, coef, bias, sigma, rand, boundary, fill, pack)
+            macro += alpha * (forcing[t] - beta * macro)
+    except BaseException:
+        if isinstance(history, GridHistory):
+            history.close()
+        raise
+
+    result = {}
+    if "tbar" in outputs:
+        result["tbar"] = tbar
+    if "grid" in outputs:
+        result["grid"] = history
+    if "forcing" in outputs:
+        result["forcing"] = list(forcing[:steps])
+    return result
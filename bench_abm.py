@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+bench_abm.py — Rendimiento del motor ABM local (celdas actualizadas por segundo).
+
+Mide ``abm_engine.simulate_abm`` con salida sólo ``tbar`` desde 10×10 hasta
+1000×1000. El número de pasos se ajusta para que cada tamaño haga del orden
+de ``--budget`` actualizaciones de celda; al tiempo se le descuenta la
+inicialización (una corrida de 0 pasos). Con ``--compare-cell`` también mide
+el kernel celda a celda (hasta 300×300).
+
+Uso:
+    python3 repos/scripts/bench_abm.py
+    python3 repos/scripts/bench_abm.py --dtype float32 --boundary fixed
+    python3 repos/scripts/bench_abm.py --compare-cell > bench_output.txt
+"""
+
+import argparse
+import math
+import time
+
+import abm_engine
+
+SIZES = [10, 50, 100, 250, 500, 1000]
+
+
+def _params(n, steps, args):
+    forcing = [0.003 * t + 0.5 * math.sin(2.0 * math.pi * t / 12) for t in range(steps)]
+    return {
+        "grid_size": n, "diffusion": 0.2, "noise": 0.02, "macro_coupling": 0.4,
+        "t0": 0.0, "h0": 0.5, "forcing_series": forcing, "forcing_scale": 0.1,
+        "damping": 0.05, "ode_alpha": 0.05, "ode_beta": 0.02,
+        "boundary": args.boundary, "dtype": args.dtype,
+    }
+
+
+def _timed(params, steps, kernel):
+    """Segundos de ``steps`` pasos, sin contar la construcción de la retícula."""
+    t0 = time.perf_counter()
+    abm_engine.simulate_abm(params, 0, seed=1, outputs=("tbar",), kernel=kernel)
+    t1 = time.perf_counter()
+    abm_engine.simulate_abm(params, steps, seed=1, outputs=("tbar",), kernel=kernel)
+    t2 = time.perf_counter()
+    return max(1e-9, (t2 - t1) - (t1 - t0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del motor ABM local")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--budget", type=float, default=2e6,
+                        help="Actualizaciones de celda por tamaño (ajusta los pasos)")
+    parser.add_argument("--boundary", choices=["periodic", "fixed"], default="periodic")
+    parser.add_argument("--dtype", choices=["float64", "float32"], default="float64")
+    parser.add_argument("--compare-cell", action="store_true",
+                        help="Comparar con el kernel celda a celda (hasta 300×300)")
+    args = parser.parse_args()
+
+    print(f"# Motor ABM local — kernel fila a fila, frontera={args.boundary}, dtype={args.dtype}\n")
+    header = "| Retícula | Pasos | Segundos | Celdas/s |"
+    sep = "|---------:|------:|---------:|---------:|"
+    if args.compare_cell:
+        header += " Celdas/s (celda) | Aceleración |"
+        sep += "-----------------:|------------:|"
+    print(header)
+    print(sep)
+
+    for n in args.sizes:
+        steps = max(2, int(args.budget // (n * n)))
+        params = _params(n, steps, args)
+        secs = _timed(params, steps, "rows")
+        rate = n * n * steps / secs
+        line = f"| {n}×{n} | {steps} | {secs:.3f} | {rate:,.0f} |"
+        if args.compare_cell:
+            if n <= 300 and args.boundary == "periodic" and args.dtype == "float64":
+                secs_c = _timed(params, steps, "cell")
+                line += f" {n * n * steps / secs_c:,.0f} | {secs_c / secs:.2f}× |"
+            else:
+                line += " — | — |"
+        print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
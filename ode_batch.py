@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+ode_batch.py — Ensambles del modelo macro (ODE) integrados en lote.
+
+Forma supuesta del modelo macro (la de abm_engine y la que ajusta la
+regresión de ``calibrate_ode``):
+
+    T(t+1) = T + α·(F_t − β·T) + σ·ξ_t,   ξ_t ~ N(0, 1)
+
+Es lineal en T, así que cada trayectoria se separa en una parte
+determinista (depende de t0, α, β y del forzante) y una respuesta al ruido
+n(t+1) = (1 − αβ)·n + σ·ξ_t. ``simulate_ode_batch`` integra la parte
+determinista una sola vez por combinación (t0, α, β) y la comparte entre
+todas las semillas y valores de σ; el ruido se sortea en bloque
+(Box-Muller). Así un ensamble o un barrido de perfil de M = conjuntos ×
+semillas trayectorias cuesta milisegundos en vez de M llamadas a
+``simulate_ode``.
+
+caso_clima no está en este árbol: que su ``simulate_ode`` integre esta
+misma ecuación se comprueba en tiempo de ejecución con ``reference_gap``
+(σ = 0; regenerate_fair_metrics lo hace una vez por fase antes del barrido
+de perfil, y ``--check`` sobre 20 conjuntos). El ruido coincide sólo en
+distribución.
+
+Uso:
+    python3 repos/scripts/ode_batch.py --check
+"""
+
+import math
+import random
+
+import shared_series
+from abm_engine import normal_row
+
+
+def simulate_ode_batch(param_sets, steps, seeds=(0,), forcing=None):
+    """Trayectorias (M, steps) con M = len(param_sets) × len(seeds).
+
+    Cada conjunto de ``param_sets`` usa ``ode_alpha``, ``ode_beta``,
+    ``ode_noise`` (0 por defecto), ``t0`` y ``forcing_series`` (lista o
+    ``SeriesHandle``); ``forcing`` reemplaza el forzante de todos. El orden de
+    salida es conjunto por conjunto y, dentro de cada uno, semilla por semilla.
+    """
+    deterministic = {}
+    rows = []
+    for p in param_sets:
+        source = forcing if forcing is not None else p["forcing_series"]
+        alpha, beta = p["ode_alpha"], p["ode_beta"]
+        t0 = p.get("t0", 0.0)
+        # Un handle identifica su serie; una lista, por identidad (sigue viva en p)
+        key = (t0, alpha, beta,
+               source if isinstance(source, shared_series.SeriesHandle) else id(source))
+        base = deterministic.get(key)
+        if base is None:
+            F = shared_series.resolve(source)
+            base = [0.0] * steps
+            x = t0
+            for t in range(steps):
+                base[t] = x
+                x += alpha * (F[t] - beta * x)
+            deterministic[key] = base
+
+        sigma = p.get("ode_noise", 0.0)
+        if not sigma:
+            rows.extend(list(base) for _ in seeds)
+            continue
+        decay = 1.0 - alpha * beta
+        for seed in seeds:
+            xi = normal_row(random.Random(seed).random, steps, 0.0, sigma)
+            row = [0.0] * steps
+            n = 0.0
+            for t in range(steps):
+                row[t] = base[t] + n
+                n = decay * n + xi[t]
+            rows.append(row)
+    return rows
+
+
+def reference_gap(reference, params, steps):
+    """Diferencia máxima entre ``reference`` (tbar de ``simulate_ode`` con σ = 0
+    sobre ``params``) y la trayectoria determinista del lote."""
+    row = simulate_ode_batch([dict(params, ode_noise=0.0)], steps)[0]
+    return max(abs(a - b) for a, b in zip(row, reference))
+
+
+def profile_scan(obs, forcing, t0, alpha, beta, span=0.5, points=11, simulate=None):
+    """Barrido de perfil del RMSE determinista en la caja (α, β)·(1 ± span).
+
+    Devuelve ``{"alpha": [...], "beta": [...], "rmse": [[...]]}`` con filas
+    por α y columnas por β; el mínimo indica qué tan bien identificada quedó
+    la calibración en forma cerrada. Con ``simulate(params, pasos) → tbar``
+    cada punto se integra con ese modelo en vez del lote (cuando
+    ``reference_gap`` muestra que el lote no lo reproduce).
+    """
+    alphas = [alpha * (1.0 - span + 2.0 * span * i / (points - 1)) for i in range(points)]
+    betas = [beta * (1.0 - span + 2.0 * span * j / (points - 1)) for j in range(points)]
+    sets = [{"ode_alpha": a, "ode_beta": b, "t0": t0} for a in alphas for b in betas]
+    obs = shared_series.resolve(obs)
+    steps = len(obs)
+    if simulate is None:
+        sims = simulate_ode_batch(sets, steps, forcing=forcing)
+    else:
+        sims = [simulate(dict(p, forcing_series=forcing, ode_noise=0.0), steps) for p in sets]
+    errs = [math.sqrt(sum((s - o) ** 2 for s, o in zip(sim, obs)) / steps) for sim in sims]
+    return {
+        "alpha": alphas, "beta": betas,
+        "rmse": [errs[i * points:(i + 1) * points] for i in range(points)],
+    }
+
+
+def _check(steps=240, members=2000):
+    """Compara con simulate_ode de caso_clima (σ = 0) y mide el lote."""
+    import sys
+    import time
+    from pathlib import Path
+
+    clima_src = Path(__file__).resolve().parent.parent / "repos" / "Simulaciones" / "caso_clima" / "src"
+    sys.path.insert(0, str(clima_src))
+    from ode import simulate_ode
+
+    forcing = [0.003 * t + 0.5 * math.sin(2.0 * math.pi * t / 12) for t in range(steps)]
+    rng = random.Random(3)
+    sets = [{"ode_alpha": rng.uniform(0.01, 0.2), "ode_beta": rng.uniform(0.01, 0.5),
+             "ode_noise": 0.0, "t0": 0.0, "forcing_series": forcing} for _ in range(20)]
+    worst = max(reference_gap(simulate_ode(p, steps, seed=0)["tbar"], p, steps) for p in sets)
+
+    noisy = [dict(sets[0], ode_noise=0.01)]
+    seeds = range(members)
+    t0 = time.perf_counter()
+    simulate_ode_batch(noisy, steps, seeds=seeds)
+    t_batch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for s in range(200):
+        simulate_ode(noisy[0], steps, seed=s)
+    t_loop = (time.perf_counter() - t0) * members / 200
+
+    print(f"σ=0: diferencia máxima con simulate_ode = {worst:.2e}")
+    print(f"{members} trayectorias × {steps} pasos: lote {t_batch * 1000:.1f} ms | "
+          f"simulate_ode uno a uno ≈ {t_loop * 1000:.1f} ms")
+    ok = worst < 1e-9
+    print("✅" if ok else "❌")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    import sys
+    if "--check" in sys.argv:
+        sys.exit(_check())
+    print(__doc__)
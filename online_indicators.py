@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+online_indicators.py — Indicadores de symploké y no-localidad calculados en línea.
+
+Observadores para el bucle de pasos de ``abm_engine.simulate_abm``: cada uno
+recibe ``observe(t, grid, forcing_t)`` con la retícula del paso t y acumula,
+por celda, media y co-momentos al estilo Welford en arreglos planos
+(``array('d')``, actualizados en su lugar), sin guardar la historia: memoria
+O(n²) y costo O(n²) por paso.
+
+Calculan las definiciones documentadas de los indicadores:
+
+    internal  = media_ij corr_t(x_ij, tbar)
+    external  = media_ij |corr_t(x_ij, F)|
+    dominance = max_ij var_t(x_ij) / Σ_ij var_t(x_ij)
+
+Una correlación con varianza nula (celda o serie constante) no está definida:
+se toma 0 y se cuenta en ``degenerate``.
+
+Las funciones post-hoc de caso_clima (metrics.py) no están en este árbol, así
+que la equivalencia con ellas no está verificada aquí: por eso la fase usa la
+ruta con historia por defecto y estos acumuladores sólo con
+``cfg["online_indicators"]``. tests/test_online_indicators.py los compara
+con un cálculo en dos pasadas de las fórmulas de arriba sobre una retícula
+grabada; ``python3 online_indicators.py --check`` los compara con las
+funciones de caso_clima cuando está disponible.
+"""
+
+import math
+from array import array
+
+
+def _corr(cxy, m2x, m2y):
+    den = m2x * m2y
+    return cxy / math.sqrt(den) if den > 0.0 else None
+
+
+class CohesionAccumulator:
+    """Cohesión interna (celda ↔ tbar) vs externa (celda ↔ forzamiento)."""
+
+    def __init__(self):
+        self.n = 0
+        self.degenerate = 0
+
+    def _start(self, cells):
+        self.mx = array("d", bytes(8 * cells))  # media de cada celda
+        self.m2x = array("d", bytes(8 * cells))  # Σ (x − x̄)²
+        self.cxt = array("d", bytes(8 * cells))  # Σ (x − x̄)(tbar − t̄)
+        self.cxf = array("d", bytes(8 * cells))  # Σ (x − x̄)(F − F̄)
+        self.mt = self.m2t = self.mf = self.m2f = 0.0
+
+    def observe(self, t, grid, forcing_t):
+        cells = sum(len(row) for row in grid)
+        if self.n == 0:
+            self._start(cells)
+        self.n += 1
+        n = self.n
+        tbar = sum(map(sum, grid)) / cells
+        dt = tbar - self.mt
+        self.mt += dt / n
+        self.m2t += dt * (tbar - self.mt)
+        df = forcing_t - self.mf
+        self.mf += df / n
+        self.m2f += df * (forcing_t - self.mf)
+        et, ef = tbar - self.mt, forcing_t - self.mf
+        mx, m2x, cxt, cxf = self.mx, self.m2x, self.cxt, self.cxf
+        k = 0
+        for row in grid:
+            for x in row:
+                dx = x - mx[k]
+                mx[k] += dx / n
+                m2x[k] += dx * (x - mx[k])
+                cxt[k] += dx * et
+                cxf[k] += dx * ef
+                k += 1
+
+    def result(self):
+        """Devuelve (internal, external) según las definiciones del módulo."""
+        if self.n == 0:
+            return 0.0, 0.0
+        internal = external = 0.0
+        self.degenerate = 0
+        for m2x, cxt, cxf in zip(self.m2x, self.cxt, self.cxf):
+            r_int = _corr(cxt, m2x, self.m2t)
+            r_ext = _corr(cxf, m2x, self.m2f)
+            self.degenerate += (r_int is None) + (r_ext is None)
+            internal += r_int or 0.0
+            external += abs(r_ext or 0.0)
+        cells = len(self.mx)
+        return internal / cells, external / cells
+
+
+class DominanceAccumulator:
+    """Fracción de la varianza total concentrada en la celda más variable."""
+
+    def __init__(self):
+        self.n = 0
+
+    def observe(self, t, grid, forcing_t):
+        if self.n == 0:
+            cells = sum(len(row) for row in grid)
+            self.mx = array("d", bytes(8 * cells))
+            self.m2x = array("d", bytes(8 * cells))
+        self.n += 1
+        n = self.n
+        mx, m2x = self.mx, self.m2x
+        k = 0
+        for row in grid:
+            for x in row:
+                dx = x - mx[k]
+                mx[k] += dx / n
+                m2x[k] += dx * (x - mx[k])
+                k += 1
+
+    def result(self):
+        """Devuelve max_ij var / Σ_ij var (0 si no hay varianza)."""
+        if self.n == 0:
+            return 0.0
+        total = sum(self.m2x)
+        return max(self.m2x) / total if total > 0.0 else 0.0
+
+
+def _check(grid_size=12, steps=120, seed=7):
+    """Compara los acumuladores con las funciones post-hoc de caso_clima."""
+    import sys
+    from pathlib import Path
+
+    clima_src = Path(__file__).resolve().parent.parent / "repos" / "Simulaciones" / "caso_clima" / "src"
+    sys.path.insert(0, str(clima_src))
+    from metrics import dominance_share, internal_vs_external_cohesion
+
+    import abm_engine
+
+    forcing = [0.003 * t + 0.5 * math.sin(2.0 * math.pi * t / 12) for t in range(steps)]
+    params = {
+        "grid_size": grid_size, "diffusion": 0.2, "noise": 0.02, "macro_coupling": 0.4,
+        "t0": 0.0, "h0": 0.5, "forcing_series": forcing, "forcing_scale": 0.1,
+        "damping": 0.05, "ode_alpha": 0.05, "ode_beta": 0.02,
+    }
+    cohesion, dominance = CohesionAccumulator(), DominanceAccumulator()
+    sim = abm_engine.simulate_abm(params, steps, seed=seed, observers=[cohesion, dominance])
+    internal, external = internal_vs_external_cohesion(sim["grid"], sim["forcing"])
+    online_int, online_ext = cohesion.result()
+    dom_post = dominance_share(sim["grid"])
+    dom_online = dominance.result()
+
+    print(f"internal : post-hoc={internal:.12f}  online={online_int:.12f}")
+    print(f"external : post-hoc={external:.12f}  online={online_ext:.12f}")
+    print(f"dominance: post-hoc={dom_post:.12f}  online={dom_online:.12f}")
+    worst = max(abs(internal - online_int), abs(external - online_ext), abs(dom_post - dom_online))
+    ok = worst < 1e-9
+    print(("✅" if ok else "❌") + f" diferencia máxima: {worst:.2e}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    import sys
+    if "--check" in sys.argv:
+        sys.exit(_check())
+    print(__doc__)
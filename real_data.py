@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+real_data.py — Carga de observaciones reales remuestreadas a grilla mensual.
+
+Lee series locales grandes sin volcarlas a listas de Python:
+
+- CSV (``.csv``/``.txt``): se recorre línea a línea con ``csv.reader``; de
+  cada fila sólo se toma el prefijo ``YYYY-MM`` de la fecha y el valor.
+- Binario (``.bin``/``.f64``): pares float64 little-endian (día, valor), con
+  día = días desde 1970-01-01. Se mapea en memoria y se procesa en bloques;
+  si los días vienen ordenados (``sorted`` lo comprueba en C, en tiempo
+  lineal sobre datos ya ordenados), cada mes se suma con ``math.fsum`` sobre
+  un slice del memoryview, sin bucle Python por fila salvo en los meses con
+  valores NaN. Los bloques desordenados se recorren fila a fila.
+
+Una sola pasada acumula suma y conteo por mes. De esos
+acumuladores salen ``coverage`` (meses con datos / meses esperados) y
+``outlier_share`` (meses cuya media se aleja más de 3.5 desviaciones MAD de
+la mediana), sin releer el archivo. El arreglo mensual se cachea en binario
+compacto (cabecera JSON + float64) indexado por ruta, tamaño, mtime y rango.
+
+Uso:
+    python3 repos/scripts/real_data.py datos.csv --start 2000-01 --end 2019-12
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "real_data"
+CACHE_VERSION = 1
+CHUNK_VALUES = 1 << 20  # valores float64 por bloque al leer binarios
+OUTLIER_MAD = 3.5
+
+
+def parse_month(text):
+    """'YYYY-MM[-DD...]' → (año, mes)."""
+    return int(text[:4]), int(text[5:7])
+
+
+def month_range(start, end):
+    """Lista de etiquetas 'YYYY-MM' entre start y end (inclusive)."""
+    y, m = parse_month(start)
+    y_end, m_end = parse_month(end)
+    months = []
+    while (y, m) <= (y_end, m_end):
+        months.append(f"{y:04d}-{m:02d}")
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return months
+
+
+class MonthlySeries:
+    """Serie mensual con huecos (NaN) y sus estadísticas de calidad."""
+
+    def __init__(self, months, values, counts, source):
+        self.months = months
+        self.values = values
+        self.counts = counts
+        self.source = source
+
+    @property
+    def observed_months(self):
+        return sum(1 for c in self.counts if c)
+
+    @property
+    def coverage(self):
+        return self.observed_months / len(self.months) if self.months else 0.0
+
+    @property
+    def outlier_share(self):
+        observed = [v for v, c in zip(self.values, self.counts) if c]
+        if len(observed) < 3:
+            return 0.0
+        med = _median(observed)
+        mad = 1.4826 * _median([abs(v - med) for v in observed])
+        if mad == 0.0:
+            return 0.0
+        outliers = sum(1 for v in observed if abs(v - med) / mad > OUTLIER_MAD)
+        return outliers / len(observed)
+
+    def filled(self):
+        """Serie sin huecos: interpolación lineal interna y extremos constantes."""
+        vals = list(self.values)
+        known = [i for i, c in enumerate(self.counts) if c]
+        if not known:
+            raise ValueError(f"{self.source}: sin observaciones en el rango pedido")
+        for i in range(known[0]):
+            vals[i] = vals[known[0]]
+        for i in range(known[-1] + 1, len(vals)):
+            vals[i] = vals[known[-1]]
+        for a, b in zip(known, known[1:]):
+            for i in range(a + 1, b):
+                w = (i - a) / (b - a)
+                vals[i] = vals[a] * (1.0 - w) + vals[b] * w
+        return vals
+
+    def data_info(self, split_index):
+        """Bloque ``data`` de metrics.json para esta serie."""
+        return {
+            "source": str(self.source),
+            "start": f"{self.months[0]}-01", "end": f"{self.months[-1]}-01",
+            "split": f"{self.months[split_index]}-01",
+            "expected_months": len(self.months),
+            "observed_months": self.observed_months,
+            "coverage": self.coverage,
+            "outlier_share": self.outlier_share,
+        }
+
+
+def _median(values):
+    s = sorted(values)
+    k = len(s) // 2
+    return s[k] if len(s) % 2 else 0.5 * (s[k - 1] + s[k])
+
+
+def _accumulate_csv(path, months, date_column, value_column, sums, counts):
+    index = {label: i for i, label in enumerate(months)}
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        di = header.index(date_column)
+        vi = header.index(value_column)
+        get = index.get
+        for row in reader:
+            try:
+                k = get(row[di][:7])
+                if k is None:
+                    continue
+                v = float(row[vi])
+            except (IndexError, ValueError):
+                continue
+            if v != v:  # NaN
+                continue
+            sums[k] += v
+            counts[k] += 1
+
+
+def _month_edges(months):
+    """Días desde 1970-01-01 en que empieza cada mes, más el fin del último."""
+    epoch = date(1970, 1, 1).toordinal()
+    edges = []
+    for label in months:
+        y, m = parse_month(label)
+        edges.append(date(y, m, 1).toordinal() - epoch)
+    y, m = parse_month(months[-1])
+    y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    edges.append(date(y, m, 1).toordinal() - epoch)
+    return edges
+
+
+def _scan_block(flat, lo, hi, months, edges, sums, counts):
+    """Acumula un bloque [lo, hi) de pares (día, valor) del memoryview."""
+    days = flat[lo:hi:2].tolist()
+    vals = flat[lo + 1:hi:2]
+    # Un día NaN deja la comparación con sorted() indefinida: va por filas
+    if days == sorted(days) and not math.isnan(math.fsum(days)):
+        # Ordenado: un corte por mes y fsum() sobre el slice
+        for k in range(len(months)):
+            a = bisect_left(days, edges[k])
+            b = bisect_left(days, edges[k + 1])
+            if b <= a:
+                continue
+            total = math.fsum(vals[a:b])
+            n = b - a
+            if total != total:  # hay NaN: filtrar este mes
+                clean = [v for v in vals[a:b] if v == v]
+                total, n = math.fsum(clean), len(clean)
+            sums[k] += total
+            counts[k] += n
+    else:
+        for d, v in zip(days, vals):
+            k = bisect_right(edges, d) - 1
+            if 0 <= k < len(months) and v == v:
+                sums[k] += v
+                counts[k] += 1
+
+
+def _accumulate_binary(path, months, sums, counts):
+    edges = _month_edges(months)
+    nbytes = os.path.getsize(path)
+    if nbytes == 0:
+        return
+    if nbytes % 16:
+        raise ValueError(f"{path}: tamaño no múltiplo de 16 bytes (pares float64 día, valor)")
+    chunk = CHUNK_VALUES - CHUNK_VALUES % 2
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as raw, raw.cast("d") as flat:
+            for lo in range(0, len(flat), chunk):
+                _scan_block(flat, lo, min(lo + chunk, len(flat)), months, edges, sums, counts)
+
+
+def _cache_path(path, start, end, date_column, value_column, cache_dir):
+    st = os.stat(path)
+    key = json.dumps([CACHE_VERSION, str(Path(path).resolve()), st.st_size, st.st_mtime_ns,
+                      start, end, date_column, value_column])
+    return Path(cache_dir) / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".monthly")
+
+
+def _read_cache(cache_file, source):
+    raw = cache_file.read_bytes()
+    head_len = int.from_bytes(raw[:4], "little")
+    header = json.loads(raw[4:4 + head_len].decode("utf-8"))
+    n = len(header["months"])
+    values = array("d")
+    values.frombytes(raw[4 + head_len:4 + head_len + 8 * n])
+    counts = array("q")
+    counts.frombytes(raw[4 + head_len + 8 * n:])
+    return MonthlySeries(header["months"], values.tolist(), counts.tolist(), source)
+
+
+def _write_cache(cache_file, series):
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    header = json.dumps({"months": series.months}).encode("utf-8")
+    tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(len(header).to_bytes(4, "little"))
+        fh.write(header)
+        fh.write(array("d", series.values).tobytes())
+        fh.write(array("q", series.counts).tobytes())
+    os.replace(tmp, cache_file)
+
+
+def load_monthly_series(path, start, end, date_column="date", value_column="value",
+                        cache_dir=CACHE_DIR):
+    """Carga ``path`` remuestreado a meses [start, end] (etiquetas 'YYYY-MM').
+
+    Devuelve un ``MonthlySeries``; los meses sin datos quedan en NaN con
+    conteo 0. Con ``cache_dir=None`` no se lee ni escribe caché.
+    """
+    path = Path(path)
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = _cache_path(path, start, end, date_column, value_column, cache_dir)
+        if cache_file.exists():
+            return _read_cache(cache_file, path)
+
+    months = month_range(start, end)
+    sums = [0.0] * len(months)
+    counts = [0] * len(months)
+    if path.suffix.lower() in (".bin", ".f64"):
+        _accumulate_binary(path, months, sums, counts)
+    else:
+        _accumulate_csv(path, months, date_column, value_column, sums, counts)
+
+    values = [s / c if c else float("nan") for s, c in zip(sums, counts)]
+    series = MonthlySeries(months, values, counts, path)
+    if cache_file is not None:
+        _write_cache(cache_file, series)
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remuestrea una serie real a grilla mensual")
+    parser.add_argument("path")
+    parser.add_argument("--start", required=True, help="Primer mes (YYYY-MM)")
+    parser.add_argument("--end", required=True, help="Último mes (YYYY-MM)")
+    parser.add_argument("--date-column", default="date")
+    parser.add_argument("--value-column", default="value")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    series = load_monthly_series(args.path, args.start, args.end, args.date_column,
+                                 args.value_column, None if args.no_cache else CACHE_DIR)
+    print(f"📈 {series.source}: {len(series.months)} meses")
+    print(f"   Observados: {series.observed_months} | Cobertura: {series.coverage:.3f} | "
+          f"Outliers: {series.outlier_share:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,37 @@ Solución: Re-ejecutar simulaciones con assimilation_strength=0.0 en AMBOS
 modelos (completo y reducido), como hacen caso_clima y caso_finanzas.
 
 Usa el motor genérico ABM/ODE de caso_clima.
+
+Uso:
+    python3 repos/scripts/regenerate_fair_metrics.py
+    python3 repos/scripts/regenerate_fair_metrics.py --resume 20260101T120000Z
+    python3 repos/scripts/regenerate_fair_metrics.py --workers 4 --plan
+
+Cada caso × fase terminado queda en runs/<run_id>/ (escritura atómica), de modo
+que una corrida interrumpida se retoma sin repetir trabajo. Para repartir una
+corrida entre varios procesos o máquinas, ver work_queue.py. Los eventos de la
+corrida se agregan a runs/ledger.jsonl (ver run_ledger.py).
+
+Con ``--workers N`` cada caso corre en su propio proceso, más largo primero
+según la bitácora, con el timeout y la memoria de ``case_budgets.regenerate``
+(tesis_manifest.json; sin timeout por defecto) y su salida en runs/<run_id>/logs/<caso>.log;
+``--plan`` sólo muestra el orden y el makespan esperado (ver scheduler.py).
 """
 
+import argparse
+import inspect
 import json
 import math
+import multiprocessing
 import os
 import random
+import signal
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
 # Agregar src de caso_clima al path para importar ABM/ODE/metrics
@@ -25,6 +48,22 @@ sys.path.insert(0, str(CLIMA_SRC))
 
 from abm import simulate_abm
 from ode import simulate_ode
+
+import abm_engine
+import cross_validation
+import ode_batch
+import real_data
+import response_surface
+import run_ledger
+import scheduler
+import sensitivity
+import sequential
+import series_store
+import shared_series
+import surrogates
+from online_indicators import CohesionAccumulator, DominanceAccumulator
+from rng_streams import DEFAULT_ROOT_SEED, SeedStream
+from shared_series import SharedSeries
 from metrics import (
     correlation, dominance_share, effective_information,
     internal_vs_external_cohesion, mean, rmse, variance, window_variance,
@@ -32,6 +71,10 @@ from metrics import (
 
 ROOT = Path(__file__).resolve().parent.parent
 CASES_DIR = ROOT / "TesisDesarrollo" / "02_Modelado_Simulacion"
+REPOS_SIM = ROOT / "repos" / "Simulaciones"
+RUNS_DIR = Path(__file__).resolve().parent / "runs"
+SERIES_DIRNAME = "series"  # dentro del directorio del caso, junto a metrics.json
+C3_TOLERANCE = 0.3  # diferencia máxima de varianza por ventanas entre corrida y réplica
 
 # ─── Casos a regenerar y sus parámetros de dominio ────────────────────────────
 
@@ -105,10 +148,8 @@ CASE_CONFIGS = {
 }
 
 
-def make_synthetic_data(steps, cfg, seed):
-    """Genera datos sintéticos con ODE + ruido micro correlacionado."""
-    rng_state = random.Random(seed)
-
+def make_forcing(steps, cfg):
+    """Forzamiento mensual: tendencia lineal + ciclo estacional."""
     forcing_base = 0.0
     forcing_trend = 0.003
     seasonal_amp = cfg["forcing_seasonal_amp"]
@@ -118,6 +159,17 @@ def make_synthetic_data(steps, cfg, seed):
     for t in range(steps):
         seasonal = seasonal_amp * math.sin(2.0 * math.pi * t / period)
         forcing.append(forcing_base + forcing_trend * t + seasonal)
+    return forcing
+
+
+def make_synthetic_data(steps, cfg, stream):
+    """Genera datos sintéticos con ODE + ruido micro correlacionado.
+
+    ``stream`` (SeedStream) provee flujos separados para la verdad ODE y el
+    ruido micro.
+    """
+    rng_state = stream.rng("micro_noise")
+    forcing = make_forcing(steps, cfg)
 
     # Generar verdad con ODE
     params = {
@@ -127,7 +179,7 @@ def make_synthetic_data(steps, cfg, seed):
         "ode_noise": cfg["ode_noise"],
         "forcing_series": forcing,
     }
-    truth = simulate_ode(params, steps, seed=seed + 1)
+    truth = simulate_ode(params, steps, seed=stream.seed("truth"))
 
     # Añadir ruido micro correlacionado (inercia)
     micro_noise = cfg["micro_noise"]
@@ -139,6 +191,99 @@ def make_synthetic_data(steps, cfg, seed):
     return obs, forcing
 
 
+def _accepts_outputs(fn):
+    """¿``fn`` acepta ``outputs=`` (o ``**kwargs``)?"""
+    try:
+        params = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "outputs" or p.kind is p.VAR_KEYWORD for p in params)
+
+
+# Sólo si el simulate_abm de caso_clima acepta outputs= se evita construir su
+# retícula; si no, se construye completa y se descarta al volver
+CLIMA_OUTPUTS = _accepts_outputs(simulate_abm)
+_CLIMA_GRID_WARNED = False
+
+
+class PhaseTimings:
+    """Cronómetros ligeros por etapa y contadores de simulación de una fase.
+
+    Las llamadas a ``simulate_abm``/``simulate_ode`` pasan por ``abm()``/``ode()``
+    para contar ejecuciones y pasos simulados sin necesidad de un profiler.
+    ``engine`` elige el motor ABM: "clima" (caso_clima) o "local" (abm_engine).
+    """
+
+    def __init__(self, engine="clima"):
+        self.engine = engine
+        self.stages = {}
+        self.abm_calls = 0
+        self.ode_calls = 0
+        self.simulated_steps = 0
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    def abm(self, params, steps, seed, outputs=("tbar",), observers=()):
+        """Ejecuta el ABM devolviendo sólo ``outputs``.
+
+        El motor local no construye lo que no se pide. El de caso_clima recibe
+        ``outputs`` si su ``simulate_abm`` lo acepta (``CLIMA_OUTPUTS``); si
+        no, construye la historia completa, que se descarta al volver (se
+        avisa una vez por proceso). ``observers`` sólo se admite con el motor
+        local.
+        """
+        global _CLIMA_GRID_WARNED
+        self.abm_calls += 1
+        self.simulated_steps += steps
+        if self.engine == "local":
+            return abm_engine.simulate_abm(shared_series.resolve_params(params), steps, seed=seed,
+                                           outputs=outputs, observers=observers)
+        if observers:
+            raise ValueError("observers requiere el motor local (abm_engine)")
+        # caso_clima espera listas: cada serie compartida se materializa una vez por proceso
+        clima_params = shared_series.resolve_params(params, materialize=True)
+        if CLIMA_OUTPUTS:
+            sim = simulate_abm(clima_params, steps, seed=seed, outputs=outputs)
+        else:
+            if "grid" not in outputs and not _CLIMA_GRID_WARNED:
+                _CLIMA_GRID_WARNED = True
+                print("  ⚠️  simulate_abm de caso_clima no acepta outputs=: la retícula se "
+                      "construye completa (--engine local la evita)")
+            sim = simulate_abm(clima_params, steps, seed=seed)
+        return {key: sim[key] for key in outputs}
+
+    def count_abm(self, runs, steps):
+        """Registra corridas ABM hechas fuera de ``abm()`` (p. ej. en un pool)."""
+        self.abm_calls += runs
+        self.simulated_steps += runs * steps
+
+    def count_ode(self, runs, steps):
+        """Registra trayectorias ODE integradas en lote (ode_batch)."""
+        self.ode_calls += runs
+        self.simulated_steps += runs * steps
+
+    def ode(self, params, steps, seed):
+        self.ode_calls += 1
+        self.simulated_steps += steps
+        return simulate_ode(shared_series.resolve_params(params, materialize=True), steps, seed=seed)
+
+    def as_dict(self):
+        return {
+            "stages": {k: round(v, 4) for k, v in self.stages.items()},
+            "total_seconds": round(time.perf_counter() - self._start, 4),
+            "abm_calls": self.abm_calls,
+            "ode_calls": self.ode_calls,
+            "simulated_steps": self.simulated_steps,
+        }
+
+
 def calibrate_ode(obs_train, forcing_train):
     """Calibra alpha, beta por regresión lineal sobre primeras diferencias."""
     n = len(obs_train) - 1
@@ -167,35 +312,395 @@ def calibrate_ode(obs_train, forcing_train):
     return alpha, beta
 
 
-def calibrate_abm(obs_train, base_params, steps):
-    """Búsqueda en grilla sin nudging — selecciona mejor combinación."""
-    best = (1e9, 0.1, 0.4, 0.05)
-    for fs in [0.1, 0.2, 0.4, 0.8]:
-        for mc in [0.4, 0.6, 0.8]:
-            for damp in [0.02, 0.05, 0.1]:
-                p = dict(base_params)
-                p["forcing_scale"] = fs
-                p["macro_coupling"] = mc
-                p["damping"] = damp
-                p["assimilation_strength"] = 0.0
-                sim = simulate_abm(p, steps, seed=2)
-                err = rmse(sim["tbar"], obs_train)
-                if err < best[0]:
-                    best = (err, fs, mc, damp)
-    return best[1], best[2], best[3]
+# Grilla de calibrate_abm y margen con que un óptimo local arrancado en la
+# calibración anterior se acepta frente al train_rmse guardado
+CALIBRATION_GRID = [
+    ("forcing_scale", [0.1, 0.2, 0.4, 0.8]),
+    ("macro_coupling", [0.4, 0.6, 0.8]),
+    ("damping", [0.02, 0.05, 0.1]),
+]
+WARM_START_TOLERANCE = 1.05
+ODE_BATCH_TOLERANCE = 1e-9  # ode_batch vs simulate_ode con σ = 0
+
+
+def _calibration_error(params, steps, seed, engine, obs_train):
+    """RMSE de un candidato de calibración (función de módulo, para el pool)."""
+    sim = PhaseTimings(engine).abm(params, steps, seed)
+    return rmse(sim["tbar"], shared_series.resolve(obs_train))
+
+
+def calibrate_abm(obs_train, base_params, steps, timings=None, seed=2, workers=None,
+                  warm_start=None):
+    """Búsqueda en grilla sin nudging — selecciona mejor combinación.
+
+    Todos los candidatos usan la misma ``seed`` (números aleatorios comunes).
+    ``obs_train`` puede ser una lista o un ``SeriesHandle``; con ``workers``
+    los candidatos se evalúan en un pool y cada worker se adjunta a las
+    series compartidas en vez de recibirlas serializadas.
+
+    Con ``warm_start`` (bloque ``calibration`` de un metrics.json anterior) se
+    parte del punto de la grilla más cercano al guardado y se desciende por
+    sus vecinos (±1 posición en cada eje) hasta un óptimo local. Se completa
+    la grilla si ese óptimo es peor que el ``train_rmse`` guardado (con
+    ``WARM_START_TOLERANCE``) o si el bloque no lo trae (metrics.json
+    anteriores a este campo): sin referencia no se puede aceptar un óptimo
+    local. Los puntos ya simulados no se repiten.
+
+    Devuelve ``{"forcing_scale", "macro_coupling", "damping", "train_rmse",
+    "simulations", "warm_start"}`` (``warm_start``: None, "local" o "fallback").
+    """
+    timings = timings or PhaseTimings()
+    axes = [values for _, values in CALIBRATION_GRID]
+    errors = {}  # índices en la grilla → RMSE
+    candidate = partial(_grid_candidate, base_params)
+
+    def score(indices):
+        todo = [idx for idx in indices if idx not in errors]
+        if workers and workers > 1 and len(todo) > 1:
+            evaluate = partial(_calibration_error, steps=steps, seed=seed, engine=timings.engine,
+                               obs_train=obs_train)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                errs = list(pool.map(evaluate, [candidate(idx) for idx in todo]))
+            timings.count_abm(len(todo), steps)
+        else:
+            obs = shared_series.resolve(obs_train)
+            errs = [rmse(timings.abm(candidate(idx), steps, seed=seed)["tbar"], obs)
+                    for idx in todo]
+        errors.update(zip(todo, errs))
+
+    mode = None
+    if warm_start:
+        idx = tuple(min(range(len(values)),
+                        key=lambda i: abs(values[i] - warm_start.get(key, values[i])))
+                    for key, values in CALIBRATION_GRID)
+        while True:
+            around = [idx] + [idx[:d] + (idx[d] + s,) + idx[d + 1:]
+                              for d in range(len(axes)) for s in (-1, 1)
+                              if 0 <= idx[d] + s < len(axes[d])]
+            score(around)
+            best = min(around, key=errors.__getitem__)
+            if best == idx:
+                break
+            idx = best
+        previous = warm_start.get("train_rmse")
+        mode = "local"
+        if previous is None or errors[idx] > previous * WARM_START_TOLERANCE:
+            mode = "fallback"
+    if mode in (None, "fallback"):
+        score(_grid_indices(axes))
+
+    # Mismo desempate que el recorrido original: primer mínimo en orden de grilla
+    best = min(sorted(errors), key=errors.__getitem__)
+    fitted = {key: values[i] for (key, values), i in zip(CALIBRATION_GRID, best)}
+    return dict(fitted, train_rmse=errors[best], simulations=len(errors), warm_start=mode)
+
+
+def _grid_candidate(base_params, idx):
+    """Parámetros del punto ``idx`` de CALIBRATION_GRID, sin nudging."""
+    p = dict(base_params)
+    for (key, values), i in zip(CALIBRATION_GRID, idx):
+        p[key] = values[i]
+    p["assimilation_strength"] = 0.0
+    return p
+
+
+def _grid_indices(axes):
+    """Índices de la grilla completa, en orden lexicográfico."""
+    out = [()]
+    for values in axes:
+        out = [idx + (i,) for idx in out for i in range(len(values))]
+    return out
+
+
+def calibrate_abm_surrogate(obs_train, base_params, steps, timings=None, seed=2, budget=24,
+                           workers=None, warm_start=None):
+    """Calibra forcing_scale, macro_coupling, damping, diffusion y noise con
+    ``budget`` simulaciones guiadas por una superficie de respuesta RBF.
+
+    Con ``warm_start`` el punto guardado entra en el diseño inicial, de modo
+    que la búsqueda nunca termina peor que la calibración anterior.
+    Devuelve ``{"params", "train_rmse", "simulations"}`` (ver response_surface).
+    """
+    timings = timings or PhaseTimings()
+    evaluate = partial(_calibration_error, steps=steps, seed=seed, engine=timings.engine,
+                       obs_train=obs_train)
+    fit = response_surface.calibrate(evaluate, dict(base_params, assimilation_strength=0.0),
+                                     budget=budget, seed=seed, workers=workers,
+                                     start=warm_start)
+    timings.count_abm(fit["simulations"], steps)
+    return fit
+
+
+def _trajectory(task, engine):
+    """tbar de una tarea ``(modelo, params, pasos, semilla)`` (función de módulo, para el pool)."""
+    model, params, steps, seed = task
+    timings = PhaseTimings(engine)
+    return (timings.abm if model == "abm" else timings.ode)(params, steps, seed)["tbar"]
+
+
+def _trajectories(tasks, timings, workers=None):
+    """tbar de cada tarea, en un pool si ``workers`` > 1; las corridas quedan en ``timings``."""
+    if not (workers and workers > 1 and len(tasks) > 1):
+        return [(timings.abm if model == "abm" else timings.ode)(params, steps, seed)["tbar"]
+                for model, params, steps, seed in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        out = list(pool.map(partial(_trajectory, engine=timings.engine), tasks))
+    for model, _, steps, _ in tasks:
+        (timings.count_abm if model == "abm" else timings.count_ode)(1, steps)
+    return out
+
+
+def cross_validate(obs, forcing, base_params, spec, stream, timings):
+    """Validación cruzada de origen móvil de una fase (bloque ``cross_validation``).
+
+    ``spec``: ``{"folds": K, "min_train": fracción, "workers": N}``. Los
+    candidatos de CALIBRATION_GRID se simulan una sola vez, hasta el origen
+    más tardío y con semilla común; cada pliegue elige el mejor sobre su
+    propio prefijo de entrenamiento. Para que esas trayectorias sirvan a
+    todos los pliegues, el impulso macro del ABM usa el (α, β) de la ventana
+    de entrenamiento más corta (sin mirar validación de ningún pliegue); la
+    ODE rival se calibra en la de cada pliegue. La grilla y las corridas de
+    evaluación (ABM, ODE y reducido por pliegue) van a un pool de
+    ``workers`` procesos, uno por pliegue por defecto.
+
+    Compartir trayectorias exige que el motor sea causal con semilla fija
+    (una corrida corta es prefijo de la larga). abm_engine lo cumple, pero
+    el de caso_clima no está en este árbol: se comprueba una vez por fase
+    con el primer candidato y, si no se cumple, cada pliegue simula la
+    grilla hasta su propio origen (``calibration.shared`` = False).
+    """
+    folds = cross_validation.rolling_origins(
+        len(obs), spec.get("folds", cross_validation.DEFAULT_FOLDS),
+        spec.get("min_train", cross_validation.DEFAULT_MIN_TRAIN))
+    workers = spec.get("workers") or len(folds)
+    origins = [origin for origin, _ in folds]
+
+    alpha, beta = calibrate_ode(obs[:origins[0]], forcing[:origins[0]])
+    common = dict(base_params, ode_alpha=alpha, ode_beta=beta, assimilation_series=None)
+    candidates = [_grid_candidate(common, idx)
+                  for idx in _grid_indices([values for _, values in CALIBRATION_GRID])]
+    seed = stream.seed("cv", "calibration")
+    tbars = _trajectories([("abm", p, origins[-1], seed) for p in candidates], timings, workers)
+    short = timings.abm(candidates[0], origins[0], seed=seed)["tbar"]
+    prefix_gap = max(abs(a - b) for a, b in zip(short, tbars[0]))
+    shared = prefix_gap == 0.0
+    if shared:
+        errors = [cross_validation.prefix_rmse(tbar, obs, origins) for tbar in tbars]
+    else:
+        # Sin propiedad de prefijo: grilla completa por pliegue, hasta su origen
+        errors = [[None] * len(origins) for _ in candidates]
+        for k, origin in enumerate(origins[:-1]):
+            runs = _trajectories([("abm", p, origin, seed) for p in candidates], timings, workers)
+            for c, tbar in enumerate(runs):
+                errors[c][k] = rmse(tbar, obs[:origin])
+        for c, tbar in enumerate(tbars):
+            errors[c][-1] = rmse(tbar, obs[:origins[-1]])
+
+    fits, tasks = [], []
+    for k, (origin, end) in enumerate(folds):
+        # Mismo desempate que calibrate_abm: primer mínimo en orden de grilla
+        best = min(range(len(candidates)), key=lambda c: errors[c][k])
+        params = candidates[best]
+        ode_alpha, ode_beta = calibrate_ode(obs[:origin], forcing[:origin])
+        fits.append(dict({key: params[key] for key, _ in CALIBRATION_GRID},
+                         origin=origin, end=end, train_rmse=errors[best][k],
+                         ode_alpha=ode_alpha, ode_beta=ode_beta))
+        tasks += [
+            ("abm", params, end, stream.seed("cv", k, "abm")),
+            ("ode", dict(params, ode_alpha=ode_alpha, ode_beta=ode_beta), end,
+             stream.seed("cv", k, "ode")),
+            ("abm", dict(params, macro_coupling=0.0, forcing_scale=0.0), end,
+             stream.seed("cv", k, "reduced")),
+        ]
+    runs = _trajectories(tasks, timings, workers)
+
+    for k, fit in enumerate(fits):
+        val = obs[fit["origin"]:fit["end"]]
+        abm, ode, reduced = (tbar[fit["origin"]:fit["end"]] for tbar in runs[3 * k:3 * k + 3])
+        fit.update(rmse_abm=rmse(abm, val), rmse_ode=rmse(ode, val),
+                   rmse_reduced=rmse(reduced, val))
+        fit["edi"] = (fit["rmse_reduced"] - fit["rmse_abm"]) / (fit["rmse_reduced"] + 1e-9)
+
+    return {
+        "method": "rolling_origin",
+        "min_train": origins[0],
+        "horizon": folds[0][1] - folds[0][0],
+        "calibration": {"method": "grid", "steps": origins[-1],
+                        "simulations": len(candidates) * (1 if shared else len(origins)) + 1,
+                        "shared": shared, "prefix_gap": prefix_gap,
+                        "ode_alpha": alpha, "ode_beta": beta},
+        "folds": fits,
+        "aggregate": cross_validation.aggregate(
+            fits, ["rmse_abm", "rmse_ode", "rmse_reduced", "edi"]),
+    }
+
+
+def _surrogate_edi(surrogate, base_params, val_start, seeds, engine, calibration):
+    """EDI de una serie sustituta, recalibrando como la fase (función de módulo, para el pool).
+
+    ``base_params``: parámetros base de la fase, antes de calibrar;
+    ``calibration``: ``{"method", "budget"}``. Devuelve (EDI, simulaciones de
+    calibración).
+    """
+    timings = PhaseTimings(engine)
+    steps = len(surrogate)
+    train = surrogate[:val_start]
+    forcing = shared_series.resolve(base_params["forcing_series"])
+    alpha, beta = calibrate_ode(train, forcing[:val_start])
+    params = dict(base_params, t0=surrogate[0], ode_alpha=alpha, ode_beta=beta)
+    if calibration["method"] == "surrogate":
+        fit = calibrate_abm_surrogate(train, params, val_start, timings,
+                                      seed=seeds["calibration"], budget=calibration["budget"])
+        params.update(fit["params"])
+    else:
+        fit = calibrate_abm(train, params, val_start, timings, seed=seeds["calibration"])
+        params.update({key: fit[key] for key, _ in CALIBRATION_GRID})
+    params.update(assimilation_series=None, assimilation_strength=0.0)
+    val = surrogate[val_start:]
+    err_abm = rmse(timings.abm(params, steps, seed=seeds["abm"])["tbar"][val_start:], val)
+    reduced = dict(params, macro_coupling=0.0, forcing_scale=0.0)
+    err_reduced = rmse(timings.abm(reduced, steps, seed=seeds["reduced"])["tbar"][val_start:], val)
+    return (err_reduced - err_abm) / (err_reduced + 1e-9), fit["simulations"]
+
+
+def edi_significance(obs, base_params, val_start, edi_observed, spec, calibration, seeds, stream,
+                     timings):
+    """Contraste del EDI de la fase contra K sustitutos de la observación completa.
+
+    H0: la observación es una serie con el mismo espectro (``phase``) o la
+    misma dependencia local (``block``) pero sin alineación con el forzante.
+    Cada sustituto recorre la misma tubería que la fase: ODE y ABM se
+    recalibran sobre su mitad de entrenamiento y el modelo completo y el
+    reducido se vuelven a simular con las semillas de la fase (números
+    aleatorios comunes), de modo que el EDI nulo sólo varía con los datos.
+    Cuesta K × (calibración + 2) simulaciones; con ``spec["workers"]`` los
+    sustitutos se reparten en un pool.
+    """
+    k = spec.get("surrogates", 100)
+    method = spec.get("method", "phase")
+    seed = stream.seed("surrogates")
+    series = surrogates.make_surrogates(obs, k, method, seed)
+    run = partial(_surrogate_edi, base_params=base_params, val_start=val_start, seeds=seeds,
+                  engine=timings.engine, calibration=calibration)
+    workers = spec.get("workers")
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run, series))
+    else:
+        results = [run(s) for s in series]
+    steps = len(obs)
+    for _, simulations in results:
+        timings.count_abm(simulations, val_start)
+        timings.count_abm(2, steps)
+    block = {"method": method, "surrogates": k, "seed": seed, "recalibrated": True}
+    block.update(surrogates.null_summary(edi_observed, [edi for edi, _ in results]))
+    return block
+
+
+def _gsa_output(params, steps, seed, engine, val_start):
+    """Salida escalar del análisis de sensibilidad: media de tbar en validación."""
+    sim = PhaseTimings(engine).abm(params, steps, seed)
+    return mean(sim["tbar"][val_start:])
 
 
 def perturb_params(params, pct, seed):
-    random.seed(seed)
+    """Perturba ±pct los parámetros del ABM con un generador propio (sin estado global)."""
+    rng = random.Random(seed)
     p = dict(params)
     for key in ["diffusion", "macro_coupling", "forcing_scale", "damping", "noise"]:
         if key in p and p[key] != 0:
-            p[key] = p[key] + p[key] * pct * random.uniform(-1, 1)
+            p[key] = p[key] + p[key] * pct * rng.uniform(-1, 1)
     return p
 
 
-def evaluate_phase(phase_name, obs, forcing, cfg, seed_base):
-    """Ejecuta la validación completa de una fase con comparación justa."""
+def load_real_data(case_dir, cfg):
+    """Observaciones reales de ``cfg["real_data"]`` remuestreadas a meses.
+
+    ``path`` es relativo al directorio del caso; ``start``/``end`` son meses
+    'YYYY-MM'. El forzante real sale de ``forcing_column`` (en ``path`` o en
+    ``forcing_path``), remuestreado igual. Sin ``forcing_column`` el forzante
+    es el sintético de ``make_forcing``: C4 y la ODE corren contra ese
+    forzante inventado, y ``data_info["forcing"]`` lo deja registrado como
+    "synthetic". Devuelve (obs, forcing, data_info).
+    """
+    spec = cfg["real_data"]
+    date_column = spec.get("date_column", "date")
+    series = real_data.load_monthly_series(
+        case_dir / spec["path"], spec["start"], spec["end"],
+        date_column=date_column, value_column=spec.get("value_column", "value"),
+    )
+    obs = series.filled()
+    data_info = series.data_info(len(obs) // 2)
+    data_info["source"] = spec["path"]
+    if spec.get("forcing_column"):
+        forcing_path = spec.get("forcing_path", spec["path"])
+        forcing = real_data.load_monthly_series(
+            case_dir / forcing_path, spec["start"], spec["end"],
+            date_column=date_column, value_column=spec["forcing_column"],
+        ).filled()
+        data_info["forcing"] = {"source": forcing_path, "column": spec["forcing_column"]}
+    else:
+        forcing = make_forcing(len(obs), cfg)
+        data_info["forcing"] = "synthetic"
+    return obs, forcing, data_info
+
+
+def evaluate_phase(phase_name, obs, forcing, cfg, stream, calibration=None, on_calibrated=None,
+                   data_info=None, warm_start=None, on_series=None):
+    """Ejecuta la validación completa de una fase con comparación justa.
+
+    Toda semilla sale de ``stream`` (SeedStream de la fase): cada simulación y
+    perturbación tiene su propio flujo, independiente del orden de ejecución.
+
+    Si se entrega ``calibration`` (bloque ``calibration`` de un checkpoint) se
+    omite la búsqueda; ``on_calibrated`` recibe el bloque recién calibrado.
+    ``data_info`` (de ``load_real_data``) reemplaza las fechas y la calidad
+    de datos por defecto del bloque ``data``. ``warm_start`` (bloque
+    ``calibration`` de la corrida anterior) hace que la calibración del ABM
+    parta de esos valores y busque primero en su vecindad. ``on_series``
+    recibe las series de la fase (obs, forcing, abm, ode, reduced) y devuelve
+    la referencia que se guarda en el bloque ``series``.
+
+    Opciones de ``cfg`` (todas opcionales; vienen de ``case_options``):
+
+    - ``calibration_workers``: la grilla de calibración del ABM se evalúa en
+      un pool de procesos.
+    - ``calibration_method = "surrogate"``: el ABM se calibra en 5 parámetros
+      con ``calibration_budget`` simulaciones (24 por defecto) guiadas por una
+      superficie de respuesta; ``calibration`` registra método y simulaciones.
+    - ``ode_profile``: ``calibration`` incluye un barrido de perfil del RMSE de
+      la ODE en torno a (α, β), en lote con ode_batch si reproduce a
+      ``simulate_ode``.
+    - ``cross_validation`` (``{"folds", "workers"}``): bloque
+      ``cross_validation`` con RMSE y EDI por pliegue de origen móvil y sus
+      agregados (ver ``cross_validate``).
+    - ``online_indicators`` (motor local): symploké y no-localidad se acumulan
+      durante la simulación, sin guardar la historia.
+    - ``significance`` (``{"surrogates": K, "method": "phase"|"block",
+      "workers": N}``): p-valor del EDI en ``emergence`` frente a K sustitutos
+      de la observación, cada uno recalibrado y re-simulado (ver
+      ``edi_significance``).
+    - ``gsa`` (``{"method": "morris"|"sobol", "workers": N}``): C5 se decide
+      sobre un diseño global en la caja ±10 % en lugar de 5 corridas.
+    - ``c3_sequential`` (``{"batch", "max_replicas"}``): C3 corre réplicas por
+      lotes hasta que el intervalo de confianza decide (bloque
+      ``replication``).
+    - ``screen``: los criterios se evalúan en orden de costo y la fase se corta
+      en el primer fallo; los no evaluados quedan en None y el bloque
+      ``screen`` registra cuál falló.
+
+    Forzante y observación se publican en memoria compartida mientras dura
+    la fase: los parámetros llevan sólo su ``SeriesHandle``.
+    """
+    with SharedSeries(forcing) as shared_forcing, SharedSeries(obs) as shared_obs:
+        return _evaluate_phase(phase_name, obs, forcing, cfg, stream, calibration, on_calibrated,
+                               data_info, warm_start, on_series, shared_obs.handle,
+                               shared_forcing.handle)
+
+
+def _evaluate_phase(phase_name, obs, forcing, cfg, stream, calibration, on_calibrated, data_info,
+                    warm_start, on_series, obs_handle, forcing_handle):
+    timings = PhaseTimings(cfg.get("abm_engine", "clima"))
     steps = len(obs)
     val_start = steps // 2
     obs_val = obs[val_start:]
@@ -206,175 +711,550 @@ def evaluate_phase(phase_name, obs, forcing, cfg, seed_base):
     obs_std = variance(obs_val) ** 0.5
 
     # Calibrar ODE
-    alpha, beta = calibrate_ode(obs_train, forcing_train)
+    with timings.stage("calibration_ode"):
+        if calibration:
+            alpha, beta = calibration["ode_alpha"], calibration["ode_beta"]
+        else:
+            alpha, beta = calibrate_ode(obs_train, forcing_train)
 
     # Parámetros base
     base_params = {
-        "grid_size": 10,
+        "grid_size": cfg.get("grid_size", 10),
         "diffusion": 0.2,
         "noise": 0.02,
         "macro_coupling": cfg["macro_coupling_hint"],
         "t0": obs[0],
         "h0": 0.5,
-        "forcing_series": forcing,
+        "forcing_series": forcing_handle,
         "forcing_scale": 0.1,
         "damping": 0.05,
         "ode_alpha": alpha,
         "ode_beta": beta,
         "ode_noise": 0.01,
     }
+    # Opciones de retícula del motor local (abm_engine)
+    base_params.update({k: cfg[k] for k in ("boundary", "boundary_value", "dtype") if k in cfg})
 
     # Calibrar ABM
-    best_fs, best_mc, best_damp = calibrate_abm(obs_train, base_params, val_start)
-    base_params["forcing_scale"] = best_fs
-    base_params["macro_coupling"] = best_mc
-    base_params["damping"] = best_damp
+    with timings.stage("calibration_abm"):
+        if calibration:
+            fitted = {k: calibration[k] for k in response_surface.CALIBRATION_BOX
+                      if k in calibration}
+            search = {k: calibration[k]
+                      for k in ("method", "simulations", "train_rmse", "warm_start")
+                      if k in calibration}
+        elif cfg.get("calibration_method") == "surrogate":
+            start = warm_start and {k: warm_start[k] for k in response_surface.CALIBRATION_BOX
+                                    if k in warm_start}
+            fit = calibrate_abm_surrogate(
+                obs_handle.prefix(val_start), base_params, val_start, timings,
+                seed=stream.seed("calibration"), budget=cfg.get("calibration_budget", 24),
+                workers=cfg.get("calibration_workers"),
+                warm_start=start)
+            fitted = fit["params"]
+            search = {"method": "surrogate", "simulations": fit["simulations"],
+                      "train_rmse": fit["train_rmse"]}
+            if warm_start:
+                search["warm_start"] = "design"
+        else:
+            fit = calibrate_abm(
+                obs_handle.prefix(val_start), base_params, val_start, timings,
+                seed=stream.seed("calibration"), workers=cfg.get("calibration_workers"),
+                warm_start=warm_start)
+            fitted = {key: fit[key] for key, _ in CALIBRATION_GRID}
+            search = {"method": "grid", "simulations": fit["simulations"],
+                      "train_rmse": fit["train_rmse"]}
+            if warm_start:
+                search["warm_start"] = fit["warm_start"]
+    prefit_params = dict(base_params)  # sin lo calibrado en el corte principal
+    base_params.update(fitted)
+
+    calibration_block = dict(fitted, assimilation_strength=0.0, ode_alpha=alpha, ode_beta=beta,
+                             **search)
+    if cfg.get("ode_profile"):
+        # Identificabilidad de (α, β): RMSE determinista en su vecindad. El lote
+        # de ode_batch supone la forma de la ODE: se contrasta una vez con
+        # simulate_ode y, si no la reproduce, el barrido usa simulate_ode
+        with timings.stage("ode_profile"):
+            profile = (calibration or {}).get("ode_profile")
+            if profile is None:
+                probe = dict(base_params, ode_noise=0.0)
+                gap = ode_batch.reference_gap(timings.ode(probe, val_start, seed=0)["tbar"],
+                                              probe, val_start)
+                batch = gap < ODE_BATCH_TOLERANCE
+
+                def simulate(p, n):
+                    return timings.ode(p, n, seed=0)["tbar"]
+                profile = ode_batch.profile_scan(obs_handle.prefix(val_start), forcing_handle,
+                                                 obs[0], alpha, beta,
+                                                 simulate=None if batch else simulate)
+                if batch:
+                    timings.count_ode(len(profile["alpha"]) * len(profile["beta"]), val_start)
+                profile.update(engine="batch" if batch else "simulate_ode", batch_gap=gap)
+            calibration_block["ode_profile"] = profile
+    if on_calibrated and not calibration:
+        on_calibrated(calibration_block)
 
     # Evaluación SIN nudging (comparación justa)
     eval_params = dict(base_params)
     eval_params["assimilation_series"] = None
     eval_params["assimilation_strength"] = 0.0
 
-    seeds = {"abm": seed_base, "ode": seed_base + 1, "reduced": seed_base + 2,
-             "perturbed": seed_base + 3, "replication": seed_base + 4,
-             "alt": seed_base + 5, "sensitivity": list(range(seed_base + 10, seed_base + 15))}
+    seeds = {key: stream.seed(key)
+             for key in ["abm", "ode", "reduced", "perturbed", "replication", "alt"]}
+    seeds["sensitivity"] = [stream.seed("sensitivity", i) for i in range(5)]
 
-    # Modelo completo (con acoplamiento macro, sin nudging)
-    abm = simulate_abm(eval_params, steps, seed=seeds["abm"])
-    ode = simulate_ode(eval_params, steps, seed=seeds["ode"])
+    # Modelo completo (con acoplamiento macro, sin nudging). Con
+    # cfg["online_indicators"] (motor local) los indicadores se acumulan
+    # durante la simulación, sin historia.
+    online = bool(cfg.get("online_indicators"))
+    with timings.stage("full_runs"):
+        if online:
+            cohesion, dominance_acc = CohesionAccumulator(), DominanceAccumulator()
+            abm = timings.abm(eval_params, steps, seed=seeds["abm"],
+                              observers=[cohesion, dominance_acc])
+        else:
+            abm = timings.abm(eval_params, steps, seed=seeds["abm"],
+                              outputs=("tbar", "grid", "forcing"))
+        ode = timings.ode(eval_params, steps, seed=seeds["ode"])
 
     # Modelo reducido (sin acoplamiento macro, sin nudging)
-    reduced_params = dict(eval_params)
-    reduced_params["macro_coupling"] = 0.0
-    reduced_params["forcing_scale"] = 0.0
-    abm_reduced = simulate_abm(reduced_params, steps, seed=seeds["reduced"])
+    with timings.stage("reduced_run"):
+        reduced_params = dict(eval_params)
+        reduced_params["macro_coupling"] = 0.0
+        reduced_params["forcing_scale"] = 0.0
+        abm_reduced = timings.abm(reduced_params, steps, seed=seeds["reduced"])
 
     err_abm = rmse(abm["tbar"][val_start:], obs_val)
     err_ode = rmse(ode["tbar"][val_start:], obs_val)
     err_reduced = rmse(abm_reduced["tbar"][val_start:], obs_val)
     err_reduced_full = rmse(abm_reduced["tbar"][val_start:], abm["tbar"][val_start:])
 
+    # Criterios en orden de costo (simulaciones extra): C1 y el control EDI
+    # usan las corridas ya hechas; C2–C4 cuestan una cada uno; C5, cinco o un
+    # diseño global. Con cfg["screen"] la evaluación se detiene en el primer
+    # fallo y lo no evaluado queda en None.
+    screen = bool(cfg.get("screen"))
+    failed_at = None
+    c2 = c3 = c4 = c5 = None
+    ei_score = valido_metaestable = None
+    symploke_block = {"pass": None}
+    non_locality_block = {"pass": None}
+    persistence_block = {"pass": None}
+    sensitivity_block = None
+
     # C1 Convergencia
-    err_threshold = 0.6 * obs_std
-    corr_abm = correlation(abm["tbar"][val_start:], obs_val)
-    corr_ode = correlation(ode["tbar"][val_start:], obs_val)
-    c1 = err_abm < err_threshold and corr_abm > 0.7 and corr_ode > 0.7
+    with timings.stage("c1"):
+        err_threshold = 0.6 * obs_std
+        corr_abm = correlation(abm["tbar"][val_start:], obs_val)
+        corr_ode = correlation(ode["tbar"][val_start:], obs_val)
+        c1 = err_abm < err_threshold and corr_abm > 0.7 and corr_ode > 0.7
+    if screen and not c1:
+        failed_at = "c1_convergence"
+
+    # Emergencia
+    emergence_threshold = 0.2 * obs_std
+    edi_control = (err_reduced - err_abm) / (err_reduced + 1e-9)
+    if not failed_at:
+        with timings.stage("emergence"):
+            ei_score = effective_information(ode["tbar"], abm_reduced["tbar"], bins=10)
+            autonomia_ok = edi_control > 0.0
+            valido_metaestable = autonomia_ok and ei_score >= 0.0 and (err_reduced > err_abm)
+        if screen and not valido_metaestable:
+            failed_at = "emergence"
 
     # C2 Robustez
-    pert = perturb_params(base_params, 0.1, seed=10)
-    pert["assimilation_series"] = None
-    pert["assimilation_strength"] = 0.0
-    abm_pert = simulate_abm(pert, steps, seed=seeds["perturbed"])
-    mean_d = abs(mean(abm_pert["tbar"][val_start:]) - mean(abm["tbar"][val_start:]))
-    var_d = abs(variance(abm_pert["tbar"][val_start:]) - variance(abm["tbar"][val_start:]))
-    c2 = mean_d < 0.5 and var_d < 0.5
-
-    # C3 Replicación
-    abm_rep = simulate_abm(eval_params, steps, seed=seeds["replication"])
-    p_base = window_variance(abm["tbar"][val_start:], 50)
-    p_rep = window_variance(abm_rep["tbar"][val_start:], 50)
-    c3 = abs(p_base - p_rep) < 0.3
+    if not failed_at:
+        with timings.stage("c2"):
+            pert = perturb_params(base_params, 0.1, seed=stream.seed("perturb", "c2"))
+            pert["assimilation_series"] = None
+            pert["assimilation_strength"] = 0.0
+            abm_pert = timings.abm(pert, steps, seed=seeds["perturbed"])
+            mean_d = abs(mean(abm_pert["tbar"][val_start:]) - mean(abm["tbar"][val_start:]))
+            var_d = abs(variance(abm_pert["tbar"][val_start:]) - variance(abm["tbar"][val_start:]))
+            c2 = mean_d < 0.5 and var_d < 0.5
+        if screen and not c2:
+            failed_at = "c2_robustness"
+
+    # C3 Replicación: una réplica o, con cfg["c3_sequential"], réplicas por
+    # lotes hasta que el intervalo de confianza decide (ver sequential.py)
+    replication = None
+    if not failed_at:
+        with timings.stage("c3"):
+            p_base = window_variance(abm["tbar"][val_start:], 50)
+            if cfg.get("c3_sequential"):
+                def replica_gap(i):
+                    seed = seeds["replication"] if i == 0 else stream.seed("replication", i)
+                    rep = timings.abm(eval_params, steps, seed=seed)
+                    return abs(window_variance(rep["tbar"][val_start:], 50) - p_base)
+                replication = sequential.sequential_test(replica_gap, C3_TOLERANCE,
+                                                         **cfg["c3_sequential"])
+                c3 = replication["pass"]
+            else:
+                abm_rep = timings.abm(eval_params, steps, seed=seeds["replication"])
+                p_rep = window_variance(abm_rep["tbar"][val_start:], 50)
+                c3 = abs(p_base - p_rep) < C3_TOLERANCE
+        if screen and not c3:
+            failed_at = "c3_replication"
 
     # C4 Validez (más forzamiento → más respuesta)
-    alt_params = dict(eval_params)
-    alt_params["forcing_series"] = [x + 0.5 for x in forcing]
-    abm_alt = simulate_abm(alt_params, steps, seed=seeds["alt"])
-    c4 = mean(abm_alt["tbar"][val_start:]) > mean(abm["tbar"][val_start:])
-
-    # C5 Incertidumbre
-    sensitivities = []
-    for i in range(5):
-        p = perturb_params(base_params, 0.1, seed=20 + i)
-        p["assimilation_series"] = None
-        p["assimilation_strength"] = 0.0
-        s = simulate_abm(p, steps, seed=seeds["sensitivity"][i])
-        sensitivities.append(mean(s["tbar"][val_start:]))
-    c5 = (max(sensitivities) - min(sensitivities)) < 1.0
+    if not failed_at:
+        with timings.stage("c4"):
+            alt_params = dict(eval_params)
+            alt_params["forcing_series"] = forcing_handle.shifted(0.5)
+            abm_alt = timings.abm(alt_params, steps, seed=seeds["alt"])
+            c4 = mean(abm_alt["tbar"][val_start:]) > mean(abm["tbar"][val_start:])
+        if screen and not c4:
+            failed_at = "c4_validity"
+
+    # C5 Incertidumbre: análisis de sensibilidad global o 5 perturbaciones
+    if not failed_at:
+        global_sensitivity = None
+        with timings.stage("c5"):
+            if cfg.get("gsa"):
+                spec = dict(cfg["gsa"])
+                method = spec.pop("method", "morris")
+                workers = spec.pop("workers", None)
+                c5_params = dict(base_params, assimilation_series=None, assimilation_strength=0.0)
+                evaluate = partial(_gsa_output, steps=steps, seed=seeds["sensitivity"][0],
+                                   engine=timings.engine, val_start=val_start)
+                # Semilla y tramo de Halton salen de flujos distintos de la fase
+                global_sensitivity = sensitivity.run_gsa(method, evaluate, c5_params, pct=0.1,
+                                                         seed=stream.seed("gsa", "rng"),
+                                                         skip=stream.seed("gsa", "halton"),
+                                                         workers=workers, **spec)
+                timings.count_abm(global_sensitivity["simulations"], steps)
+                sensitivities = [global_sensitivity["output_min"],
+                                 global_sensitivity["output_max"]]
+            else:
+                sensitivities = []
+                for i in range(5):
+                    p = perturb_params(base_params, 0.1, seed=stream.seed("perturb", "c5", i))
+                    p["assimilation_series"] = None
+                    p["assimilation_strength"] = 0.0
+                    s = timings.abm(p, steps, seed=seeds["sensitivity"][i])
+                    sensitivities.append(mean(s["tbar"][val_start:]))
+            c5 = (max(sensitivities) - min(sensitivities)) < 1.0
+        sensitivity_block = {"mean_min": min(sensitivities), "mean_max": max(sensitivities)}
+        if global_sensitivity:
+            sensitivity_block["global"] = global_sensitivity
+        if screen and not c5:
+            failed_at = "c5_uncertainty"
 
     # Indicadores
-    internal, external = internal_vs_external_cohesion(abm["grid"], abm["forcing"])
-    symploke_ok = internal > external
-    dominance = dominance_share(abm["grid"])
-    non_local_ok = dominance < 0.05
-    obs_persistence = window_variance(obs_val, 50)
-    persistence_ok = window_variance(abm["tbar"][val_start:], 50) < 1.5 * obs_persistence
+    if not failed_at:
+        with timings.stage("indicators"):
+            if "grid" in abm:
+                internal, external = internal_vs_external_cohesion(abm["grid"], abm["forcing"])
+                dominance = dominance_share(abm["grid"])
+            else:
+                internal, external = cohesion.result()
+                dominance = dominance_acc.result()
+            obs_persistence = window_variance(obs_val, 50)
+            symploke_block = {"internal": internal, "external": external,
+                              "pass": internal > external}
+            non_locality_block = {"dominance_share": dominance, "pass": dominance < 0.05}
+            if online:
+                symploke_block["method"] = non_locality_block["method"] = "online"
+            persistence_block = {
+                "window_variance": p_base, "obs_window_variance": obs_persistence,
+                "pass": window_variance(abm["tbar"][val_start:], 50) < 1.5 * obs_persistence,
+            }
+    # La historia de la retícula sólo alimenta los indicadores
+    abm_engine.close_outputs(abm)
 
-    # Emergencia
-    emergence_threshold = 0.2 * obs_std
-    edi_control = (err_reduced - err_abm) / (err_reduced + 1e-9)
-    ei_score = effective_information(ode["tbar"], abm_reduced["tbar"], bins=10)
-    autonomia_ok = edi_control > 0.0
-    valido_metaestable = autonomia_ok and ei_score >= 0.0 and (err_reduced > err_abm)
+    # Significancia del EDI (opcional): cada sustituto de la observación se
+    # recalibra y se vuelve a simular (ver edi_significance)
+    significance = None
+    if cfg.get("significance") and not failed_at:
+        with timings.stage("significance"):
+            significance = edi_significance(
+                obs, prefit_params, val_start, edi_control, cfg["significance"],
+                {"method": cfg.get("calibration_method", "grid"),
+                 "budget": cfg.get("calibration_budget", 24)},
+                dict(seeds, calibration=stream.seed("calibration")), stream, timings,
+            )
 
-    return {
+    # Validación cruzada de origen móvil (opcional)
+    cv_block = None
+    if cfg.get("cross_validation") and not failed_at:
+        with timings.stage("cross_validation"):
+            cv_block = cross_validate(obs, forcing, prefit_params, cfg["cross_validation"], stream,
+                                      timings)
+
+    data_block = {
+        "start": "2000-01-01", "end": "2019-12-01", "split": "2010-01-01",
+        "obs_mean": obs_mean_val, "steps": steps, "val_steps": len(obs_val),
+        "expected_months": steps, "observed_months": steps,
+        "coverage": 1.0, "outlier_share": 0.0,
+    }
+    data_block.update(data_info or {})
+
+    emergence_block = {
+        "err_reduced": err_reduced, "err_reduced_full": err_reduced_full,
+        "err_abm": err_abm, "threshold": emergence_threshold,
+        "pass": valido_metaestable,
+        "effective_information": ei_score, "edi_control": edi_control,
+    }
+    if significance:
+        emergence_block["p_value"] = significance["p_value"]
+        emergence_block["significance"] = significance
+
+    result = {
         "phase": phase_name,
-        "data": {
-            "start": "2000-01-01", "end": "2019-12-01", "split": "2010-01-01",
-            "obs_mean": obs_mean_val, "steps": steps, "val_steps": len(obs_val),
-            "expected_months": steps, "observed_months": steps,
-            "coverage": 1.0, "outlier_share": 0.0,
-        },
-        "calibration": {
-            "forcing_scale": best_fs, "macro_coupling": best_mc,
-            "damping": best_damp, "assimilation_strength": 0.0,
-            "ode_alpha": alpha, "ode_beta": beta,
-        },
+        "data": data_block,
+        "calibration": calibration_block,
         "errors": {
             "rmse_abm": err_abm, "rmse_ode": err_ode,
             "rmse_reduced": err_reduced, "threshold": err_threshold,
             "edi_control": edi_control,
         },
         "correlations": {"abm_obs": corr_abm, "ode_obs": corr_ode},
-        "symploke": {"internal": internal, "external": external, "pass": symploke_ok},
-        "non_locality": {"dominance_share": dominance, "pass": non_local_ok},
-        "persistence": {
-            "window_variance": p_base, "obs_window_variance": obs_persistence,
-            "pass": persistence_ok,
-        },
-        "emergence": {
-            "err_reduced": err_reduced, "err_reduced_full": err_reduced_full,
-            "err_abm": err_abm, "threshold": emergence_threshold,
-            "pass": valido_metaestable,
-            "effective_information": ei_score, "edi_control": edi_control,
-        },
+        "symploke": symploke_block,
+        "non_locality": non_locality_block,
+        "persistence": persistence_block,
+        "emergence": emergence_block,
         "c1_convergence": c1, "c2_robustness": c2, "c3_replication": c3,
         "c4_validity": c4, "c5_uncertainty": c5,
-        "sensitivity": {"mean_min": min(sensitivities), "mean_max": max(sensitivities)},
-        "overall_pass": all([c1, c2, c3, c4, c5]) and valido_metaestable,
+        "sensitivity": sensitivity_block,
+        "overall_pass": bool(all([c1, c2, c3, c4, c5]) and valido_metaestable),
+        "timings": timings.as_dict(),
     }
+    if replication:
+        result["replication"] = replication
+    if cv_block:
+        result["cross_validation"] = cv_block
+    if screen:
+        result["screen"] = {"failed_at": failed_at}
+    if on_series and not failed_at:
+        result["series"] = on_series({
+            "obs": obs, "forcing": forcing, "abm": abm["tbar"], "ode": ode["tbar"],
+            "reduced": abm_reduced["tbar"],
+        })
+    return result
 
 
-def regenerate_case(case_name, cfg):
-    """Regenera metrics.json para un caso con comparación justa."""
-    case_dir = CASES_DIR / case_name
-    if not case_dir.exists():
-        print(f"  ⚠️  {case_name}: directorio no encontrado")
-        return False
+def write_json_atomic(path, data):
+    """Escribe JSON vía archivo temporal + rename: nunca deja un archivo a medias."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
 
-    print(f"  ▶ {case_name}...", end=" ", flush=True)
 
-    steps = 240  # 20 años mensuales
-    seed_base = hash(case_name) % 10000
+class RunCheckpoint:
+    """Checkpoints atómicos de una regeneración en ``runs/<run_id>/``.
+
+    Cada unidad terminada (caso × fase, y la calibración de cada fase) se
+    guarda como ``<caso>/<unidad>.json``; ``--resume RUN_ID`` retoma desde ahí.
+    El manifiesto fija la semilla raíz (``root_seed``) y las opciones de la
+    corrida para que la reanudación (o un worker de ``work_queue.py``) use
+    exactamente las mismas semillas y configuración que la corrida original.
+    """
+
+    def __init__(self, run_id, resume=False, root_seed=DEFAULT_ROOT_SEED, options=None):
+        self.run_id = run_id
+        self.dir = RUNS_DIR / run_id
+        self.manifest_path = self.dir / "manifest.json"
+        if resume:
+            if not self.manifest_path.exists():
+                raise FileNotFoundError(f"No existe la corrida {run_id} en {RUNS_DIR}")
+            self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if "root_seed" not in self.manifest:
+                raise FileNotFoundError(f"La corrida {run_id} usa semillas antiguas (sin root_seed)")
+        else:
+            if self.dir.exists():
+                raise FileExistsError(f"La corrida {run_id} ya existe (usar --resume)")
+            self.manifest = {
+                "run_id": run_id,
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "root_seed": root_seed,
+                "options": options or {},
+            }
+            write_json_atomic(self.manifest_path, self.manifest)
+
+    @property
+    def root_seed(self):
+        return self.manifest["root_seed"]
+
+    @property
+    def options(self):
+        return self.manifest.get("options", {})
+
+    def path(self, case_name, unit):
+        return self.dir / case_name / f"{unit}.json"
 
-    # Generar datos sintéticos
-    obs_synth, forcing_synth = make_synthetic_data(steps, cfg, seed=seed_base)
-    synthetic = evaluate_phase("synthetic", obs_synth, forcing_synth, cfg, seed_base)
+    def load(self, case_name, unit):
+        p = self.path(case_name, unit)
+        if not p.exists():
+            return None
+        return json.loads(p.read_text(encoding="utf-8"))
 
-    # Fase "real": datos sintéticos con más ruido (simula datos reales)
+    def save(self, case_name, unit, data):
+        write_json_atomic(self.path(case_name, unit), data)
+
+
+def save_phase_series(checkpoint, case_name, unit, arrays):
+    """Escribe las series de una fase en runs/<run_id>/<caso>/series/<unit>.npz.
+
+    La referencia devuelta (ruta relativa al caso y digest) apunta a donde
+    quedará el archivo: ``publish_phase_series`` lo mueve al directorio del
+    caso sólo cuando se escribe metrics.json, de modo que una fase cortada,
+    fallida o interrumpida nunca pisa las series de la corrida vigente.
+    """
+    rel_path = f"{SERIES_DIRNAME}/{unit}.npz"
+    digest = series_store.write_npz(checkpoint.dir / case_name / rel_path, arrays)
+    return {"path": rel_path, "sha256": digest, "format": "npz",
+            "arrays": {name: len(values) for name, values in arrays.items()}}
+
+
+def publish_phase_series(checkpoint, case_name, phases):
+    """Mueve al directorio del caso las series preparadas de ``phases``.
+
+    Si el archivo preparado ya no está (se movió en un intento anterior que
+    no llegó a marcar el caso como escrito) se acepta el del caso cuando su
+    digest coincide; si no, la fase pierde su bloque ``series`` para que
+    metrics.json no apunte a un archivo que no existe.
+    """
+    for pname, phase in phases.items():
+        ref = (phase or {}).get("series")
+        if not ref:
+            continue
+        target = CASES_DIR / case_name / ref["path"]
+        staged = checkpoint.dir / case_name / ref["path"] if checkpoint is not None else None
+        if staged is not None and staged.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, target)
+        elif not (target.exists() and series_store.file_sha256(target) == ref["sha256"]):
+            print(f"(⚠️  {pname}: series preparadas no encontradas, se omiten)", end=" ")
+            del phase["series"]
+
+
+def metrics_candidates(case_name):
+    """Dónde puede estar el metrics.json de un caso, en el orden de ``tesis.load_metrics``."""
+    slug = case_name.split("_", 1)[1] if case_name[:2].isdigit() else case_name
+    return [
+        CASES_DIR / case_name / "metrics.json",
+        REPOS_SIM / slug / "outputs" / "metrics.json",
+        REPOS_SIM / slug / "metrics.json",
+    ]
+
+
+def previous_calibration(case_name, phase_name):
+    """Bloque ``calibration`` de la fase en el metrics.json vigente del caso, o None."""
+    metrics_path = next((p for p in metrics_candidates(case_name) if p.exists()), None)
+    if metrics_path is None:
+        return None
+    try:
+        phases = json.loads(metrics_path.read_text(encoding="utf-8")).get("phases", {})
+    except (OSError, ValueError):
+        return None
+    block = (phases.get(phase_name) or {}).get("calibration")
+    if not isinstance(block, dict) or "forcing_scale" not in block:
+        return None
+    return block
+
+
+def checkpointed_phase(checkpoint, case_name, phase_name, obs, forcing, cfg, stream,
+                        data_info=None, unit=None):
+    """Evalúa una fase reutilizando (y guardando) sus checkpoints si hay corrida activa.
+
+    ``unit`` es el nombre del checkpoint (por defecto, el de la fase). Con
+    ``cfg["warm_start"]`` la calibración parte de la guardada en el
+    metrics.json actual del caso; con ``cfg["save_series"]`` (requiere
+    corrida) las series de la fase se preparan en la corrida y pasan al caso
+    junto con metrics.json (ver save_phase_series).
+    """
+    warm_start = previous_calibration(case_name, phase_name) if cfg.get("warm_start") else None
+    unit = unit or phase_name
+    calibration = None
+    if checkpoint is not None:
+        done = checkpoint.load(case_name, unit)
+        if done is not None:
+            print(f"({unit}: checkpoint)", end=" ", flush=True)
+            return done
+        calibration = checkpoint.load(case_name, f"{unit}.calibration")
+
+    def on_calibrated(block):
+        if checkpoint is not None:
+            checkpoint.save(case_name, f"{unit}.calibration", block)
+        run_ledger.emit("calibration", case=case_name, unit=unit,
+                        **{k: block.get(k) for k in ("method", "simulations", "train_rmse",
+                                                     "warm_start")})
+
+    with run_ledger.span("phase", case=case_name, unit=unit) as end:
+        phase = evaluate_phase(
+            phase_name, obs, forcing, cfg, stream,
+            calibration=calibration,
+            on_calibrated=on_calibrated,
+            data_info=data_info,
+            warm_start=warm_start,
+            on_series=(lambda arrays: save_phase_series(checkpoint, case_name, unit, arrays))
+            if cfg.get("save_series") and checkpoint is not None else None,
+        )
+        end.update(run_ledger.throughput(phase["timings"]))
+    if checkpoint is not None:
+        checkpoint.save(case_name, unit, phase)
+    return phase
+
+
+def case_phases(cfg):
+    """Fases que se recalculan para un caso (movilidad conserva su fase real)."""
+    return ["synthetic"] if cfg.get("only_synthetic", False) else ["synthetic", "real"]
+
+
+def phase_inputs(case_name, phase_name, cfg, root, steps=240):
+    """Observaciones, forzante y configuración de una fase: (obs, forcing, cfg, data_info).
+
+    La fase "real" usa cfg["real_data"] si existe; si no, datos sintéticos con
+    más ruido (simula datos reales). ``root`` es el SeedStream del caso.
+    """
+    if phase_name == "synthetic":
+        obs, forcing = make_synthetic_data(steps, cfg, root.spawn("synthetic", "data"))
+        return obs, forcing, cfg, None
+    if cfg.get("real_data"):
+        # Observaciones reales locales (CSV o binario), remuestreadas a meses
+        obs, forcing, data_info = load_real_data(CASES_DIR / case_name, cfg)
+        return obs, forcing, cfg, data_info
     real_cfg = dict(cfg)
     real_cfg["micro_noise"] = cfg["micro_noise"] * 1.5
     real_cfg["ode_noise"] = cfg["ode_noise"] * 1.5
+    obs, forcing = make_synthetic_data(steps, real_cfg, root.spawn("real", "data"))
+    return obs, forcing, real_cfg, None
 
-    only_synth = cfg.get("only_synthetic", False)
 
-    if only_synth:
-        # Caso movilidad: conservar fase real existente
-        existing = json.loads((case_dir / "metrics.json").read_text(encoding="utf-8"))
-        real = existing.get("phases", {}).get("real", {})
-        print("(solo sintético)", end=" ")
-    else:
-        obs_real, forcing_real = make_synthetic_data(steps, real_cfg, seed=seed_base + 1000)
-        real = evaluate_phase("real", obs_real, forcing_real, real_cfg, seed_base + 1000)
+def phase_stream(root, phase_name, replicate=0):
+    """Flujo de semillas de una fase; la réplica 0 es la corrida secuencial."""
+    if replicate:
+        return root.spawn(phase_name, "replicate", replicate)
+    return root.spawn(phase_name)
+
+
+def phase_unit(phase_name, replicate=0):
+    """Nombre del checkpoint de una fase (y réplica) dentro de runs/<run_id>/<caso>/."""
+    return f"{phase_name}.rep{replicate}" if replicate else phase_name
+
+
+def write_case_metrics(case_name, phases, checkpoint=None):
+    """Escribe metrics.json de un caso a partir de sus fases recalculadas.
+
+    Las fases ausentes de ``phases`` (p. ej. la real de movilidad) se conservan
+    del metrics.json existente. Una fase cortada por ``--screen``
+    (``screen.failed_at``) tiene criterios sin evaluar: el metrics.json
+    canónico no se toca, la fase queda sólo en el checkpoint de la corrida y
+    se devuelve None. Las series preparadas de las fases (``--save-series``)
+    pasan al caso sólo cuando metrics.json se escribe.
+    """
+    truncated = sorted(p for p, ph in phases.items()
+                       if ((ph or {}).get("screen") or {}).get("failed_at"))
+    if truncated:
+        print(f"(⚠️  {', '.join(truncated)} cortada(s) por --screen: metrics.json sin cambios)",
+              end=" ")
+        run_ledger.emit("not_written", case=case_name, reason="screen", phases=truncated)
+        return None
 
     # Construir resultado
     git_info = {"commit": "regenerated", "dirty": True}
@@ -388,19 +1268,33 @@ def regenerate_case(case_name, cfg):
     except Exception:
         pass
 
+    # Conservar el costo de la corrida anterior para que `tesis.py audit`
+    # detecte casos cuyo tiempo de cómputo creció
+    metrics_path = CASES_DIR / case_name / "metrics.json"
+    previous = {}
+    if metrics_path.exists():
+        previous = json.loads(metrics_path.read_text(encoding="utf-8")).get("phases", {})
+        for pname, phase in phases.items():
+            prev_t = previous.get(pname, {}).get("timings")
+            if prev_t:
+                phase["timings"]["previous_total_seconds"] = prev_t.get("total_seconds")
+                phase["timings"]["previous_simulated_steps"] = prev_t.get("simulated_steps")
+
     result = {
         "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z",
         "git": git_info,
         "phases": {
-            "synthetic": synthetic,
-            "real": real,
+            pname: phases.get(pname, previous.get(pname, {}))
+            for pname in ["synthetic", "real"]
         },
     }
 
-    # Escribir metrics.json
-    (case_dir / "metrics.json").write_text(
-        json.dumps(result, indent=2), encoding="utf-8"
-    )
+    # Series primero: metrics.json nunca referencia un archivo que aún no está
+    publish_phase_series(checkpoint, case_name, phases)
+    write_json_atomic(metrics_path, result)
+    if checkpoint is not None:
+        checkpoint.save(case_name, "written", {"path": str(metrics_path)})
+    run_ledger.emit("written", case=case_name, path=str(metrics_path))
 
     # Calcular EDI para mostrar
     for pname in ["synthetic", "real"]:
@@ -414,23 +1308,279 @@ def regenerate_case(case_name, cfg):
                                       "c3_replication", "c4_validity",
                                       "c5_uncertainty"] if phase.get(c))
             print(f"[{pname}: EDI={edi:.3f}, C={c_pass}/5]", end=" ")
+    return result
 
-    print("✅")
+
+def regenerate_case(case_name, cfg, checkpoint=None, root_seed=DEFAULT_ROOT_SEED):
+    """Regenera metrics.json para un caso con comparación justa.
+
+    Las semillas salen de ``SeedStream(root_seed, caso)``: cada fase y cada
+    conjunto de datos tiene su propio flujo, estable entre intérpretes.
+    """
+    case_dir = CASES_DIR / case_name
+    if not case_dir.exists():
+        print(f"  ⚠️  {case_name}: directorio no encontrado")
+        return False
+
+    if checkpoint is not None and checkpoint.load(case_name, "written"):
+        print(f"  ⏭  {case_name}: ya escrito en la corrida {checkpoint.run_id}")
+        return True
+
+    print(f"  ▶ {case_name}...", end=" ", flush=True)
+
+    if checkpoint is not None:
+        root_seed = checkpoint.root_seed
+    root = SeedStream(root_seed, case_name)
+
+    with run_ledger.span("case", case=case_name):
+        phases = {}
+        for pname in case_phases(cfg):
+            obs, forcing, phase_cfg, data_info = phase_inputs(case_name, pname, cfg, root)
+            phases[pname] = checkpointed_phase(checkpoint, case_name, pname, obs, forcing,
+                                               phase_cfg, phase_stream(root, pname),
+                                               data_info=data_info)
+        if "real" not in phases:
+            # Caso movilidad: conservar fase real existente
+            print("(solo sintético)", end=" ")
+
+        written = write_case_metrics(case_name, phases, checkpoint)
+    print("✅" if written else "⏭")
     return True
 
 
+def add_case_options(parser):
+    """Opciones de línea de comandos que modifican la configuración de cada caso."""
+    parser.add_argument("--engine", choices=["clima", "local"],
+                        help="Motor ABM: caso_clima (por defecto) o abm_engine local")
+    parser.add_argument("--online-indicators", action="store_true",
+                        help="Symploké y no-localidad en línea, sin historia "
+                             "(requiere --engine local)")
+    parser.add_argument("--significance", type=int, metavar="K",
+                        help="p-valor del EDI contra K series sustitutas (recalibra cada una)")
+    parser.add_argument("--significance-workers", type=int, default=None,
+                        help="Procesos para recalibrar y simular los sustitutos")
+    parser.add_argument("--surrogate", choices=["phase", "block"], default="phase",
+                        help="Sustitutos: fases aleatorias (FFT) o bootstrap por bloques")
+    parser.add_argument("--gsa", choices=["morris", "sobol"],
+                        help="C5 por análisis de sensibilidad global en vez de 5 corridas")
+    parser.add_argument("--gsa-workers", type=int, default=None,
+                        help="Procesos para evaluar el diseño de sensibilidad")
+    parser.add_argument("--calibration-workers", type=int, default=None,
+                        help="Procesos para evaluar la grilla de calibración del ABM")
+    parser.add_argument("--calibration", choices=["grid", "surrogate"],
+                        help="Calibración del ABM: grilla 4×3×3 o superficie de respuesta (5 parámetros)")
+    parser.add_argument("--calibration-budget", type=int, default=None,
+                        help="Simulaciones de la calibración por superficie de respuesta")
+    parser.add_argument("--screen", action="store_true",
+                        help="Cortar cada fase en el primer criterio que falle (exploración; "
+                             "una fase cortada no se escribe en metrics.json)")
+    parser.add_argument("--c3-replicas", type=int, metavar="MAX",
+                        help="C3 secuencial: réplicas por lotes hasta decidir, con tope MAX")
+    parser.add_argument("--c3-batch", type=int, default=4,
+                        help="Réplicas por lote del C3 secuencial")
+    parser.add_argument("--cv-folds", type=int, metavar="K",
+                        help="Validación cruzada de origen móvil con K pliegues")
+    parser.add_argument("--cv-workers", type=int, default=None,
+                        help="Procesos para los pliegues (por defecto, uno por pliegue)")
+    parser.add_argument("--save-series", action="store_true",
+                        help="Guardar las series de cada fase en <caso>/series/*.npz "
+                             "(al escribir metrics.json)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Calibrar el ABM desde la calibración del metrics.json actual")
+    parser.add_argument("--ode-profile", action="store_true",
+                        help="Barrido de perfil de (α, β) de la ODE en el bloque calibration")
+
+
+def check_case_options(parser, args):
+    """Rechaza combinaciones de ``add_case_options`` inválidas antes de crear la corrida."""
+    if getattr(args, "online_indicators", False) and args.engine != "local":
+        parser.error("--online-indicators requiere --engine local")
+
+
+def case_options(args):
+    """Opciones de ``add_case_options`` como dict serializable (se guarda en el manifiesto)."""
+    options = {}
+    if args.engine:
+        options["abm_engine"] = args.engine
+    if args.online_indicators:
+        options["online_indicators"] = True
+    if args.significance:
+        options["significance"] = {"surrogates": args.significance, "method": args.surrogate,
+                                   "workers": args.significance_workers}
+    if args.gsa:
+        options["gsa"] = {"method": args.gsa, "workers": args.gsa_workers}
+    if args.calibration_workers:
+        options["calibration_workers"] = args.calibration_workers
+    if args.calibration:
+        options["calibration_method"] = args.calibration
+    if args.calibration_budget:
+        options["calibration_budget"] = args.calibration_budget
+    if args.screen:
+        options["screen"] = True
+    if args.c3_replicas:
+        options["c3_sequential"] = {"batch": args.c3_batch, "max_replicas": args.c3_replicas}
+    if args.cv_folds:
+        options["cross_validation"] = {"folds": args.cv_folds, "workers": args.cv_workers}
+    if args.save_series:
+        options["save_series"] = True
+    if args.warm_start:
+        options["warm_start"] = True
+    if args.ode_profile:
+        options["ode_profile"] = True
+    return options
+
+
+def case_config(case_name, options=None):
+    """Configuración de un caso con las opciones de la corrida aplicadas."""
+    return dict(CASE_CONFIGS[case_name], **(options or {}))
+
+
+def recorded_durations():
+    """Duración por caso: bitácora de regeneraciones o, si no hay, timings del metrics.json."""
+    durations = {}
+    for case_name in CASE_CONFIGS:
+        try:
+            phases = json.loads((CASES_DIR / case_name / "metrics.json")
+                                .read_text(encoding="utf-8")).get("phases", {})
+        except (OSError, ValueError):
+            continue
+        seconds = [(p.get("timings") or {}).get("total_seconds") for p in phases.values()
+                   if isinstance(p, dict)]
+        if any(seconds):
+            durations[case_name] = sum(t for t in seconds if t)
+    durations.update(scheduler.expected_durations("regenerate"))
+    return durations
+
+
+def _scheduled_case(run_id, case_name, memory_mb, log_path):
+    """Proceso de un caso en ``--workers``: límite de memoria, log propio y checkpoints.
+
+    Encabeza su propio grupo de procesos (sus pools caen con él) y convierte
+    SIGTERM en SystemExit, de modo que las series compartidas se liberan.
+    """
+    os.setsid()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(128 + signal.SIGTERM))
+    limit = scheduler.memory_limiter(memory_mb)
+    if limit:
+        limit()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log = open(log_path, "a", encoding="utf-8", buffering=1)
+    sys.stdout = sys.stderr = log
+    run_ledger.configure(run_id=run_id, source="regenerate")
+    checkpoint = RunCheckpoint(run_id, resume=True)
+    ok = regenerate_case(case_name, case_config(case_name, checkpoint.options), checkpoint)
+    print()
+    sys.exit(0 if ok else 1)
+
+
+class _CaseProcess:
+    """``multiprocessing.Process`` con la interfaz de ``Popen`` que usa scheduler.run_jobs."""
+
+    def __init__(self, target, args):
+        self.process = multiprocessing.Process(target=target, args=args)
+        self.process.start()
+
+    def poll(self):
+        return None if self.process.is_alive() else self.process.exitcode
+
+    def kill(self):
+        """Mata el grupo del caso y libera las series compartidas que haya dejado."""
+        if not scheduler.terminate_group(self.process.pid, self.process.is_alive):
+            self.process.kill()
+        self.process.join()
+        shared_series.cleanup_owner(self.process.pid)
+
+    def wait(self):
+        self.process.join()
+        return self.process.exitcode
+
+
+def run_scheduled(checkpoint, jobs, workers):
+    """Corre ``jobs`` en procesos aislados; devuelve cuántos casos terminaron bien."""
+    def launch(job):
+        log_path = checkpoint.dir / "logs" / f"{job.name}.log"
+        return _CaseProcess(_scheduled_case,
+                            (checkpoint.run_id, job.name, job.memory_mb, log_path))
+
+    def on_done(job, status, returncode, seconds):
+        if status == "timeout" or (returncode is not None and returncode < 0):
+            # El proceso murió sin cerrar su evento case_end
+            run_ledger.emit("case_end", case=job.name, status=status, seconds=round(seconds, 4),
+                            returncode=returncode)
+        mark = {"ok": "✅", "failed": "❌", "timeout": "⏱️  Timeout"}[status]
+        print(f"  {mark} {job.name} ({seconds:.1f}s, esperado {job.expected:.1f}s)", flush=True)
+        if status != "ok":
+            print(f"     log: {checkpoint.dir / 'logs' / f'{job.name}.log'}")
+
+    results = scheduler.run_jobs(jobs, launch, workers=workers, on_done=on_done)
+    return sum(1 for status in results.values() if status == "ok")
+
+
 def main():
-    print(f"🔧 Regenerando métricas justas para {len(CASE_CONFIGS)} casos...\n")
+    parser = argparse.ArgumentParser(description="Regenera metrics.json con comparación justa")
+    parser.add_argument("--run-id", help="Identificador de la corrida (por defecto, timestamp UTC)")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Retoma una corrida interrumpida")
+    parser.add_argument("--seed", type=int, default=DEFAULT_ROOT_SEED,
+                        help="Semilla raíz de la que se derivan todas las demás")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Casos simultáneos, cada uno en su proceso (más largos primero)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Timeout por caso con --workers; 0: sin límite "
+                             "(por defecto: case_budgets.regenerate, sin límite)")
+    parser.add_argument("--memory-mb", type=int, default=None,
+                        help="Memoria máxima por caso con --workers "
+                             "(por defecto: case_budgets.regenerate)")
+    parser.add_argument("--plan", action="store_true",
+                        help="Sólo mostrar orden, presupuestos y makespan esperado")
+    add_case_options(parser)
+    args = parser.parse_args()
+    check_case_options(parser, args)
+
+    jobs = scheduler.make_jobs(list(CASE_CONFIGS), recorded_durations(),
+                               scheduler.load_budgets("regenerate"),
+                               {"timeout": args.timeout, "memory_mb": args.memory_mb})
+    if args.plan:
+        scheduler.print_plan(jobs, args.workers or 1, naive_order=list(CASE_CONFIGS))
+        return 0
+
+    try:
+        if args.resume:
+            checkpoint = RunCheckpoint(args.resume, resume=True)
+        else:
+            run_id = args.run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            checkpoint = RunCheckpoint(run_id, root_seed=args.seed, options=case_options(args))
+    except (FileExistsError, FileNotFoundError) as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    print(f"🔧 Regenerando métricas justas para {len(CASE_CONFIGS)} casos...")
+    print(f"   Corrida: {checkpoint.run_id} ({checkpoint.dir}), semilla raíz {checkpoint.root_seed}\n")
 
+    run_ledger.configure(run_id=checkpoint.run_id, source="regenerate")
     success = 0
-    for case_name, cfg in CASE_CONFIGS.items():
-        if regenerate_case(case_name, cfg):
-            success += 1
+    with run_ledger.span("run", options=checkpoint.options, root_seed=checkpoint.root_seed,
+                         resumed=bool(args.resume)) as end:
+        if args.workers:
+            pending = []
+            for job in jobs:
+                if checkpoint.load(job.name, "written"):
+                    print(f"  ⏭  {job.name}: ya escrito en la corrida {checkpoint.run_id}")
+                    success += 1
+                else:
+                    pending.append(job)
+            success += run_scheduled(checkpoint, pending, args.workers)
+        else:
+            for case_name in CASE_CONFIGS:
+                cfg = case_config(case_name, checkpoint.options)
+                if regenerate_case(case_name, cfg, checkpoint):
+                    success += 1
+        end["cases_ok"] = success
 
     print(f"\n{'═' * 60}")
     print(f"Regenerados: {success}/{len(CASE_CONFIGS)}")
     print(f"\nSiguiente paso: python3 scripts/tesis.py sync && python3 scripts/tesis.py audit")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+rng_streams.py — Flujos de números aleatorios derivados de una semilla raíz.
+
+Cada sorteo del pipeline se identifica por una ruta (caso, fase, uso, ...)
+y su semilla se deriva de ``sha256(raíz, ruta)``, al estilo de
+``numpy.random.SeedSequence``. Así:
+
+- ningún código toca el estado global de ``random`` (seguro entre hilos);
+- la semilla de una unidad depende sólo de su ruta, no del orden en que se
+  ejecuta ni de cuántos procesos hay, de modo que una corrida paralela o
+  reanudada reproduce exactamente a la secuencial;
+- a diferencia de ``hash(str)``, el resultado es estable entre intérpretes
+  (``PYTHONHASHSEED``).
+"""
+
+import hashlib
+import random
+
+DEFAULT_ROOT_SEED = 20240601
+
+
+class SeedStream:
+    """Nodo de un árbol de semillas: ``spawn`` baja un nivel, ``seed`` sortea."""
+
+    def __init__(self, root, *path):
+        self.root = int(root)
+        self.path = tuple(str(p) for p in path)
+
+    def spawn(self, *keys):
+        return SeedStream(self.root, *self.path, *keys)
+
+    def seed(self, *keys):
+        """Entero de 32 bits determinado por (raíz, ruta, keys).
+
+        32 bits porque el motor externo puede sembrar ``numpy.random.seed``,
+        que no acepta valores mayores.
+        """
+        label = "\x1f".join((str(self.root),) + self.path + tuple(str(k) for k in keys))
+        digest = hashlib.sha256(label.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "little")
+
+    def rng(self, *keys):
+        """``random.Random`` privado para (ruta, keys)."""
+        return random.Random(self.seed(*keys))
+
+    def __repr__(self):
+        return f"SeedStream({self.root}, {'/'.join(self.path)})"
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+run_ledger.py — Bitácora JSONL de corridas (una línea por evento).
+
+``regenerate_fair_metrics.py``, los workers de ``work_queue.py`` y
+``tesis.py validate`` agregan eventos a ``runs/ledger.jsonl``:
+
+    run_start / run_end          corrida completa (opciones, casos exitosos)
+    worker_start / worker_end    un worker de la cola (tareas completadas)
+    case_start / case_end        un caso
+    phase_start / phase_end      una fase (simulaciones, pasos simulados, pasos/s)
+    calibration                  calibración terminada (método, simulaciones, RMSE)
+    written                      metrics.json escrito
+
+Cada evento lleva ``ts`` (UTC), ``run_id``, ``source`` y ``worker``
+(host:pid); los ``*_end`` llevan además ``seconds`` y ``status``. Cada
+línea se escribe con una sola llamada en modo O_APPEND, así que varios
+procesos pueden compartir la bitácora sin bloquearse.
+
+``tesis.py runs`` resume el rendimiento y las unidades más lentas.
+"""
+
+import json
+import os
+import socket
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+LEDGER_PATH = Path(__file__).resolve().parent / "runs" / "ledger.jsonl"
+
+_CONTEXT = {"run_id": None, "source": None, "worker": None}
+
+
+def configure(run_id=None, source=None, worker=None):
+    """Fija el contexto de los eventos que emita este proceso."""
+    _CONTEXT.update(run_id=run_id, source=source, worker=worker)
+
+
+def _worker():
+    return _CONTEXT["worker"] or f"{socket.gethostname()}:{os.getpid()}"
+
+
+def emit(event, **fields):
+    """Agrega un evento a la bitácora; un fallo de escritura no detiene la corrida."""
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "event": event,
+        "run_id": _CONTEXT["run_id"],
+        "source": _CONTEXT["source"],
+        "worker": _worker(),
+    }
+    record.update(fields)
+    line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+    try:
+        LEDGER_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(LEDGER_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        print(f"  ⚠️  bitácora {LEDGER_PATH}: {exc}")
+
+
+@contextmanager
+def span(kind, **fields):
+    """Emite ``<kind>_start`` y, al salir, ``<kind>_end`` con duración y estado.
+
+    El dict entregado se agrega al evento final (p. ej. contadores, o
+    ``status`` para marcar un fallo sin excepción).
+    """
+    emit(f"{kind}_start", **fields)
+    extra = {}
+    status = "error"
+    t0 = time.perf_counter()
+    try:
+        yield extra
+        status = "ok"
+    finally:
+        end = dict(fields, status=status, seconds=round(time.perf_counter() - t0, 4))
+        end.update(extra)
+        emit(f"{kind}_end", **end)
+
+
+def throughput(timings):
+    """Simulaciones, pasos simulados y pasos/s de un bloque ``timings`` de metrics.json."""
+    steps = timings.get("simulated_steps", 0)
+    seconds = timings.get("total_seconds") or 0.0
+    return {
+        "simulations": timings.get("abm_calls", 0) + timings.get("ode_calls", 0),
+        "simulated_steps": steps,
+        "steps_per_second": round(steps / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def read_events(path=None):
+    """Eventos de la bitácora en orden; ignora líneas truncadas o corruptas."""
+    path = Path(path or LEDGER_PATH)
+    if not path.exists():
+        return []
+    events = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+def _ts(event):
+    return datetime.fromisoformat(event["ts"]).timestamp()
+
+
+def summarize(events, last=10, top=10):
+    """Resumen de las últimas ``last`` corridas y las ``top`` unidades más lentas.
+
+    Devuelve ``(runs, slowest)``. Cada corrida agrupa los eventos de un
+    ``run_id`` (varios workers incluidos): duración de pared, fases, pasos
+    simulados y pasos/s sobre esa duración. Las unidades son fases
+    (``phase_end``) o, para ``tesis.py validate``, casos.
+    """
+    by_run = {}
+    for ev in events:
+        if ev.get("run_id"):
+            by_run.setdefault(ev["run_id"], []).append(ev)
+
+    runs = []
+    for run_id, evs in by_run.items():
+        start, end = _ts(evs[0]), _ts(evs[-1])
+        phases = [e for e in evs if e["event"] == "phase_end"]
+        steps = sum(e.get("simulated_steps") or 0 for e in phases)
+        wall = end - start
+        runs.append({
+            "run_id": run_id,
+            "source": evs[0].get("source"),
+            "started": evs[0]["ts"],
+            "wall_seconds": round(wall, 1),
+            "workers": len({e.get("worker") for e in evs}),
+            "cases": len({e["case"] for e in evs if e["event"] == "case_end"}
+                         | {e["case"] for e in phases}),
+            "phases": len(phases),
+            "simulations": sum(e.get("simulations") or 0 for e in phases),
+            "simulated_steps": steps,
+            "steps_per_second": round(steps / wall, 1) if wall > 0 and steps else None,
+            "failures": sum(1 for e in evs if e["event"].endswith("_end")
+                            and e.get("status") not in ("ok", "skipped")),
+            "finished": any(e["event"] in ("run_end", "worker_end") for e in evs),
+        })
+    runs.sort(key=lambda r: r["started"])
+    runs = runs[-last:]
+
+    recent = {r["run_id"] for r in runs}
+    units = [e for e in events if e.get("run_id") in recent and e.get("status") != "skipped"
+             and (e["event"] == "phase_end"
+                  or (e["event"] == "case_end" and e.get("source") == "validate"))]
+    units.sort(key=lambda e: e.get("seconds", 0.0), reverse=True)
+    return runs, units[:top]
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+scheduler.py — Orden "más largo primero" para validar y regenerar casos.
+
+Los tiempos por caso son muy desiguales (algunos validate.py rozan el
+timeout, otros terminan en segundos); recorrerlos en orden alfabético deja
+rezagados al final. Aquí:
+
+- ``expected_durations`` estima la duración de cada caso a partir de la
+  bitácora de corridas (``case_end`` de la misma fuente que no se omitieron
+  ni abortaron por excepción; mediana de las últimas 3), acotada por su
+  timeout;
+- ``make_jobs`` los ordena de mayor a menor duración esperada (LPT, Graham
+  1969: makespan ≤ 4/3 del óptimo); los casos sin historia van primero;
+- cada trabajo lleva su presupuesto (``case_budgets`` del manifiesto, con
+  una sección ``validate`` y otra ``regenerate``: timeout en segundos y
+  memoria en MB, que se aplica como RLIMIT_AS). Una regeneración no tiene
+  timeout por defecto: un caso largo no es un caso colgado;
+- ``simulate`` calcula el makespan esperado (``--plan``) y ``run_jobs``
+  ejecuta con N slots, lanzando el siguiente trabajo en cuanto uno termina
+  y matando los que exceden su timeout.
+
+Cada trabajo corre en su propio grupo de procesos (``GroupPopen`` o
+``os.setsid`` en el hijo) y ``terminate_group`` mata el grupo entero:
+SIGTERM, para que el caso cierre sus series compartidas, y SIGKILL tras
+``KILL_GRACE`` segundos, que alcanza también a los workers de sus pools.
+"""
+
+import heapq
+import json
+import os
+import signal
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import run_ledger
+
+MANIFEST_PATH = Path(__file__).resolve().parent / "tesis_manifest.json"
+DEFAULT_BUDGETS = {
+    "validate": {"timeout": 300, "memory_mb": None},
+    "regenerate": {"timeout": None, "memory_mb": None},
+}
+HISTORY = 3  # corridas recientes que entran en la estimación
+KILL_GRACE = 5.0  # segundos entre SIGTERM y SIGKILL al grupo de un trabajo
+
+
+class Job(NamedTuple):
+    name: str
+    expected: float  # segundos
+    known: bool  # ¿la duración viene de la bitácora?
+    timeout: Optional[float]
+    memory_mb: Optional[int]
+
+
+def load_budgets(section, path=MANIFEST_PATH):
+    """Sección ``section`` ("validate" o "regenerate") de ``case_budgets``.
+
+    Devuelve ``{"default": {...}, "<caso>": {...}}``; el "default" parte de
+    ``DEFAULT_BUDGETS[section]``, así que vale aunque falte el manifiesto.
+    """
+    try:
+        budgets = json.loads(Path(path).read_text(encoding="utf-8")).get("case_budgets", {})
+    except (OSError, ValueError):
+        budgets = {}
+    out = dict(budgets.get(section, {}))
+    out["default"] = dict(DEFAULT_BUDGETS[section], **out.get("default", {}))
+    return out
+
+
+def case_budget(name, budgets, overrides=None):
+    """Presupuesto de un caso: "default" < caso < ``overrides`` (None: sin límite)."""
+    budget = {"timeout": None, "memory_mb": None}
+    budget.update(budgets.get("default", {}))
+    budget.update(budgets.get(name, {}))
+    budget.update({k: v for k, v in (overrides or {}).items() if v is not None})
+    return budget
+
+
+def expected_durations(source, events=None):
+    """Duración esperada (s) por caso según la bitácora, para ``source`` dado."""
+    events = run_ledger.read_events() if events is None else events
+    history = {}
+    for ev in events:
+        if (ev.get("event") == "case_end" and ev.get("source") == source
+                and ev.get("status") not in ("skipped", "error") and "seconds" in ev):
+            history.setdefault(ev["case"], []).append(ev["seconds"])
+    return {case: statistics.median(secs[-HISTORY:]) for case, secs in history.items()}
+
+
+def make_jobs(names, durations, budgets=None, overrides=None):
+    """Trabajos en orden LPT; sin historia se asume la mayor duración conocida."""
+    fallback = max(durations.values(), default=60.0)
+    jobs = []
+    for name in names:
+        budget = case_budget(name, budgets or {}, overrides)
+        expected = durations.get(name, fallback)
+        if budget["timeout"]:
+            expected = min(expected, budget["timeout"])
+        jobs.append(Job(name, expected, name in durations, budget["timeout"], budget["memory_mb"]))
+    # Sin historia primero (podría ser largo); luego por duración descendente
+    return sorted(jobs, key=lambda j: (j.known, -j.expected))
+
+
+def simulate(jobs, workers):
+    """Asigna ``jobs`` en orden a ``workers`` slots; devuelve (makespan, [(inicio, slot, job)])."""
+    slots = [(0.0, i) for i in range(max(1, workers))]
+    heapq.heapify(slots)
+    timeline = []
+    for job in jobs:
+        start, slot = heapq.heappop(slots)
+        timeline.append((start, slot, job))
+        heapq.heappush(slots, (start + job.expected, slot))
+    return max(t for t, _ in slots), timeline
+
+
+def print_plan(jobs, workers, naive_order=None):
+    """Plan de ``--plan``: orden, presupuestos y makespan esperado."""
+    makespan, timeline = simulate(jobs, workers)
+    print(f"🗓  Plan: {len(jobs)} caso(s) en {workers} slot(s), más largo primero\n")
+    print(f"  {'Inicio':>8} {'Slot':>4} {'Esperado':>9} {'Timeout':>8} {'Memoria':>8}  Caso")
+    for start, slot, job in timeline:
+        mem = f"{job.memory_mb} MB" if job.memory_mb else "—"
+        timeout = f"{job.timeout:.0f}s" if job.timeout else "—"
+        mark = "" if job.known else "  (sin historia)"
+        print(f"  {start:>7.1f}s {slot:>4} {job.expected:>8.1f}s {timeout:>8} {mem:>8}  "
+              f"{job.name}{mark}")
+    print(f"\n  Makespan esperado: {makespan:.1f}s (suma {sum(j.expected for j in jobs):.1f}s)")
+    if naive_order is not None:
+        by_name = {j.name: j for j in jobs}
+        naive, _ = simulate([by_name[n] for n in naive_order if n in by_name], workers)
+        print(f"  En orden alfabético: {naive:.1f}s")
+    return makespan
+
+
+def memory_limiter(memory_mb):
+    """``preexec_fn`` que limita el espacio de direcciones del proceso hijo (Unix)."""
+    if not memory_mb:
+        return None
+
+    def _limit():
+        import resource
+        limit = int(memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    return _limit
+
+
+def terminate_group(pid, is_alive, grace=KILL_GRACE):
+    """Mata el grupo de procesos que encabeza ``pid``: SIGTERM y, tras ``grace`` s, SIGKILL.
+
+    El SIGKILL final va al grupo aunque el líder ya haya salido, para no
+    dejar huérfanos a sus hijos. Devuelve False si el grupo no existe (el
+    hijo aún no llamó a ``setsid``).
+    """
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return False
+    deadline = time.monotonic() + grace
+    while is_alive() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    return True
+
+
+class GroupPopen(subprocess.Popen):
+    """``subprocess.Popen`` en una sesión nueva cuyo ``kill()`` mata todo el grupo."""
+
+    def __init__(self, args, **kwargs):
+        super().__init__(args, start_new_session=True, **kwargs)
+
+    def kill(self):
+        if not terminate_group(self.pid, lambda: self.poll() is None):
+            super().kill()
+
+
+def run_jobs(jobs, launch, workers=1, on_start=None, on_done=None, poll=0.2):
+    """Ejecuta ``jobs`` en orden con ``workers`` slots.
+
+    ``launch(job)`` inicia el trabajo y devuelve un objeto con ``poll()``
+    (None mientras corre; si no, el código de salida), ``kill()`` (que debe
+    alcanzar también a los procesos que el trabajo lanzó; ver
+    ``GroupPopen``) y ``wait()`` (como ``subprocess.Popen``).
+    ``on_done(job, status, returncode, seconds)`` recibe "ok", "failed" o
+    "timeout". Devuelve ``{nombre: status}``.
+    """
+    pending = list(jobs)
+    running = []
+    results = {}
+    while pending or running:
+        while pending and len(running) < max(1, workers):
+            job = pending.pop(0)
+            if on_start:
+                on_start(job)
+            running.append((job, launch(job), time.monotonic()))
+        time.sleep(poll)
+        still = []
+        for job, handle, t0 in running:
+            elapsed = time.monotonic() - t0
+            code = handle.poll()
+            if code is None:
+                if not (job.timeout and elapsed > job.timeout):
+                    still.append((job, handle, t0))
+                    continue
+                handle.kill()
+                code = handle.wait()
+                status = "timeout"
+            else:
+                status = "ok" if code == 0 else "failed"
+            results[job.name] = status
+            if on_done:
+                on_done(job, status, code, elapsed)
+        running = still
+    return results
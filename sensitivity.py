@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+sensitivity.py — Análisis de sensibilidad global (Morris / Sobol) del ABM.
+
+Explora la caja ±pct alrededor de los parámetros calibrados de
+``PARAM_KEYS`` con diseños cuasi-aleatorios (Halton) y evalúa todos los
+puntos como un lote, en paralelo si se pide:
+
+- ``morris``: r trayectorias uno-a-la-vez sobre una grilla de p niveles;
+  reporta μ*, μ y σ de los efectos elementales, con IC bootstrap de μ*.
+  Costo r·(k+1) simulaciones (r=6, k=5 → 36, lo mismo que calibrate_abm).
+- ``sobol``: diseño de Saltelli (A, B y A_B^i) con estimadores de Saltelli
+  2010 (S1, con salidas centradas) y Jansen (ST), con IC bootstrap. Costo
+  N·(k+2) simulaciones (N=32, k=5 → 224).
+
+La salida escalar de cada punto la calcula ``evaluate`` (una función de
+módulo, serializable para el pool). Todos los puntos usan la misma semilla
+(números aleatorios comunes), de modo que las diferencias entre puntos
+reflejan los parámetros y no el ruido de la simulación; los puntos repetidos
+del diseño se evalúan una sola vez.
+
+``seed`` siembra lo aleatorio (orden y signos de Morris, bootstrap) y
+``skip`` elige el tramo de la secuencia de Halton: se pasan por separado
+para que dos diseños con semillas distintas no compartan puntos.
+"""
+
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+PARAM_KEYS = ["diffusion", "macro_coupling", "forcing_scale", "damping", "noise"]
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+
+
+def halton(n, dims, skip=0):
+    """n puntos de la secuencia de Halton en [0, 1)^dims (bases primas)."""
+    points = []
+    for i in range(skip + 1, skip + n + 1):
+        row = []
+        for base in PRIMES[:dims]:
+            f, r, k = 1.0, 0.0, i
+            while k:
+                f /= base
+                r += f * (k % base)
+                k //= base
+            row.append(r)
+        points.append(row)
+    return points
+
+
+def _to_params(base, keys, unit, pct):
+    """Punto del cubo unitario → parámetros en la caja base·(1 ± pct)."""
+    p = dict(base)
+    for key, u in zip(keys, unit):
+        p[key] = base[key] * (1.0 - pct + 2.0 * pct * u)
+    return p
+
+
+def _evaluate_all(evaluate, base, keys, units, pct, workers):
+    """Evalúa los puntos únicos del diseño; devuelve las salidas en orden."""
+    unique = {}
+    for u in units:
+        unique.setdefault(tuple(round(v, 12) for v in u), None)
+    jobs = [_to_params(base, keys, u, pct) for u in unique]
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(evaluate, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        outputs = [evaluate(p) for p in jobs]
+    table = dict(zip(unique, outputs))
+    return [table[tuple(round(v, 12) for v in u)] for u in units], len(jobs)
+
+
+def _bootstrap_ci(values, stat, rng, resamples=500, level=0.95):
+    n = len(values)
+    stats = sorted(stat([values[rng.randrange(n)] for _ in range(n)]) for _ in range(resamples))
+    lo = stats[int((1.0 - level) / 2.0 * resamples)]
+    hi = stats[min(resamples - 1, int((1.0 + level) / 2.0 * resamples))]
+    return [lo, hi]
+
+
+def morris(evaluate, base, pct=0.1, trajectories=6, levels=4, seed=0, skip=0, workers=None,
+           keys=None):
+    """Efectos elementales de Morris sobre la caja base·(1 ± pct)."""
+    keys = [k for k in (keys or PARAM_KEYS) if base.get(k)]
+    k = len(keys)
+    rng = random.Random(seed)
+    delta = levels / (2.0 * (levels - 1))
+    grid_max = 1.0 - delta
+    starts = halton(trajectories, k, skip=skip)
+
+    units, plan = [], []
+    for start in starts:
+        # Punto inicial sobre la grilla de niveles que permite el salto Δ
+        x = [math.floor(s * (levels / 2)) / (levels - 1) for s in start]
+        x = [min(v, grid_max) for v in x]
+        order = list(range(k))
+        rng.shuffle(order)
+        signs = [1 if rng.random() < 0.5 else -1 for _ in range(k)]
+        for i in range(k):
+            if signs[i] < 0:
+                x[i] += delta  # arrancar arriba para poder bajar
+        traj = [list(x)]
+        for i in order:
+            x = list(x)
+            x[i] += signs[i] * delta
+            traj.append(x)
+        units.extend(traj)
+        plan.append((order, signs))
+
+    ys, n_sims = _evaluate_all(evaluate, base, keys, units, pct, workers)
+
+    effects = {key: [] for key in keys}
+    for t, (order, signs) in enumerate(plan):
+        y = ys[t * (k + 1):(t + 1) * (k + 1)]
+        for step, i in enumerate(order):
+            effects[keys[i]].append((y[step + 1] - y[step]) / (signs[i] * delta))
+
+    indices = {}
+    for key, ee in effects.items():
+        mu = sum(ee) / len(ee)
+        mu_star = sum(abs(e) for e in ee) / len(ee)
+        sigma = math.sqrt(sum((e - mu) ** 2 for e in ee) / max(1, len(ee) - 1))
+        indices[key] = {
+            "mu": mu, "mu_star": mu_star, "sigma": sigma,
+            "mu_star_ci": _bootstrap_ci(ee, lambda s: sum(abs(e) for e in s) / len(s), rng),
+        }
+    return {
+        "method": "morris", "pct": pct, "trajectories": trajectories, "levels": levels,
+        "simulations": n_sims, "indices": indices,
+        "output_min": min(ys), "output_max": max(ys),
+    }
+
+
+def _sobol_estimates(fa, fb, fab):
+    n = len(fa)
+    mean = (sum(fa) + sum(fb)) / (2 * n)
+    var = sum((v - mean) ** 2 for v in fa + fb) / (2 * n - 1)
+    if var == 0.0:
+        return 0.0, 0.0
+    # Salidas centradas: mismo estimador, mucha menos varianza con N chico
+    s1 = sum((b - mean) * (ab - a) for a, b, ab in zip(fa, fb, fab)) / n / var
+    st = sum((a - ab) ** 2 for a, ab in zip(fa, fab)) / (2 * n) / var
+    return s1, st
+
+
+def sobol(evaluate, base, pct=0.1, samples=32, seed=0, skip=0, workers=None, keys=None,
+          resamples=500):
+    """Índices de Sobol de primer orden y totales (diseño de Saltelli)."""
+    keys = [k for k in (keys or PARAM_KEYS) if base.get(k)]
+    k = len(keys)
+    rng = random.Random(seed)
+    design = halton(samples, 2 * k, skip=skip)
+    a_rows = [row[:k] for row in design]
+    b_rows = [row[k:] for row in design]
+
+    units = a_rows + b_rows
+    for i in range(k):
+        units += [a[:i] + [b[i]] + a[i + 1:] for a, b in zip(a_rows, b_rows)]
+    ys, n_sims = _evaluate_all(evaluate, base, keys, units, pct, workers)
+
+    fa, fb = ys[:samples], ys[samples:2 * samples]
+    indices = {}
+    for i, key in enumerate(keys):
+        fab = ys[(2 + i) * samples:(3 + i) * samples]
+        s1, st = _sobol_estimates(fa, fb, fab)
+        boot = []
+        for _ in range(resamples):
+            idx = [rng.randrange(samples) for _ in range(samples)]
+            boot.append(_sobol_estimates([fa[j] for j in idx], [fb[j] for j in idx],
+                                         [fab[j] for j in idx]))
+        s1s = sorted(b[0] for b in boot)
+        sts = sorted(b[1] for b in boot)
+        lo, hi = int(0.025 * resamples), min(resamples - 1, int(0.975 * resamples))
+        indices[key] = {"S1": s1, "ST": st, "S1_ci": [s1s[lo], s1s[hi]],
+                        "ST_ci": [sts[lo], sts[hi]]}
+    return {
+        "method": "sobol", "pct": pct, "samples": samples,
+        "simulations": n_sims, "indices": indices,
+        "output_min": min(ys), "output_max": max(ys),
+    }
+
+
+def run_gsa(method, evaluate, base, pct=0.1, seed=0, skip=0, workers=None, **kwargs):
+    if method == "morris":
+        return morris(evaluate, base, pct=pct, seed=seed, skip=skip, workers=workers, **kwargs)
+    if method == "sobol":
+        return sobol(evaluate, base, pct=pct, seed=seed, skip=skip, workers=workers, **kwargs)
+    raise ValueError(f"Método de sensibilidad desconocido: {method}")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+series_store.py — Series de una fase en .npz (float64) sin depender de numpy.
+
+Un .npz es un ZIP sin compresión (ZIP_STORED) con un .npy por serie; cada
+.npy es una cabecera de texto (formato 1.0, alineada a 64 bytes) seguida de
+los float64 little-endian. ``numpy.load`` lo lee tal cual; aquí:
+
+- ``write_npz`` escribe el archivo de forma atómica y devuelve su SHA-256;
+- ``read_npz`` mapea el archivo en memoria (mmap) y devuelve, por serie, un
+  memoryview de sólo lectura sobre los datos: sin copiar ni decodificar, así
+  que recalcular un indicador sobre series guardadas cuesta milisegundos.
+
+metrics.json referencia el archivo por ruta relativa al caso y digest
+(bloque ``series`` de cada fase); ``load_series`` verifica el digest antes
+de entregar las series.
+
+Uso:
+    python3 repos/scripts/series_store.py TesisDesarrollo/02_Modelado_Simulacion/<caso>/series/synthetic.npz
+"""
+
+import ast
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import zipfile
+from array import array
+from pathlib import Path
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")  # cabecera local de un miembro ZIP (30 bytes)
+
+
+def npy_bytes(values):
+    """Contenido .npy (formato 1.0) de un vector float64."""
+    data = array("d", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    header = "{'descr': '<f8', 'fortran_order': False, 'shape': (%d,), }" % len(data)
+    # magic (8) + longitud (2) + cabecera + '\n' múltiplo de 64
+    pad = -(len(NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = (header + " " * pad + "\n").encode("latin1")
+    return NPY_MAGIC + struct.pack("<H", len(header)) + header + data.tobytes()
+
+
+def write_npz(path, arrays):
+    """Escribe ``{nombre: valores}`` en ``path`` (.npz) y devuelve el SHA-256 del archivo."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, values in arrays.items():
+            # Fecha fija: mismo contenido → mismo archivo → mismo digest
+            info = zipfile.ZipInfo(f"{name}.npy", date_time=(1980, 1, 1, 0, 0, 0))
+            zf.writestr(info, npy_bytes(values))
+    digest = file_sha256(tmp)
+    os.replace(tmp, path)
+    return digest
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _npy_view(buf, offset):
+    """memoryview float64 de un .npy que empieza en ``buf[offset]``."""
+    if bytes(buf[offset:offset + len(NPY_MAGIC)]) != NPY_MAGIC:
+        raise ValueError("no es un .npy formato 1.0")
+    (hlen,) = struct.unpack_from("<H", buf, offset + len(NPY_MAGIC))
+    start = offset + len(NPY_MAGIC) + 2
+    header = ast.literal_eval(bytes(buf[start:start + hlen]).decode("latin1"))
+    if header["descr"] != "<f8" or header["fortran_order"] or len(header["shape"]) != 1:
+        raise ValueError(f"se esperaba un vector '<f8': {header}")
+    data = start + hlen
+    view = buf[data:data + 8 * header["shape"][0]].cast("d")
+    if sys.byteorder == "big":
+        copy = array("d", view.tobytes())  # copia: el archivo está en little-endian
+        copy.byteswap()
+        return copy
+    return view
+
+
+def read_npz(path):
+    """``{nombre: memoryview float64}`` sobre un mapeo de sólo lectura de ``path``."""
+    with open(path, "rb") as fh:
+        buf = memoryview(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+    arrays = {}
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename}: miembro comprimido, no se puede mapear")
+            fields = _LOCAL_HEADER.unpack_from(buf, info.header_offset)
+            name_len, extra_len = fields[-2], fields[-1]
+            offset = info.header_offset + _LOCAL_HEADER.size + name_len + extra_len
+            arrays[info.filename[:-len(".npy")]] = _npy_view(buf, offset)
+    return arrays
+
+
+def load_series(case_dir, ref, verify=True):
+    """Series de una fase a partir de su bloque ``series`` de metrics.json.
+
+    Con ``verify`` compara el SHA-256 del archivo con el registrado y lanza
+    ValueError si no coincide (series de otra corrida).
+    """
+    path = Path(case_dir) / ref["path"]
+    if verify and file_sha256(path) != ref["sha256"]:
+        raise ValueError(f"{path}: el digest no coincide con metrics.json")
+    return read_npz(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+    for name, values in read_npz(sys.argv[1]).items():
+        print(f"{name:<10} n={len(values):<6} primero={values[0]:.6g} último={values[-1]:.6g}")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+shared_series.py — Series float64 de sólo lectura en memoria compartida.
+
+El forzante y la observación de una fase se copian una vez a un bloque de
+``multiprocessing.shared_memory``; los parámetros del ABM llevan sólo un
+``SeriesHandle`` (nombre, longitud, desplazamiento), que se copia con
+``dict(params)`` y se serializa a los workers de un pool en unos pocos bytes.
+Cada proceso se adjunta al bloque una sola vez y lee sin copiar:
+
+- ``resolve(handle)`` devuelve un memoryview de sólo lectura (o una vista
+  desplazada si ``shift != 0``, como el forzante alternativo de C4);
+- ``handle.prefix(n)`` es la vista de los primeros n valores (p. ej. el
+  tramo de entrenamiento), también sin copiar;
+- ``as_list(handle)`` da una lista, para motores que no aceptan vistas
+  (caso_clima); se construye una vez por handle y proceso, no por llamada.
+
+El proceso que crea el bloque (``SharedSeries``) es el único que lo libera.
+Los bloques se nombran con el pid del dueño: si éste muere por SIGKILL sin
+liberarlos, ``cleanup_owner(pid)`` los borra (scheduler, al matar un caso).
+"""
+
+import os
+import secrets
+import sys
+import threading
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import NamedTuple
+
+SHM_DIR = Path("/dev/shm")  # dónde POSIX expone los bloques en Linux
+
+_ATTACHED = {}  # nombre → SharedMemory adjuntado en este proceso
+_MATERIALIZED = {}  # handle → lista con sus valores, en este proceso
+_REGISTER_LOCK = threading.Lock()
+
+
+class SeriesHandle(NamedTuple):
+    """Referencia serializable a una serie compartida."""
+    name: str
+    length: int
+    shift: float = 0.0
+
+    def shifted(self, delta):
+        """Misma serie con ``delta`` sumado a cada valor (sin copiar)."""
+        return self._replace(shift=self.shift + delta)
+
+    def prefix(self, n):
+        """Los primeros ``n`` valores."""
+        return self._replace(length=min(n, self.length))
+
+
+class ShiftedSeries:
+    """Vista de sólo lectura ``base[i] + shift``."""
+
+    def __init__(self, base, shift):
+        self.base = base
+        self.shift = shift
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [v + self.shift for v in self.base[i]]
+        return self.base[i] + self.shift
+
+    def __iter__(self):
+        shift = self.shift
+        return (v + shift for v in self.base)
+
+
+class SharedSeries:
+    """Dueño de un bloque compartido con una copia de ``values``.
+
+    Uso: ``with SharedSeries(forcing) as shared: params["forcing_series"] = shared.handle``.
+    """
+
+    def __init__(self, values):
+        data = array("d", values)
+        self.shm = shared_memory.SharedMemory(name=_block_name(os.getpid()), create=True,
+                                              size=max(8, len(data) * 8))
+        self.shm.buf[:len(data) * 8] = data.tobytes()
+        self.handle = SeriesHandle(self.shm.name, len(data))
+        _ATTACHED[self.shm.name] = self.shm
+
+    def close(self):
+        _ATTACHED.pop(self.shm.name, None)
+        for handle in [h for h in _MATERIALIZED if h.name == self.shm.name]:
+            del _MATERIALIZED[handle]
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # aún hay vistas vivas: el mapeo se libera cuando mueran
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _block_name(pid):
+    return f"ss_{pid}_{secrets.token_hex(6)}"
+
+
+def cleanup_owner(pid):
+    """Libera los bloques que dejó el proceso ``pid`` (muerto); devuelve cuántos."""
+    if not SHM_DIR.is_dir():
+        return 0
+    removed = 0
+    for path in SHM_DIR.glob(f"ss_{pid}_*"):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _attach(name):
+    shm = _ATTACHED.get(name)
+    if shm is None:
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = _attach_untracked(name)
+        _ATTACHED[name] = shm
+    return shm
+
+
+def _attach_untracked(name):
+    """Adjunta ``name`` sin registrarlo en el resource_tracker (Python < 3.13).
+
+    Un bloque adjuntado no debe quedar registrado: con fork el worker tiene su
+    propio tracker, que lo liberaría al salir; con spawn/forkserver comparte el
+    del dueño, y desregistrarlo después borraría el registro del dueño (su
+    ``unlink`` terminaría en un KeyError del tracker). Se filtra sólo el
+    registro de este bloque mientras se adjunta.
+    """
+    with _REGISTER_LOCK:
+        register = resource_tracker.register
+
+        def _skip_own(resource, rtype):
+            if resource.lstrip("/") != name:
+                register(resource, rtype)
+
+        resource_tracker.register = _skip_own
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def resolve(series):
+    """Vista de sólo lectura de ``series`` si es un handle; si no, la devuelve tal cual."""
+    if not isinstance(series, SeriesHandle):
+        return series
+    view = _attach(series.name).buf.toreadonly().cast("d")[:series.length]
+    return ShiftedSeries(view, series.shift) if series.shift else view
+
+
+def as_list(series):
+    """Lista con los valores de ``series`` si es un handle (compartida: no modificarla)."""
+    if not isinstance(series, SeriesHandle):
+        return series
+    values = _MATERIALIZED.get(series)
+    if values is None:
+        values = _MATERIALIZED[series] = list(resolve(series))
+    return values
+
+
+def resolve_params(params, materialize=False):
+    """``params`` con los handles reemplazados por vistas (o listas si ``materialize``).
+
+    Sin handles devuelve el mismo dict; si no, una copia superficial.
+    """
+    if not any(isinstance(v, SeriesHandle) for v in params.values()):
+        return params
+    out = dict(params)
+    for key, value in params.items():
+        if isinstance(value, SeriesHandle):
+            out[key] = as_list(value) if materialize else resolve(value)
+    return out
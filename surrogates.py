@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+surrogates.py — Series sustitutas para contrastar la significancia del EDI.
+
+Dos familias de sustitutos de la serie observada, generadas en lote:
+
+- ``phase``: aleatorización de fases (FFT). Conserva el espectro de
+  potencia (autocorrelación lineal) y destruye la estructura restante.
+- ``block``: bootstrap circular por bloques. Conserva la dependencia local
+  hasta la longitud del bloque (por defecto ≈ n^(1/3)).
+
+La FFT es de radio mixto en Python puro (n = 240 = 2⁴·3·5 se factoriza
+completo); la transformada directa de la observación se calcula una sola
+vez y cada sustituto sólo cuesta una inversa O(n log n).
+
+Las trayectorias del ABM dependen de la observación a través de la
+calibración (α, β, la grilla y t0), así que el EDI de un sustituto exige
+recalibrar y volver a simular: eso lo hace ``edi_significance`` en
+regenerate_fair_metrics.py; aquí sólo se generan las series y se resume la
+distribución nula (``null_summary``).
+"""
+
+import cmath
+import math
+import random
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _twiddles(n, inverse):
+    sign = 1.0 if inverse else -1.0
+    return tuple(cmath.exp(sign * 2j * math.pi * j / n) for j in range(n))
+
+
+def _fft(x, inverse=False):
+    """FFT de radio mixto (Cooley-Tukey); factores primos grandes caen a DFT."""
+    n = len(x)
+    if n == 1:
+        return list(x)
+    p = next((f for f in (2, 3, 5, 7) if n % f == 0), None)
+    if p is None:
+        p = next((f for f in range(11, math.isqrt(n) + 1, 2) if n % f == 0), n)
+    w = _twiddles(n, inverse)
+    if p == n:
+        return [sum(x[j] * w[(j * k) % n] for j in range(n)) for k in range(n)]
+    m = n // p
+    subs = [_fft(x[r::p], inverse) for r in range(p)]
+    if p == 2:
+        even, odd = subs
+        out = [0j] * n
+        for k in range(m):
+            t = w[k] * odd[k]
+            out[k] = even[k] + t
+            out[k + m] = even[k] - t
+        return out
+    return [sum(subs[r][k % m] * w[(r * k) % n] for r in range(p)) for k in range(n)]
+
+
+def phase_randomized(series, k, seed):
+    """K sustitutos con el mismo espectro de amplitud y fases aleatorias."""
+    n = len(series)
+    mu = sum(series) / n
+    spectrum = _fft([v - mu for v in series])
+    amps = [abs(c) for c in spectrum]
+    rng = random.Random(seed)
+    half = n // 2
+    out = []
+    for _ in range(k):
+        coeffs = [0j] * n
+        for f in range(1, half + 1):
+            if f == n - f:  # Nyquist (n par): fase real
+                coeffs[f] = amps[f] * (1 if rng.random() < 0.5 else -1)
+            else:
+                c = amps[f] * cmath.exp(2j * math.pi * rng.random())
+                coeffs[f] = c
+                coeffs[n - f] = c.conjugate()
+        out.append([mu + c.real / n for c in _fft(coeffs, inverse=True)])
+    return out
+
+
+def block_bootstrap(series, k, seed, block=None):
+    """K sustitutos por bootstrap circular de bloques de longitud ``block``."""
+    n = len(series)
+    block = block or max(2, round(n ** (1.0 / 3.0)))
+    wrapped = list(series) + list(series[:block])
+    rng = random.Random(seed)
+    out = []
+    for _ in range(k):
+        s = []
+        while len(s) < n:
+            start = rng.randrange(n)
+            s.extend(wrapped[start:start + block])
+        out.append(s[:n])
+    return out
+
+
+def make_surrogates(series, k, method="phase", seed=0):
+    if method == "phase":
+        return phase_randomized(series, k, seed)
+    if method == "block":
+        return block_bootstrap(series, k, seed)
+    raise ValueError(f"Método de sustitutos desconocido: {method}")
+
+
+def _quantile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def null_summary(observed, null):
+    """p-valor unilateral de ``observed`` frente a la distribución ``null``.
+
+    p = (1 + #{nulo ≥ observado}) / (K + 1), con media y cuantiles 95/99 del nulo.
+    """
+    null = sorted(null)
+    exceed = sum(1 for v in null if v >= observed)
+    return {
+        "p_value": (1 + exceed) / (len(null) + 1),
+        "null_mean": sum(null) / len(null),
+        "null_q95": _quantile(null, 0.95), "null_q99": _quantile(null, 0.99),
+    }
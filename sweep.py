@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+sweep.py — Barrido de parámetros de CASE_CONFIGS: paisaje del EDI.
+
+Las configuraciones de ``regenerate_fair_metrics.CASE_CONFIGS`` son puntos
+elegidos a mano. Un barrido recorre una grilla o un hipercubo latino sobre
+``SWEEP_KEYS`` y, para cada punto, genera los datos sintéticos y ejecuta
+``evaluate_phase`` en un pool de procesos.
+
+- ``create`` enumera los puntos y los guarda en
+  ``runs/sweeps/<sweep_id>.sqlite`` junto con la especificación (caso,
+  opciones, semilla raíz).
+- ``run`` evalúa los puntos pendientes; el proceso principal escribe cada
+  resultado en cuanto llega (una fila por punto, una columna por parámetro
+  y por métrica), así que un barrido interrumpido se retoma con el mismo
+  comando sin repetir puntos.
+- Todos los puntos usan los flujos de semillas de la fase sintética del
+  caso (números aleatorios comunes): las diferencias entre puntos se deben
+  a los parámetros, no al sorteo.
+- ``status`` resume el barrido y dónde el EDI cruza ``EDI_TARGET``;
+  ``export`` vuelca la tabla a CSV.
+
+``macro_coupling_hint`` no es barrible: sólo fija el ``macro_coupling``
+inicial, y la calibración del ABM (grilla o superficie) lo reemplaza en
+todo punto, así que barrerlo no cambia ninguna métrica.
+
+Con ``--screen`` cada punto se corta en el primer criterio que falla (ver
+evaluate_phase), lo que abarata los barridos de miles de puntos.
+
+Uso:
+    python3 repos/scripts/sweep.py create mapa1 --case 04_caso_energia --engine local --screen \\
+        --lhs ode_alpha=0.02:0.2 --lhs micro_noise=0.05:0.4 --samples 2000
+    python3 repos/scripts/sweep.py create rejilla --case 04_caso_energia --engine local \\
+        --grid ode_beta=0.01,0.02,0.04 --grid forcing_seasonal_amp=0.3,0.6,0.9
+    python3 repos/scripts/sweep.py run mapa1 --workers 8
+    python3 repos/scripts/sweep.py status mapa1
+    python3 repos/scripts/sweep.py export mapa1 mapa1.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import socket
+import sqlite3
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+import regenerate_fair_metrics as rfm
+import run_ledger
+from rng_streams import DEFAULT_ROOT_SEED, SeedStream
+
+SWEEP_KEYS = ["ode_alpha", "ode_beta", "ode_noise", "forcing_seasonal_amp", "micro_noise"]
+SWEEP_DIR = rfm.RUNS_DIR / "sweeps"
+EDI_TARGET = 0.30
+
+# Columnas de resultado por punto (además de una por cada clave de SWEEP_KEYS)
+RESULT_COLUMNS = [
+    ("edi", "REAL"), ("rmse_abm", "REAL"), ("rmse_ode", "REAL"), ("rmse_reduced", "REAL"),
+    ("corr_abm", "REAL"), ("corr_ode", "REAL"),
+    ("c1", "INTEGER"), ("c2", "INTEGER"), ("c3", "INTEGER"), ("c4", "INTEGER"),
+    ("c5", "INTEGER"), ("emergence_pass", "INTEGER"), ("overall_pass", "INTEGER"),
+    ("failed_at", "TEXT"), ("simulations", "INTEGER"), ("simulated_steps", "INTEGER"),
+    ("seconds", "REAL"), ("worker", "TEXT"), ("error", "TEXT"),
+]
+CRITERIA = [("c1", "c1_convergence"), ("c2", "c2_robustness"), ("c3", "c3_replication"),
+            ("c4", "c4_validity"), ("c5", "c5_uncertainty")]
+
+
+class SweepTable:
+    """Tabla SQLite de un barrido: especificación en ``meta``, puntos en ``points``."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.row_factory = sqlite3.Row
+        columns = ", ".join(f"{key} REAL" for key in SWEEP_KEYS)
+        results = ", ".join(f"{name} {kind}" for name, kind in RESULT_COLUMNS)
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS points (
+                id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                {columns},
+                {results}
+            );
+        """)
+
+    def create(self, spec, points):
+        with self.conn:
+            self.conn.execute("INSERT INTO meta VALUES ('spec', ?)", (json.dumps(spec),))
+            keys = sorted({key for point in points for key in point})
+            self.conn.executemany(
+                f"INSERT INTO points ({', '.join(keys)}) VALUES ({', '.join('?' * len(keys))})",
+                [[point.get(key) for key in keys] for point in points])
+
+    def spec(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'spec'").fetchone()
+        return json.loads(row["value"])
+
+    def pending(self, retry_failed=False):
+        """(id, valores) de los puntos sin resultado, en orden."""
+        statuses = ("pending", "failed") if retry_failed else ("pending",)
+        rows = self.conn.execute(
+            f"SELECT * FROM points WHERE status IN ({', '.join('?' * len(statuses))}) "
+            "ORDER BY id", statuses)
+        return [(row["id"], {key: row[key] for key in SWEEP_KEYS if row[key] is not None})
+                for row in rows]
+
+    def record(self, point_id, row):
+        names = list(row)
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE points SET status = 'done', error = NULL, "
+                f"{', '.join(f'{name} = ?' for name in names)} WHERE id = ?",
+                [row[name] for name in names] + [point_id])
+
+    def fail(self, point_id, error):
+        with self.conn:
+            self.conn.execute("UPDATE points SET status = 'failed', error = ? WHERE id = ?",
+                              (error, point_id))
+
+    def counts(self):
+        rows = self.conn.execute("SELECT status, COUNT(*) AS n FROM points GROUP BY status")
+        return {row["status"]: row["n"] for row in rows}
+
+    def rows(self, status=None):
+        if status:
+            return self.conn.execute("SELECT * FROM points WHERE status = ? ORDER BY id",
+                                     (status,)).fetchall()
+        return self.conn.execute("SELECT * FROM points ORDER BY id").fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+def sweep_path(sweep_id):
+    return SWEEP_DIR / f"{sweep_id}.sqlite"
+
+
+def latin_hypercube(ranges, samples, seed):
+    """``samples`` puntos con un valor por estrato de cada rango (orden aleatorio)."""
+    rng = random.Random(seed)
+    columns = {}
+    for key, (lo, hi) in ranges.items():
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        columns[key] = [lo + (hi - lo) * (s + rng.random()) / samples for s in strata]
+    return [{key: columns[key][i] for key in ranges} for i in range(samples)]
+
+
+def sweep_points(grid=None, lhs=None, samples=0, seed=0):
+    """Puntos del barrido: producto de la grilla × muestras del hipercubo latino."""
+    grid_points = [dict(zip(grid, combo)) for combo in itertools.product(*grid.values())] \
+        if grid else [{}]
+    lhs_points = latin_hypercube(lhs, samples, seed) if lhs else [{}]
+    return [dict(g, **l) for g in grid_points for l in lhs_points]
+
+
+def evaluate_point(case_name, options, root_seed, values):
+    """Evalúa la fase sintética de ``case_name`` con ``values`` aplicados (en un worker)."""
+    cfg = dict(rfm.case_config(case_name, options), **values)
+    root = SeedStream(root_seed, case_name)
+    obs, forcing, phase_cfg, data_info = rfm.phase_inputs(case_name, "synthetic", cfg, root)
+    t0 = time.perf_counter()
+    phase = rfm.evaluate_phase("synthetic", obs, forcing, phase_cfg,
+                               rfm.phase_stream(root, "synthetic"), data_info=data_info)
+    seconds = time.perf_counter() - t0
+
+    def flag(value):
+        return None if value is None else int(bool(value))
+
+    errors, timings = phase["errors"], phase["timings"]
+    row = {
+        "edi": errors["edi_control"], "rmse_abm": errors["rmse_abm"],
+        "rmse_ode": errors["rmse_ode"], "rmse_reduced": errors["rmse_reduced"],
+        "corr_abm": phase["correlations"]["abm_obs"], "corr_ode": phase["correlations"]["ode_obs"],
+        "emergence_pass": flag(phase["emergence"]["pass"]),
+        "overall_pass": flag(phase["overall_pass"]),
+        "failed_at": (phase.get("screen") or {}).get("failed_at"),
+        "simulations": timings["abm_calls"] + timings["ode_calls"],
+        "simulated_steps": timings["simulated_steps"],
+        "seconds": round(seconds, 4),
+        "worker": f"{socket.gethostname()}:{os.getpid()}",
+    }
+    row.update({col: flag(phase[key]) for col, key in CRITERIA})
+    return row
+
+
+def run_sweep(sweep_id, workers=None, retry_failed=False):
+    """Evalúa los puntos pendientes en un pool; devuelve cuántos terminaron."""
+    table = SweepTable(sweep_path(sweep_id))
+    spec = table.spec()
+    pending = iter(table.pending(retry_failed))
+    workers = workers or os.cpu_count() or 1
+    run_ledger.configure(run_id=f"sweep-{sweep_id}", source="sweep")
+    done = failed = 0
+    t_start = time.perf_counter()
+    try:
+        with run_ledger.span("run", case=spec["case"], options=spec["options"]) as run_end, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+
+            def submit(n):
+                for point_id, values in itertools.islice(pending, n):
+                    fut = pool.submit(evaluate_point, spec["case"], spec["options"],
+                                      spec["root_seed"], values)
+                    futures[fut] = point_id
+
+            # Pocas tareas en vuelo: miles de puntos no se serializan de una vez
+            submit(2 * workers)
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    point_id = futures.pop(fut)
+                    try:
+                        row = fut.result()
+                    except Exception as exc:
+                        table.fail(point_id, f"{type(exc).__name__}: {exc}")
+                        failed += 1
+                        print(f"  ❌ punto {point_id}: {exc}", flush=True)
+                        continue
+                    table.record(point_id, row)
+                    done += 1
+                    run_ledger.emit(
+                        "phase_end", case=spec["case"], unit=f"sweep/{point_id}", status="ok",
+                        seconds=row["seconds"], worker=row["worker"],
+                        **run_ledger.throughput({"abm_calls": row["simulations"],
+                                                 "simulated_steps": row["simulated_steps"],
+                                                 "total_seconds": row["seconds"]}))
+                    if done % 50 == 0:
+                        rate = done / (time.perf_counter() - t_start)
+                        print(f"  ⏱  {done} puntos ({rate * 3600:.0f}/h)", flush=True)
+                submit(len(finished))
+            run_end.update(points_done=done, points_failed=failed)
+    finally:
+        table.close()
+    return done, failed
+
+
+def _parse_axis(text, kind):
+    key, _, values = text.partition("=")
+    if key not in SWEEP_KEYS:
+        raise ValueError(f"clave no barrible: {key} (opciones: {', '.join(SWEEP_KEYS)})")
+    if kind == "grid":
+        return key, [float(v) for v in values.split(",")]
+    lo, _, hi = values.partition(":")
+    return key, (float(lo), float(hi))
+
+
+def cmd_create(args):
+    path = sweep_path(args.sweep_id)
+    if path.exists():
+        print(f"❌ Ya existe el barrido {args.sweep_id} ({path})")
+        return 1
+    try:
+        grid = dict(_parse_axis(t, "grid") for t in args.grid or [])
+        lhs = dict(_parse_axis(t, "lhs") for t in args.lhs or [])
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 1
+    if set(grid) & set(lhs):
+        print(f"❌ Claves en --grid y --lhs a la vez: {', '.join(sorted(set(grid) & set(lhs)))}")
+        return 1
+    if not grid and not lhs:
+        print("❌ Indica al menos un --grid o --lhs")
+        return 1
+    if lhs and args.samples < 1:
+        print("❌ --lhs requiere --samples N")
+        return 1
+
+    spec = {
+        "case": args.case, "options": rfm.case_options(args), "root_seed": args.seed,
+        "grid": grid, "lhs": lhs, "samples": args.samples,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    points = sweep_points(grid, lhs, args.samples, seed=args.seed)
+    SWEEP_DIR.mkdir(parents=True, exist_ok=True)
+    table = SweepTable(path)
+    table.create(spec, points)
+    table.close()
+    print(f"📐 Barrido {args.sweep_id}: {len(points)} puntos de {args.case} en {path}")
+    return 0
+
+
+def cmd_run(args):
+    if not sweep_path(args.sweep_id).exists():
+        print(f"❌ No existe el barrido {args.sweep_id} en {SWEEP_DIR}")
+        return 1
+    print(f"🚀 Barrido {args.sweep_id}...")
+    done, failed = run_sweep(args.sweep_id, workers=args.workers,
+                             retry_failed=args.retry_failed)
+    print(f"\nEvaluados: {done} | Fallidos: {failed}")
+    return 0 if not failed else 1
+
+
+def _quantile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def cmd_status(args):
+    path = sweep_path(args.sweep_id)
+    if not path.exists():
+        print(f"❌ No existe el barrido {args.sweep_id} en {SWEEP_DIR}")
+        return 1
+    table = SweepTable(path)
+    spec, counts, rows = table.spec(), table.counts(), table.rows("done")
+    table.close()
+
+    print(f"📋 Barrido {args.sweep_id} ({spec['case']}): " + " | ".join(
+        f"{status}: {counts.get(status, 0)}" for status in ["pending", "done", "failed"]))
+    if not rows:
+        return 0
+    edis = [row["edi"] for row in rows]
+    above = sum(1 for e in edis if e >= EDI_TARGET)
+    print(f"  EDI: mín {min(edis):.3f} | mediana {_quantile(edis, 0.5):.3f} | "
+          f"máx {max(edis):.3f} | ≥ {EDI_TARGET:.2f}: {above}/{len(rows)}")
+    print(f"  Validados (overall_pass): {sum(1 for row in rows if row['overall_pass'])}"
+          f"/{len(rows)} | {sum(row['seconds'] for row in rows) / len(rows):.2f} s/punto")
+
+    # Fracción de puntos con EDI ≥ EDI_TARGET por tramo (hasta 5, de igual tamaño)
+    # de cada parámetro barrido
+    for key in list(spec["grid"]) + list(spec["lhs"]):
+        ordered = sorted(rows, key=lambda row: row[key])
+        n_bins = min(5, len({row[key] for row in rows}))
+        cells = []
+        for b in range(n_bins):
+            group = ordered[b * len(ordered) // n_bins:(b + 1) * len(ordered) // n_bins]
+            share = sum(1 for row in group if row["edi"] >= EDI_TARGET) / len(group)
+            cells.append(f"≤{group[-1][key]:.3g}: {share:.0%}")
+        print(f"  {key:<22} " + " | ".join(cells))
+    return 0
+
+
+def cmd_export(args):
+    path = sweep_path(args.sweep_id)
+    if not path.exists():
+        print(f"❌ No existe el barrido {args.sweep_id} en {SWEEP_DIR}")
+        return 1
+    table = SweepTable(path)
+    rows = table.rows()
+    table.close()
+    with open(args.output, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(rows[0].keys() if rows else [])
+        writer.writerows(tuple(row) for row in rows)
+    print(f"💾 {len(rows)} puntos → {args.output}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de parámetros: paisaje del EDI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("create", help="Define un barrido y enumera sus puntos")
+    p.add_argument("sweep_id")
+    p.add_argument("--case", required=True, choices=sorted(rfm.CASE_CONFIGS),
+                   help="Caso cuya configuración se toma como base")
+    p.add_argument("--grid", action="append", metavar="CLAVE=V1,V2,...",
+                   help="Valores de una clave (repetible; producto cartesiano)")
+    p.add_argument("--lhs", action="append", metavar="CLAVE=MIN:MAX",
+                   help="Rango de una clave para el hipercubo latino (repetible)")
+    p.add_argument("--samples", type=int, default=0, help="Muestras del hipercubo latino")
+    p.add_argument("--seed", type=int, default=DEFAULT_ROOT_SEED,
+                   help="Semilla raíz (datos, simulaciones y muestreo)")
+    rfm.add_case_options(p)
+    p.set_defaults(func=cmd_create)
+
+    p = sub.add_parser("run", help="Evalúa los puntos pendientes (retoma si se interrumpió)")
+    p.add_argument("sweep_id")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Procesos (por defecto, uno por CPU)")
+    p.add_argument("--retry-failed", action="store_true", help="Reintentar puntos fallidos")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("status", help="Progreso y dónde el EDI cruza el umbral")
+    p.add_argument("sweep_id")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("export", help="Vuelca la tabla de puntos a CSV")
+    p.add_argument("sweep_id")
+    p.add_argument("output")
+    p.set_defaults(func=cmd_export)
+
+    args = parser.parse_args()
+    rfm.check_case_options(parser, args)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,25 +7,38 @@ Subcomandos:
     build      Ensambla TesisFinal/Tesis.md desde secciones de TesisDesarrollo
     sync       Sincroniza metrics.json → bloques AUTO en docs (sin tocar prosa)
     audit      Verifica consistencia estructural y numérica de todos los casos
+    diff       Compara las métricas de todos los casos entre dos revisiones git
     validate   Ejecuta simulaciones y actualiza métricas
+    runs       Resume rendimiento y unidades más lentas de la bitácora de corridas
 
 Uso:
     python3 scripts/tesis.py scaffold --id 19 --name biodiversidad --title "Biodiversidad"
     python3 scripts/tesis.py build
     python3 scripts/tesis.py sync
     python3 scripts/tesis.py audit
+    python3 scripts/tesis.py diff HEAD~1 HEAD
     python3 scripts/tesis.py validate --case caso_clima
+    python3 scripts/tesis.py validate --jobs 4 --plan
+    python3 scripts/tesis.py runs --last 5
 """
 
 import argparse
+import hashlib
 import json
 import os
 import re
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+import run_ledger
+import scheduler
+
 # ─── Rutas ────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parent.parent.parent
@@ -90,14 +103,17 @@ def case_slug(case_dir):
     return m.group(1) if m else case_dir.name
 
 
-def load_metrics(case_dir):
-    """Busca metrics.json en TesisDesarrollo y repos."""
-    candidates = [
+def _metrics_candidates(case_dir):
+    return [
         case_dir / "metrics.json",
         REPOS_SIM / case_slug(case_dir) / "outputs" / "metrics.json",
         REPOS_SIM / case_slug(case_dir) / "metrics.json",
     ]
-    for mf in candidates:
+
+
+def load_metrics(case_dir):
+    """Busca metrics.json en TesisDesarrollo y repos."""
+    for mf in _metrics_candidates(case_dir):
         if mf.exists():
             return json.loads(mf.read_text(encoding="utf-8"))
     return None
@@ -121,6 +137,24 @@ def compute_cr(symploke):
     return 0.0
 
 
+def timing_growth(timings):
+    """Factor de crecimiento del costo de una fase respecto a la corrida anterior.
+
+    Compara segundos totales y pasos simulados; devuelve (factor, detalle) del
+    que más creció, o None si no hay registro previo.
+    """
+    worst = None
+    for key, unit in [("total_seconds", "s"), ("simulated_steps", " pasos")]:
+        now = timings.get(key)
+        prev = timings.get(f"previous_{key}")
+        if not now or not prev:
+            continue
+        factor = now / prev
+        if worst is None or factor > worst[0]:
+            worst = (factor, f"{prev:g}{unit} → {now:g}{unit}")
+    return worst
+
+
 # ─── SCAFFOLD ─────────────────────────────────────────────────────────────────
 
 def cmd_scaffold(args):
@@ -335,7 +369,7 @@ def cmd_sync(args):
 
         for md_file in case_dir.rglob("*.md"):
             content = md_file.read_text(encoding="utf-8")
-            new_content = _replace_auto_blocks(content, summary)
+            new_content = _replace_auto_blocks(content, summary, metrics)
             if new_content != content:
                 md_file.write_text(new_content, encoding="utf-8")
                 updated += 1
@@ -388,125 +422,459 @@ def _extract_summary(metrics):
     return summary
 
 
-def _replace_auto_blocks(content, summary):
-    """Reemplaza bloques <!-- AUTO:RESULTS:START/END --> con datos frescos."""
-
-    def _results_table(m):
-        return (
-            "<!-- AUTO:RESULTS:START -->\n"
-            "| Métrica | Sintético | Real |\n"
-            "|---------|-----------|------|\n"
-            f"| EDI     | {summary.get('synthetic_edi', '—')} | {summary.get('real_edi', '—')} |\n"
-            f"| CR      | {summary.get('synthetic_cr', '—')} | {summary.get('real_cr', '—')} |\n"
-            f"| RMSE ABM| {summary.get('synthetic_rmse_abm', '—')} | {summary.get('real_rmse_abm', '—')} |\n"
-            f"| RMSE ODE| {summary.get('synthetic_rmse_ode', '—')} | {summary.get('real_rmse_ode', '—')} |\n"
-            f"| Corr ABM| {summary.get('synthetic_corr_abm', '—')} | {summary.get('real_corr_abm', '—')} |\n"
-            f"| Corr ODE| {summary.get('synthetic_corr_ode', '—')} | {summary.get('real_corr_ode', '—')} |\n"
-            f"| C1      | {summary.get('synthetic_c1', '—')} | {summary.get('real_c1', '—')} |\n"
-            f"| C2      | {summary.get('synthetic_c2', '—')} | {summary.get('real_c2', '—')} |\n"
-            f"| C3      | {summary.get('synthetic_c3', '—')} | {summary.get('real_c3', '—')} |\n"
-            f"| C4      | {summary.get('synthetic_c4', '—')} | {summary.get('real_c4', '—')} |\n"
-            f"| C5      | {summary.get('synthetic_c5', '—')} | {summary.get('real_c5', '—')} |\n"
-            f"| Estado  | {summary.get('synthetic_status', '—')} | {summary.get('real_status', '—')} |\n"
-            "<!-- AUTO:RESULTS:END -->"
-        )
-
-    content = re.sub(
-        r'<!-- AUTO:RESULTS:START -->.*?<!-- AUTO:RESULTS:END -->',
-        _results_table,
-        content,
-        flags=re.DOTALL
+AUTO_BLOCKS = {}
+AUTO_OPEN = "<!-- AUTO:"
+AUTO_CLOSE = " -->"
+AUTO_KEY = re.compile(r'\w+')
+PHASE_COLUMNS = [("synthetic", "Sintético"), ("real", "Real")]
+
+
+def auto_block(name):
+    """Registra el renderer del bloque ``<!-- AUTO:NAME:START/END -->``.
+
+    El renderer recibe (summary, metrics) y devuelve las líneas internas del
+    bloque (sin marcadores).
+    """
+    def _register(fn):
+        AUTO_BLOCKS[name] = fn
+        return fn
+    return _register
+
+
+@auto_block("RESULTS")
+def _results_table(summary, metrics):
+    return (
+        "| Métrica | Sintético | Real |\n"
+        "|---------|-----------|------|\n"
+        f"| EDI     | {summary.get('synthetic_edi', '—')} | {summary.get('real_edi', '—')} |\n"
+        f"| CR      | {summary.get('synthetic_cr', '—')} | {summary.get('real_cr', '—')} |\n"
+        f"| RMSE ABM| {summary.get('synthetic_rmse_abm', '—')} | {summary.get('real_rmse_abm', '—')} |\n"
+        f"| RMSE ODE| {summary.get('synthetic_rmse_ode', '—')} | {summary.get('real_rmse_ode', '—')} |\n"
+        f"| Corr ABM| {summary.get('synthetic_corr_abm', '—')} | {summary.get('real_corr_abm', '—')} |\n"
+        f"| Corr ODE| {summary.get('synthetic_corr_ode', '—')} | {summary.get('real_corr_ode', '—')} |\n"
+        f"| C1      | {summary.get('synthetic_c1', '—')} | {summary.get('real_c1', '—')} |\n"
+        f"| C2      | {summary.get('synthetic_c2', '—')} | {summary.get('real_c2', '—')} |\n"
+        f"| C3      | {summary.get('synthetic_c3', '—')} | {summary.get('real_c3', '—')} |\n"
+        f"| C4      | {summary.get('synthetic_c4', '—')} | {summary.get('real_c4', '—')} |\n"
+        f"| C5      | {summary.get('synthetic_c5', '—')} | {summary.get('real_c5', '—')} |\n"
+        f"| Estado  | {summary.get('synthetic_status', '—')} | {summary.get('real_status', '—')} |"
     )
 
-    # Valores inline: <!-- AUTO:key -->valor<!-- /AUTO:key -->
-    def _inline_val(m):
-        key = m.group(1)
-        return f"<!-- AUTO:{key} -->{summary.get(key, m.group(2))}<!-- /AUTO:{key} -->"
 
-    content = re.sub(
-        r'<!-- AUTO:(\w+) -->(.+?)<!-- /AUTO:\1 -->',
-        _inline_val,
-        content
-    )
+def _mark(value):
+    return "✅" if value else ("❌" if value is False else "—")
 
-    return content
+
+@auto_block("CRITERIA")
+def _criteria_table(summary, metrics):
+    phases = metrics.get("phases", {})
+    rows = [
+        ("C1", "Convergencia", lambda ph: ph.get("c1_convergence")),
+        ("C2", "Robustez", lambda ph: ph.get("c2_robustness")),
+        ("C3", "Replicación", lambda ph: ph.get("c3_replication")),
+        ("C4", "Validez", lambda ph: ph.get("c4_validity")),
+        ("C5", "Incertidumbre", lambda ph: ph.get("c5_uncertainty")),
+        ("—", "Emergencia (EDI)", lambda ph: ph.get("emergence", {}).get("pass")),
+        ("—", "Symploké", lambda ph: ph.get("symploke", {}).get("pass")),
+        ("—", "No-localidad", lambda ph: ph.get("non_locality", {}).get("pass")),
+        ("—", "Persistencia", lambda ph: ph.get("persistence", {}).get("pass")),
+    ]
+    lines = ["| Criterio | Descripción | Sintético | Real |",
+             "|----------|-------------|-----------|------|"]
+    for code, label, get in rows:
+        cells = " | ".join(_mark(get(phases.get(p) or {})) for p, _ in PHASE_COLUMNS)
+        lines.append(f"| {code} | {label} | {cells} |")
+    return "\n".join(lines)
+
+
+@auto_block("SENSITIVITY")
+def _sensitivity_table(summary, metrics):
+    lines = ["| Fase | Media mín | Media máx | Método global | Parámetro más influyente |",
+             "|------|----------:|----------:|---------------|--------------------------|"]
+    for p, label in PHASE_COLUMNS:
+        sens = (metrics.get("phases", {}).get(p) or {}).get("sensitivity")
+        if not sens:
+            continue
+        method, top = "—", "—"
+        gsa = sens.get("global")
+        if gsa and gsa.get("indices"):
+            # Morris: μ*; Sobol: índice total ST
+            score = "mu_star" if gsa["method"] == "morris" else "ST"
+            name, idx = max(gsa["indices"].items(), key=lambda kv: kv[1][score])
+            method, top = gsa["method"], f"{name} ({score}={idx[score]:.3g})"
+        lines.append(f"| {label} | {sens.get('mean_min', 0):.4f} | {sens.get('mean_max', 0):.4f} "
+                     f"| {method} | {top} |")
+    return "\n".join(lines)
+
+
+@auto_block("TIMINGS")
+def _timings_table(summary, metrics):
+    phases = metrics.get("phases", {})
+    timings = {p: (phases.get(p) or {}).get("timings") or {} for p, _ in PHASE_COLUMNS}
+    stages = []
+    for t in timings.values():
+        stages += [st for st in t.get("stages", {}) if st not in stages]
+
+    def _cell(p, value):
+        return "—" if value is None else f"{value:g}"
+
+    lines = ["| Etapa | Sintético (s) | Real (s) |", "|-------|--------------:|---------:|"]
+    for st in stages:
+        cells = " | ".join(_cell(p, timings[p].get("stages", {}).get(st)) for p, _ in PHASE_COLUMNS)
+        lines.append(f"| {st} | {cells} |")
+    for key, label in [("total_seconds", "**Total (s)**"), ("simulated_steps", "Pasos simulados")]:
+        cells = " | ".join(_cell(p, timings[p].get(key)) for p, _ in PHASE_COLUMNS)
+        lines.append(f"| {label} | {cells} |")
+    return "\n".join(lines)
+
+
+def _replace_auto_blocks(content, summary, metrics=None):
+    """Reescribe todas las regiones AUTO de un documento.
+
+    - Bloques ``<!-- AUTO:NAME:START -->…<!-- AUTO:NAME:END -->``: el cuerpo
+      lo genera el renderer registrado con ``@auto_block(NAME)``; los bloques
+      sin renderer o sin marcador de cierre se copian tal cual.
+    - Valores inline ``<!-- AUTO:key -->valor<!-- /AUTO:key -->`` (valor no
+      vacío, en una línea): se reemplaza el valor por ``summary[key]`` si
+      existe. Sólo se buscan en el texto entre bloques.
+
+    Los marcadores se localizan con ``str.find`` y la salida se arma en un
+    solo buffer: el costo es lineal en el tamaño del documento sin importar
+    cuántos marcadores o tipos de bloque haya.
+    """
+    metrics = metrics or {}
+    out = []
+    pos = i = 0
+    while True:
+        start = content.find(AUTO_OPEN, i)
+        if start < 0:
+            break
+        i = start + 1
+        tag_end = content.find(AUTO_CLOSE, start + len(AUTO_OPEN))
+        if tag_end < 0:
+            break
+        tag = content[start + len(AUTO_OPEN):tag_end]
+        name = tag[:-len(":START")] if tag.endswith(":START") else None
+        renderer = AUTO_BLOCKS.get(name) if name and AUTO_KEY.fullmatch(name) else None
+        if renderer is None:
+            continue
+        end_marker = f"{AUTO_OPEN}{name}:END{AUTO_CLOSE}"
+        end = content.find(end_marker, tag_end + len(AUTO_CLOSE))
+        if end < 0:
+            continue
+        out.append(_replace_inline(content[pos:start], summary))
+        out.append(f"{AUTO_OPEN}{tag}{AUTO_CLOSE}\n{renderer(summary, metrics)}\n{end_marker}")
+        pos = i = end + len(end_marker)
+    out.append(_replace_inline(content[pos:], summary))
+    return "".join(out)
+
+
+def _replace_inline(text, summary):
+    """Valores inline ``<!-- AUTO:key -->valor<!-- /AUTO:key -->`` de ``text``."""
+    out = []
+    pos = i = 0
+    while True:
+        start = text.find(AUTO_OPEN, i)
+        if start < 0:
+            break
+        i = start + 1
+        tag_end = text.find(AUTO_CLOSE, start + len(AUTO_OPEN))
+        if tag_end < 0:
+            break
+        tag = text[start + len(AUTO_OPEN):tag_end]
+        if not AUTO_KEY.fullmatch(tag):
+            continue
+        after = tag_end + len(AUTO_CLOSE)
+        close = f"<!-- /AUTO:{tag} -->"
+        end = text.find(close, after + 1)
+        line_end = text.find("\n", after)
+        if end < 0 or 0 <= line_end < end:
+            continue
+        out.append(text[pos:after])
+        out.append(str(summary.get(tag, text[after:end])))
+        out.append(close)
+        pos = i = end + len(close)
+    out.append(text[pos:])
+    return "".join(out)
 
 
 # ─── AUDIT ────────────────────────────────────────────────────────────────────
 
+AUDIT_CACHE_PATH = SCRIPTS_DIR / ".cache" / "audit.json"
+AUDIT_RULES = []
+
+
+def audit_rule(name):
+    """Registra una regla de auditoría: ``fn(ctx) -> [problemas]``.
+
+    Las reglas sólo deben acceder a archivos a través de ``ctx`` (ver
+    ``AuditContext``): lo que leen define cuándo su resultado cacheado deja de
+    valer.
+    """
+    def _register(fn):
+        AUDIT_RULES.append((name, fn))
+        return fn
+    return _register
+
+
+class AuditContext:
+    """Acceso a los archivos de un caso que registra de qué dependió una regla."""
+
+    def __init__(self, case_dir, manifest):
+        self.case_dir = case_dir
+        self.thresholds = manifest.get("validation_thresholds", {})
+        self.required_docs = manifest.get("required_docs", [])
+        self.deps = {}
+
+    def exists(self, path):
+        found = path.exists()
+        self.deps.setdefault(str(path), {"exists": found})
+        return found
+
+    def read_text(self, path):
+        data = path.read_bytes()
+        st = path.stat()
+        self.deps[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                "sha1": hashlib.sha1(data).hexdigest()}
+        return data.decode("utf-8")
+
+    def sha256(self, path):
+        """SHA-256 de un archivo binario, registrándolo como dependencia."""
+        data = path.read_bytes()
+        st = path.stat()
+        self.deps[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                "sha1": hashlib.sha1(data).hexdigest()}
+        return hashlib.sha256(data).hexdigest()
+
+    def metrics(self):
+        """Igual que ``load_metrics``, pero registrando los archivos consultados."""
+        for mf in _metrics_candidates(self.case_dir):
+            if self.exists(mf):
+                return json.loads(self.read_text(mf))
+        return None
+
+
+@audit_rule("structure")
+def _rule_structure(ctx):
+    issues = []
+    for required in ["README.md", "report.md", "metrics.json"]:
+        if not ctx.exists(ctx.case_dir / required):
+            issues.append(f"Falta {required}")
+
+    docs_dir = ctx.case_dir / "docs"
+    if ctx.exists(docs_dir):
+        for doc in ctx.required_docs:
+            if not ctx.exists(docs_dir / doc):
+                issues.append(f"Falta docs/{doc}")
+    else:
+        issues.append("Falta directorio docs/")
+    return issues
+
+
+@audit_rule("auto_markers")
+def _rule_auto_markers(ctx):
+    # Verificar marcadores AUTO en README.md (para sync)
+    readme = ctx.case_dir / "README.md"
+    if ctx.exists(readme) and "<!-- AUTO:RESULTS:START -->" not in ctx.read_text(readme):
+        return ["README.md sin marcadores AUTO (sync no funcionará)"]
+    return []
+
+
+@audit_rule("metrics_thresholds")
+def _rule_metrics_thresholds(ctx):
+    metrics = ctx.metrics()
+    if not metrics:
+        return []
+    thresholds = ctx.thresholds
+    issues = []
+    for p_name, phase in metrics.get("phases", {}).items():
+        errors = phase.get("errors", {})
+        edi = compute_edi(errors)
+        rmse_abm = errors.get("rmse_abm", 0)
+
+        if edi > thresholds.get("edi_max", 0.90):
+            issues.append(
+                f"{p_name}: EDI={edi:.3f} > {thresholds['edi_max']} (posible tautología)")
+        if 0 < rmse_abm < thresholds.get("rmse_floor", 1e-10):
+            issues.append(
+                f"{p_name}: RMSE={rmse_abm:.2e} < umbral (posible sobreajuste)")
+
+        growth = timing_growth(phase.get("timings", {}))
+        if growth and growth[0] > thresholds.get("timing_growth_max", 1.5):
+            issues.append(
+                f"{p_name}: costo creció {growth[0]:.2f}× ({growth[1]})")
+    return issues
+
+
+@audit_rule("report_timestamp")
+def _rule_report_timestamp(ctx):
+    # Consistencia timestamps
+    metrics = ctx.metrics()
+    report_path = ctx.case_dir / "report.md"
+    if not metrics or not ctx.exists(report_path):
+        return []
+    gen_at = metrics.get("generated_at", "")
+    if gen_at and gen_at not in ctx.read_text(report_path):
+        return ["report.md desincronizado (timestamp ≠ metrics.json)"]
+    return []
+
+
+@audit_rule("series_artifacts")
+def _rule_series_artifacts(ctx):
+    # Series guardadas con --save-series: deben existir y coincidir con su digest
+    metrics = ctx.metrics()
+    if not metrics:
+        return []
+    issues = []
+    for p_name, phase in metrics.get("phases", {}).items():
+        ref = (phase or {}).get("series")
+        if not ref:
+            continue
+        path = ctx.case_dir / ref["path"]
+        if not ctx.exists(path):
+            issues.append(f"{p_name}: falta {ref['path']}")
+        elif ctx.sha256(path) != ref.get("sha256"):
+            issues.append(f"{p_name}: {ref['path']} no coincide con su digest en metrics.json")
+    return issues
+
+
+_SOURCE_DIGESTS = {}
+
+
+def _source_digest(path):
+    """sha1 de un archivo fuente (una vez por proceso)."""
+    if path not in _SOURCE_DIGESTS:
+        try:
+            _SOURCE_DIGESTS[path] = hashlib.sha1(Path(path).read_bytes()).hexdigest()
+        except OSError:
+            _SOURCE_DIGESTS[path] = ""
+    return _SOURCE_DIGESTS[path]
+
+
+def _rule_key(name, fn, manifest):
+    """Clave de caché de una regla: su código y la parte del manifiesto que usa.
+
+    El código de la regla no basta: usa helpers (``compute_edi``,
+    ``AuditContext``, ...), así que entra el digest de este módulo y del que
+    define la regla; cualquier cambio en ellos invalida la caché.
+    """
+    h = hashlib.sha1(name.encode("utf-8"))
+    h.update(fn.__code__.co_code)
+    h.update(repr(fn.__code__.co_consts).encode("utf-8"))
+    for path in sorted({__file__, fn.__code__.co_filename}):
+        h.update(_source_digest(path).encode("utf-8"))
+    h.update(json.dumps([manifest.get("validation_thresholds", {}),
+                         manifest.get("required_docs", [])], sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _deps_fresh(deps, cached_at_ns):
+    """¿Siguen igual los archivos de ``deps``? Actualiza stat si sólo cambió el mtime.
+
+    Como el índice de git: si tamaño y mtime coinciden (y el mtime es anterior
+    a la auditoría cacheada) no se lee nada; si no, se compara el sha1.
+    """
+    for path, dep in deps.items():
+        p = Path(path)
+        if "exists" in dep:
+            if p.exists() != dep["exists"]:
+                return False
+            continue
+        try:
+            st = p.stat()
+        except OSError:
+            return False
+        if (st.st_size == dep["size"] and st.st_mtime_ns == dep["mtime_ns"]
+                and st.st_mtime_ns < cached_at_ns - 1_000_000_000):
+            continue
+        if st.st_size != dep["size"] or hashlib.sha1(p.read_bytes()).hexdigest() != dep["sha1"]:
+            return False
+        dep["mtime_ns"] = st.st_mtime_ns
+    return True
+
+
+def _load_audit_cache():
+    try:
+        return json.loads(AUDIT_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_audit_cache(cache):
+    AUDIT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = AUDIT_CACHE_PATH.with_name(f".{AUDIT_CACHE_PATH.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(cache), encoding="utf-8")
+    os.replace(tmp, AUDIT_CACHE_PATH)
+
+
+def _run_rule(case_dir, name, fn, manifest, key, entry):
+    """Resultado de una regla para un caso: (problemas, entrada de caché, ¿cacheado?).
+
+    Una entrada reutilizada toma la hora de esta verificación como ``at_ns``:
+    sus dependencias se acaban de comprobar, y así un archivo tocado sin
+    cambios no vuelve a leerse en cada auditoría.
+    """
+    started = time.time_ns()
+    if entry and entry.get("key") == key and _deps_fresh(entry["deps"], entry["at_ns"]):
+        return entry["issues"], dict(entry, at_ns=started), True
+    ctx = AuditContext(case_dir, manifest)
+    issues = fn(ctx)
+    return issues, {"key": key, "at_ns": started, "deps": ctx.deps, "issues": issues}, False
+
+
 def cmd_audit(args):
-    """Verifica consistencia estructural y numérica de todos los casos."""
+    """Verifica consistencia estructural y numérica de todos los casos.
+
+    Cada regla registrada con ``@audit_rule`` corre por caso en un pool de
+    hilos; su resultado se cachea en .cache/audit.json junto con los archivos
+    que leyó, de modo que re-auditar un caso sin cambios no lee nada.
+    """
     manifest = load_manifest()
-    required_docs = manifest.get("required_docs", [])
-    thresholds = manifest.get("validation_thresholds", {})
     cases = find_cases()
     issues = []
     stats = {"total": len(cases), "ok": 0, "warn": 0}
+    cache = {} if args.no_cache else _load_audit_cache()
+    keys = {name: _rule_key(name, fn, manifest) for name, fn in AUDIT_RULES}
 
     print(f"🔍 Auditando {len(cases)} casos...\n")
 
-    for case_dir in cases:
-        name = case_dir.name
-        case_issues = []
-
-        # Estructura de archivos
-        for required in ["README.md", "report.md", "metrics.json"]:
-            if not (case_dir / required).exists():
-                case_issues.append(f"Falta {required}")
-
-        docs_dir = case_dir / "docs"
-        if docs_dir.exists():
-            for doc in required_docs:
-                if not (docs_dir / doc).exists():
-                    case_issues.append(f"Falta docs/{doc}")
-        else:
-            case_issues.append("Falta directorio docs/")
-
-        # Verificar marcadores AUTO en README.md (para sync)
-        readme = case_dir / "README.md"
-        if readme.exists():
-            text = readme.read_text(encoding="utf-8")
-            if "<!-- AUTO:RESULTS:START -->" not in text:
-                case_issues.append("README.md sin marcadores AUTO (sync no funcionará)")
-
-        # Métricas numéricas
-        metrics = load_metrics(case_dir)
-        if metrics:
-            for p_name, phase in metrics.get("phases", {}).items():
-                errors = phase.get("errors", {})
-                edi = compute_edi(errors)
-                rmse_abm = errors.get("rmse_abm", 0)
-
-                if edi > thresholds.get("edi_max", 0.90):
-                    case_issues.append(
-                        f"{p_name}: EDI={edi:.3f} > {thresholds['edi_max']} (posible tautología)")
-                if 0 < rmse_abm < thresholds.get("rmse_floor", 1e-10):
-                    case_issues.append(
-                        f"{p_name}: RMSE={rmse_abm:.2e} < umbral (posible sobreajuste)")
-
-            # Consistencia timestamps
-            report_path = case_dir / "report.md"
-            if report_path.exists():
-                report_text = report_path.read_text(encoding="utf-8")
-                gen_at = metrics.get("generated_at", "")
-                if gen_at and gen_at not in report_text:
-                    case_issues.append("report.md desincronizado (timestamp ≠ metrics.json)")
-
-        # Resultado
-        if case_issues:
-            stats["warn"] += 1
-            print(f"  ⚠️  {name}")
-            for iss in case_issues:
-                print(f"     └─ {iss}")
-                issues.append((name, iss))
-        else:
-            stats["ok"] += 1
-            print(f"  ✅ {name}")
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            (case_dir.name, name): pool.submit(
+                _run_rule, case_dir, name, fn, manifest, keys[name],
+                cache.get(case_dir.name, {}).get(name))
+            for case_dir in cases for name, fn in AUDIT_RULES
+        }
+
+        new_cache, hits = {}, 0
+        for case_dir in cases:
+            name = case_dir.name
+            case_issues = []
+            for rule_name, _ in AUDIT_RULES:
+                rule_issues, entry, cached = futures[(name, rule_name)].result()
+                case_issues.extend(rule_issues)
+                new_cache.setdefault(name, {})[rule_name] = entry
+                hits += cached
+
+            # Resultado
+            if case_issues:
+                stats["warn"] += 1
+                print(f"  ⚠️  {name}")
+                for iss in case_issues:
+                    print(f"     └─ {iss}")
+                    issues.append((name, iss))
+            else:
+                stats["ok"] += 1
+                print(f"  ✅ {name}")
+
+    if not args.no_cache:
+        _save_audit_cache(new_cache)
 
     # Resumen
     print(f"\n{'═' * 60}")
     print(f"Casos: {stats['total']} | OK: {stats['ok']} | Con problemas: {stats['warn']}")
     print(f"Total de problemas: {len(issues)}")
+    print(f"Reglas desde caché: {hits}/{len(futures)}")
 
     if args.output:
         _write_audit_report(cases, issues, stats, args.output)
@@ -537,10 +905,261 @@ def _write_audit_report(cases, issues, stats, output_path):
     print(f"\n📄 Reporte: {output_path}")
 
 
+# ─── DIFF ─────────────────────────────────────────────────────────────────────
+
+# Campos comparados por fase: (nombre, extractor)
+DIFF_FIELDS = [
+    ("edi", lambda ph: compute_edi(ph.get("errors", {}))),
+    ("cr", lambda ph: compute_cr(ph.get("symploke", {}))),
+    ("rmse_abm", lambda ph: ph.get("errors", {}).get("rmse_abm")),
+    ("rmse_ode", lambda ph: ph.get("errors", {}).get("rmse_ode")),
+    ("rmse_reduced", lambda ph: ph.get("errors", {}).get("rmse_reduced")),
+    ("corr_abm", lambda ph: ph.get("correlations", {}).get("abm_obs")),
+    ("corr_ode", lambda ph: ph.get("correlations", {}).get("ode_obs")),
+    ("p_value", lambda ph: ph.get("emergence", {}).get("p_value")),
+] + [
+    (f"c{i}", lambda ph, key=key: ph.get(key))
+    for i, key in enumerate(["c1_convergence", "c2_robustness", "c3_replication",
+                             "c4_validity", "c5_uncertainty"], 1)
+] + [("overall_pass", lambda ph: ph.get("overall_pass"))]
+
+
+class GitBatchReader:
+    """Lee objetos git por un único proceso ``git cat-file --batch``.
+
+    Las rutas ``REV:./ruta`` son relativas a ``cwd``. Las consultas de
+    ``read_many`` se escriben desde un hilo aparte mientras se leen las
+    respuestas, para que ninguna de las dos tuberías se llene y bloquee.
+    """
+
+    def __init__(self, cwd):
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"], cwd=str(cwd),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def read_many(self, specs):
+        """Devuelve [(tipo, contenido) o None si no existe] en el orden de ``specs``."""
+        def _write():
+            self.proc.stdin.write("".join(f"{spec}\n" for spec in specs).encode("utf-8"))
+            self.proc.stdin.flush()
+
+        writer = threading.Thread(target=_write, daemon=True)
+        writer.start()
+        out = []
+        for _ in specs:
+            header = self.proc.stdout.readline().split()
+            if len(header) != 3:  # "<spec> missing" / "<spec> ambiguous"
+                out.append(None)
+                continue
+            _, kind, size = header
+            data = self.proc.stdout.read(int(size))
+            self.proc.stdout.read(1)  # LF final
+            out.append((kind.decode(), data))
+        writer.join()
+        return out
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+def _tree_entries(data, oid_len=20):
+    """Nombres de un objeto tree crudo (``<modo> <nombre>\\0<oid binario>``)."""
+    names, i = [], 0
+    while i < len(data):
+        nul = data.index(b"\0", i)
+        names.append(data[data.index(b" ", i) + 1:nul].decode("utf-8"))
+        i = nul + 1 + oid_len
+    return names
+
+
+def _metrics_at(reader, revs, base=None):
+    """{rev: {caso: metrics}} para cada revisión, en dos tandas de lecturas.
+
+    Por caso se prueban en orden los mismos candidatos que ``load_metrics``
+    (rutas relativas a ``base``, el directorio del lector); un metrics.json
+    ilegible se avisa y se salta al siguiente candidato.
+    """
+    base = base or CASES_DIR
+    heads = reader.read_many([f"{rev}^{{commit}}" for rev in revs]
+                             + [f"{rev}:./" for rev in revs])
+    for rev, commit in zip(revs, heads):
+        if commit is None:
+            raise ValueError(f"Revisión desconocida: {rev}")
+    listing = {}
+    for rev, commit, tree in zip(revs, heads, heads[len(revs):]):
+        # El tamaño del oid (SHA-1/SHA-256) sale del hash del commit
+        oid_len = len(commit[1].split(b"\n", 1)[0].split()[1]) // 2
+        names = _tree_entries(tree[1], oid_len) if tree else []
+        listing[rev] = [n for n in names if re.match(r'\d{2}_caso_', n)]
+
+    specs = [(rev, name, Path(os.path.relpath(mf, base)).as_posix())
+             for rev in revs for name in listing[rev]
+             for mf in _metrics_candidates(base / name)]
+    blobs = reader.read_many([f"{rev}:./{rel}" for rev, _, rel in specs])
+    found = {rev: {} for rev in revs}
+    for (rev, name, rel), blob in zip(specs, blobs):
+        if blob is None or name in found[rev]:
+            continue
+        try:
+            found[rev][name] = json.loads(blob[1].decode("utf-8"))
+        except ValueError as exc:
+            print(f"⚠️  {rev}:{rel} ilegible ({exc})")
+    return found
+
+
+def _field_changed(before, after, tol):
+    if before is None or after is None or isinstance(before, bool) or isinstance(after, bool):
+        return before != after
+    return abs(after - before) > tol
+
+
+def _fmt_value(value):
+    if isinstance(value, bool):
+        return "✅" if value else "❌"
+    if value is None:
+        return "—"
+    return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+
+def diff_metrics(old, new, tolerances):
+    """Cambios [(caso, fase, campo, antes, después)] que superan la tolerancia."""
+    changes = []
+    for name in sorted(set(old) | set(new)):
+        if name not in old or name not in new:
+            changes.append((name, "—", "caso", "—" if name not in old else "presente",
+                            "—" if name not in new else "presente"))
+            continue
+        old_phases = old[name].get("phases", {})
+        new_phases = new[name].get("phases", {})
+        for p_name in sorted(set(old_phases) | set(new_phases)):
+            before_ph = old_phases.get(p_name) or {}
+            after_ph = new_phases.get(p_name) or {}
+            for field, get in DIFF_FIELDS:
+                before, after = get(before_ph), get(after_ph)
+                if _field_changed(before, after, tolerances.get(field, 0.0)):
+                    changes.append((name, p_name, field, before, after))
+    return changes
+
+
+def cmd_diff(args):
+    """Compara metrics.json de todos los casos entre dos revisiones, sin checkout."""
+    tolerances = dict(load_manifest().get("diff_tolerances", {}))
+    for item in args.tol or []:
+        field, _, value = item.partition("=")
+        tolerances[field] = float(value)
+
+    if not CASES_DIR.exists():
+        print(f"❌ No existe {CASES_DIR}")
+        return 1
+    reader = GitBatchReader(CASES_DIR)
+    try:
+        found = _metrics_at(reader, [args.rev_a, args.rev_b])
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 1
+    finally:
+        reader.close()
+
+    old, new = found[args.rev_a], found[args.rev_b]
+    changes = diff_metrics(old, new, tolerances)
+    cases = len(set(old) | set(new))
+    print(f"🔀 {args.rev_a} → {args.rev_b}: {cases} casos, "
+          f"{len({c[0] for c in changes})} con cambios\n")
+    if not changes:
+        print("Sin cambios fuera de tolerancia. ✅")
+        return 0
+
+    print("| Caso | Fase | Campo | Antes | Después | Δ |")
+    print("|------|------|-------|------:|--------:|--:|")
+    for name, p_name, field, before, after in changes:
+        numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool)
+                      for v in (before, after))
+        delta = f"{after - before:+.4g}" if numeric else ""
+        print(f"| {name} | {p_name} | {field} | {_fmt_value(before)} | "
+              f"{_fmt_value(after)} | {delta} |")
+    return 1
+
+
 # ─── VALIDATE ─────────────────────────────────────────────────────────────────
 
+VALIDATE_INPUT_DIRS = ["src", "data"]
+VALIDATE_STAMP = Path("outputs") / "validate_digest.json"
+
+
+def validate_settings(manifest, budget):
+    """Parte del manifiesto que puede cambiar el resultado de una validación.
+
+    Umbrales y tolerancias, y el presupuesto del caso (``case_budget``): con
+    otro límite de memoria o de tiempo la misma validación puede fallar.
+    """
+    return {
+        "validation_thresholds": manifest.get("validation_thresholds", {}),
+        "diff_tolerances": manifest.get("diff_tolerances", {}),
+        "budget": budget,
+    }
+
+
+def case_input_digest(case_repo, previous=None, settings=None):
+    """Digest de las entradas de un caso (src/ y data/): ``(digest, archivos)``.
+
+    El digest cubre ``settings`` (ver ``validate_settings``) y ruta relativa y
+    sha1 de cada archivo. Con ``previous`` (sello anterior) un archivo con
+    igual tamaño y mtime, anterior al sello, reutiliza su sha1 sin leerse,
+    como el índice de git.
+    """
+    prev_files = (previous or {}).get("files", {})
+    prev_at = (previous or {}).get("at_ns", 0)
+    files = {}
+    h = hashlib.sha256(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+    paths = []
+    for sub in VALIDATE_INPUT_DIRS:
+        if (case_repo / sub).is_dir():
+            paths += [p for p in (case_repo / sub).rglob("*")
+                      if p.is_file() and "__pycache__" not in p.parts and p.suffix != ".pyc"]
+    for p in sorted(paths):
+        rel = p.relative_to(case_repo).as_posix()
+        st = p.stat()
+        old = prev_files.get(rel)
+        if (old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns
+                and st.st_mtime_ns < prev_at - 1_000_000_000):
+            sha1 = old["sha1"]
+        else:
+            sha1 = hashlib.sha1(p.read_bytes()).hexdigest()
+        files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": sha1}
+        h.update(f"{rel}\0{sha1}\n".encode("utf-8"))
+    return h.hexdigest(), files
+
+
+def _load_validate_stamp(case_repo):
+    try:
+        return json.loads((case_repo / VALIDATE_STAMP).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _save_validate_stamp(case_repo, digest, files, at_ns):
+    path = case_repo / VALIDATE_STAMP
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stamp = {
+        "digest": digest, "at_ns": at_ns,
+        "validated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": files,
+    }
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(stamp, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
 def cmd_validate(args):
-    """Ejecuta simulaciones y opcionalmente sincroniza métricas."""
+    """Ejecuta simulaciones y opcionalmente sincroniza métricas.
+
+    Un caso cuyo digest de entradas (src/, data/ y ``validate_settings``)
+    coincide con el sello de su última validación exitosa (junto a
+    outputs/metrics.json) se omite, salvo con
+    ``--force``. El resto corre en ``--jobs`` slots, más largo primero según
+    la bitácora, cada uno con el timeout y la memoria de su presupuesto.
+    """
     targets = []
 
     if args.case:
@@ -560,29 +1179,80 @@ def cmd_validate(args):
         print("⚠️  No se encontraron casos con código ejecutable")
         return 1
 
-    print(f"🚀 Ejecutando {len(targets)} validación(es)...\n")
+    manifest = load_manifest()
+    budgets = scheduler.load_budgets("validate", MANIFEST_PATH)
+    pending = {}
+    skipped = {}
+    for name, vpy in targets:
+        case_repo = vpy.parent.parent
+        stamp = _load_validate_stamp(case_repo)
+        started_ns = time.time_ns()
+        settings = validate_settings(manifest, scheduler.case_budget(name, budgets))
+        digest, files = case_input_digest(case_repo, stamp, settings)
+        if (not args.force and stamp and stamp.get("digest") == digest
+                and (case_repo / "outputs" / "metrics.json").exists()):
+            skipped[name] = (digest, stamp.get("validated_at", "—"))
+        else:
+            pending[name] = (vpy, case_repo, digest, files, started_ns)
+
+    jobs = scheduler.make_jobs(
+        list(pending), scheduler.expected_durations("validate"), budgets,
+        {"timeout": args.timeout, "memory_mb": args.memory_mb})
+    if args.plan:
+        scheduler.print_plan(jobs, args.jobs, naive_order=[name for name, _ in targets])
+        if skipped:
+            print(f"  {len(skipped)} caso(s) al día no entran en el plan")
+        return 0
 
+    print(f"🚀 Ejecutando {len(jobs)} validación(es) en {args.jobs} slot(s)" +
+          (f"; {len(skipped)} al día, omitida(s)" if skipped else "") + "...\n")
+
+    run_id = "validate-" + datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_ledger.configure(run_id=run_id, source="validate")
     results = {}
-    for name, vpy in targets:
-        print(f"  ▶ {name}...", end=" ", flush=True)
-        try:
-            result = subprocess.run(
-                [sys.executable, str(vpy)],
-                capture_output=True, text=True, timeout=300
-            )
-            ok = result.returncode == 0
-            results[name] = ok
-            print("✅" if ok else "❌")
-            if not ok and result.stderr:
-                for line in result.stderr.strip().split("\n")[:5]:
-                    print(f"     {line}")
-        except subprocess.TimeoutExpired:
-            results[name] = False
-            print("⏱️  Timeout")
+    stderr_files = {}
+
+    def launch(job):
+        vpy = pending[job.name][0]
+        stderr_files[job.name] = tempfile.TemporaryFile(mode="w+t")
+        return scheduler.GroupPopen(
+            [sys.executable, str(vpy)], stdout=subprocess.DEVNULL,
+            stderr=stderr_files[job.name], text=True,
+            preexec_fn=scheduler.memory_limiter(job.memory_mb))
+
+    def on_start(job):
+        run_ledger.emit("case_start", case=job.name, digest=pending[job.name][2],
+                        expected=round(job.expected, 2))
+
+    def on_done(job, status, returncode, seconds):
+        _, case_repo, digest, files, started_ns = pending[job.name]
+        results[job.name] = status == "ok"
+        run_ledger.emit("case_end", case=job.name, digest=digest, status=status,
+                        returncode=returncode, seconds=round(seconds, 4),
+                        expected=round(job.expected, 2))
+        if status == "ok":
+            _save_validate_stamp(case_repo, digest, files, started_ns)
+        mark = {"ok": "✅", "failed": "❌", "timeout": "⏱️  Timeout"}[status]
+        print(f"  {mark} {job.name} ({seconds:.1f}s)", flush=True)
+        with stderr_files.pop(job.name) as fh:
+            fh.seek(0)
+            stderr = fh.read().strip()
+        if status == "failed" and stderr:
+            for line in stderr.split("\n")[:5]:
+                print(f"     {line}")
+
+    with run_ledger.span("run", cases=[name for name, _ in targets], jobs=args.jobs) as run_end:
+        for name, (digest, validated_at) in skipped.items():
+            run_ledger.emit("case_end", case=name, status="skipped", seconds=0.0, digest=digest)
+            print(f"  ⏭  {name}: sin cambios desde {validated_at}")
+        scheduler.run_jobs(jobs, launch, workers=args.jobs, on_start=on_start, on_done=on_done)
+        run_end.update(cases_ok=sum(1 for v in results.values() if v),
+                       cases_skipped=len(skipped))
 
     passed = sum(1 for v in results.values() if v)
     print(f"\n{'═' * 60}")
-    print(f"Resultados: {passed}/{len(results)} exitosos")
+    print(f"Resultados: {passed}/{len(results)} exitosos" +
+          (f" | {len(skipped)} al día (sin ejecutar)" if skipped else ""))
 
     if not args.no_sync and passed > 0:
         print("\n📊 Sincronizando métricas → docs...")
@@ -591,6 +1261,37 @@ def cmd_validate(args):
     return 0 if all(results.values()) else 1
 
 
+# ─── RUNS ─────────────────────────────────────────────────────────────────────
+
+def cmd_runs(args):
+    """Resume rendimiento y unidades más lentas de las corridas recientes."""
+    events = run_ledger.read_events()
+    if not events:
+        print(f"⚠️  Bitácora vacía: {run_ledger.LEDGER_PATH}")
+        return 1
+    runs, slowest = run_ledger.summarize(events, last=args.last, top=args.top)
+
+    print(f"📒 Últimas {len(runs)} corrida(s) — {run_ledger.LEDGER_PATH}\n")
+    print(f"  {'Corrida':<28} {'Origen':<10} {'Pared':>8} {'W':>3} {'Fases':>5} "
+          f"{'Sims':>6} {'Pasos':>10} {'Pasos/s':>9}  Estado")
+    for r in runs:
+        rate = f"{r['steps_per_second']:.0f}" if r["steps_per_second"] else "—"
+        state = "✅" if r["finished"] and not r["failures"] else (
+            f"❌ {r['failures']} fallo(s)" if r["failures"] else "⏳ sin cierre")
+        print(f"  {r['run_id']:<28} {r['source'] or '—':<10} {r['wall_seconds']:>7.1f}s "
+              f"{r['workers']:>3} {r['phases']:>5} {r['simulations']:>6} "
+              f"{r['simulated_steps']:>10} {rate:>9}  {state}")
+
+    if slowest:
+        print("\n🐢 Unidades más lentas:")
+        for e in slowest:
+            unit = f"{e['case']}/{e['unit']}" if e.get("unit") else e["case"]
+            rate = f", {e['steps_per_second']:.0f} pasos/s" if e.get("steps_per_second") else ""
+            print(f"  {e['seconds']:>8.2f}s  {unit:<40} {e['run_id']} "
+                  f"[{e.get('worker')}]{rate}")
+    return 0
+
+
 # ─── CLI ──────────────────────────────────────────────────────────────────────
 
 def main():
@@ -604,7 +1305,10 @@ def main():
             "  python3 scripts/tesis.py build\n"
             "  python3 scripts/tesis.py sync\n"
             "  python3 scripts/tesis.py audit --output auditoria.md\n"
+            "  python3 scripts/tesis.py diff HEAD~1 HEAD --tol edi=0.01\n"
             "  python3 scripts/tesis.py validate --case caso_clima\n"
+            "  python3 scripts/tesis.py validate --jobs 4 --plan\n"
+            "  python3 scripts/tesis.py runs --last 5\n"
         )
     )
     sub = parser.add_subparsers(dest="command")
@@ -631,11 +1335,36 @@ def main():
     # audit
     p = sub.add_parser("audit", help="Audita consistencia de todos los casos")
     p.add_argument("--output", "-o", help="Ruta del reporte de auditoría (.md)")
+    p.add_argument("--jobs", "-j", type=int, default=None, help="Hilos (por defecto, automático)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Ignorar y no escribir la caché de resultados por archivo")
+
+    # diff
+    p = sub.add_parser("diff", help="Compara métricas entre dos revisiones git")
+    p.add_argument("rev_a", help="Revisión base (ej: HEAD~1)")
+    p.add_argument("rev_b", help="Revisión nueva (ej: HEAD)")
+    p.add_argument("--tol", action="append", metavar="CAMPO=VALOR",
+                   help="Tolerancia absoluta de un campo (repetible; ej: edi=0.01)")
 
     # validate
     p = sub.add_parser("validate", help="Ejecuta simulaciones")
     p.add_argument("--case", help="Caso específico (ej: caso_clima)")
     p.add_argument("--no-sync", action="store_true", help="No sincronizar tras validar")
+    p.add_argument("--force", action="store_true",
+                   help="Ejecutar aunque src/, data/ y el manifiesto no hayan cambiado")
+    p.add_argument("-j", "--jobs", type=int, default=1,
+                   help="Validaciones simultáneas (orden: más largas primero)")
+    p.add_argument("--timeout", type=float,
+                   help="Timeout por caso en segundos (por defecto: case_budgets.validate)")
+    p.add_argument("--memory-mb", type=int,
+                   help="Memoria máxima por caso en MB (por defecto: case_budgets.validate)")
+    p.add_argument("--plan", action="store_true",
+                   help="Sólo mostrar orden, presupuestos y makespan esperado")
+
+    # runs
+    p = sub.add_parser("runs", help="Resume la bitácora de corridas (runs/ledger.jsonl)")
+    p.add_argument("--last", type=int, default=10, help="Corridas recientes a mostrar")
+    p.add_argument("--top", type=int, default=10, help="Unidades más lentas a listar")
 
     args = parser.parse_args()
 
@@ -648,7 +1377,9 @@ def main():
         "build": cmd_build,
         "sync": cmd_sync,
         "audit": cmd_audit,
+        "diff": cmd_diff,
         "validate": cmd_validate,
+        "runs": cmd_runs,
     }
 
     return commands[args.command](args)
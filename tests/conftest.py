@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los módulos de scripts son planos: importables desde la raíz del repo
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,111 @@
+import math
+import random
+from array import array
+
+import pytest
+
+import abm_engine
+
+PARAMS = {"diffusion": 0.2, "forcing_scale": 0.1, "macro_coupling": 0.4,
+          "damping": 0.05, "noise": 0.0}
+
+
+def _random_grid(n, seed):
+    rng = random.Random(seed)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(n)] for _ in range(n)]
+
+
+def _rows_step(grid, n, forcing_t, macro, sigma=0.0, rand=None):
+    p = PARAMS
+    c0 = 1.0 - p["diffusion"] - p["macro_coupling"] - p["damping"]
+    bias = p["forcing_scale"] * forcing_t + p["macro_coupling"] * macro
+    return abm_engine._step_rows(grid, n, (c0, 0.25 * p["diffusion"]), bias, sigma,
+                                 rand, "periodic", 0.0, None)
+
+
+def test_rows_kernel_matches_cell_kernel_deterministic_part():
+    n = 7
+    grid = _random_grid(n, seed=1)
+    cells, rows = grid, grid
+    for t in range(20):
+        forcing_t, macro = math.sin(t), 0.1 * t
+        cells = abm_engine._step_cells(cells, n, PARAMS, forcing_t, macro, None,
+                                       random.Random(0))
+        rows = _rows_step(rows, n, forcing_t, macro)
+    worst = max(abs(a - b) for ra, rb in zip(cells, rows) for a, b in zip(ra, rb))
+    assert worst < 1e-12
+
+
+def test_rows_kernel_noise_has_the_requested_distribution():
+    n, sigma = 40, 0.3
+    zero = [[0.0] * n for _ in range(n)]
+    rand = random.Random(5).random
+    shocks = [x for _ in range(30) for row in _rows_step(zero, n, 0.0, 0.0, sigma, rand)
+              for x in row]
+    mean = sum(shocks) / len(shocks)
+    var = sum((x - mean) ** 2 for x in shocks) / (len(shocks) - 1)
+    # 48 000 normales: error estándar de la media ≈ 1.4e-3, de la varianza ≈ 5.8e-4
+    assert abs(mean) < 6e-3
+    assert abs(var - sigma ** 2) < 3e-3
+
+
+def test_full_run_kernels_agree_without_noise():
+    forcing = [0.5 * math.sin(2.0 * math.pi * t / 12) for t in range(30)]
+    params = dict(PARAMS, grid_size=5, t0=0.2, h0=0.0, forcing_series=forcing,
+                  ode_alpha=0.05, ode_beta=0.02)
+    rows = abm_engine.simulate_abm(params, 30, seed=1, outputs=("tbar",))
+    cells = abm_engine.simulate_abm(params, 30, seed=1, outputs=("tbar",), kernel="cell")
+    assert max(abs(a - b) for a, b in zip(rows["tbar"], cells["tbar"])) < 1e-12
+
+
+def test_fixed_boundary_edges_match_hand_stencil():
+    grid = [[1.0, 2.0, 3.0],
+            [4.0, 5.0, 6.0],
+            [7.0, 8.0, 9.0]]
+    c0, cd, bias, fill = 0.5, 0.1, 0.01, 10.0
+    new = abm_engine._step_rows(grid, 3, (c0, cd), bias, 0.0, None, "fixed", fill, None)
+    # Esquina (0, 0): arriba e izquierda fuera de la retícula
+    assert new[0][0] == pytest.approx(0.5 * 1.0 + 0.1 * (10.0 + 4.0 + 10.0 + 2.0) + 0.01)
+    # Borde (0, 1): sólo arriba fuera
+    assert new[0][1] == pytest.approx(0.5 * 2.0 + 0.1 * (10.0 + 5.0 + 1.0 + 3.0) + 0.01)
+    # Esquina (2, 2): abajo y derecha fuera
+    assert new[2][2] == pytest.approx(0.5 * 9.0 + 0.1 * (6.0 + 10.0 + 8.0 + 10.0) + 0.01)
+    # Borde (1, 0): sólo izquierda fuera
+    assert new[1][0] == pytest.approx(0.5 * 4.0 + 0.1 * (1.0 + 7.0 + 10.0 + 5.0) + 0.01)
+    # Centro: igual que con frontera periódica
+    periodic = abm_engine._step_rows(grid, 3, (c0, cd), bias, 0.0, None, "periodic", fill, None)
+    assert new[1][1] == pytest.approx(periodic[1][1])
+    assert new[0][0] != pytest.approx(periodic[0][0])
+
+
+def test_fixed_boundary_run_holds_a_uniform_state():
+    # Sin forzante ni ruido, con t0 = boundary_value y sin amortiguación la
+    # retícula uniforme es un punto fijo; con otro boundary_value los bordes se mueven
+    params = dict(PARAMS, damping=0.0, forcing_scale=0.0, grid_size=4, t0=1.0, h0=0.0,
+                  forcing_series=[0.0] * 5, boundary="fixed")
+    history = abm_engine.simulate_abm(params, 5, outputs=("grid",))["grid"]
+    assert history[4] == [[1.0] * 4] * 4
+    hot = dict(params, boundary_value=2.0)
+    frame = abm_engine.simulate_abm(hot, 2, outputs=("grid",))["grid"][1]
+    assert frame[0][0] > frame[0][1] > 1.0 and frame[1][1] == pytest.approx(1.0)
+
+
+def test_float32_run_matches_float64_to_single_precision():
+    forcing = [0.5 * math.sin(2.0 * math.pi * t / 12) for t in range(25)]
+    params = dict(PARAMS, noise=0.05, grid_size=6, t0=0.2, h0=1.0, forcing_series=forcing,
+                  ode_alpha=0.05, ode_beta=0.02)
+    double = abm_engine.simulate_abm(params, 25, seed=3, outputs=("tbar", "grid"))
+    single = abm_engine.simulate_abm(dict(params, dtype="float32"), 25, seed=3,
+                                     outputs=("tbar", "grid"))
+    try:
+        history = single["grid"]
+        assert isinstance(history, abm_engine.GridHistory) and history.typecode == "f"
+        assert len(history) == 25
+        for t in (0, 12, 24):
+            for row32, row64 in zip(history[t], double["grid"][t]):
+                assert all(array("f", [v])[0] == v for v in row32)  # valores float32
+                assert row32 == pytest.approx(row64, rel=1e-5, abs=1e-6)
+        assert single["tbar"] == pytest.approx(double["tbar"], rel=1e-5, abs=1e-6)
+    finally:
+        abm_engine.close_outputs(single)
+        abm_engine.close_outputs(double)
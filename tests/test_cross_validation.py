@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+import cross_validation
+
+
+def test_rolling_origins_tile_the_tail_without_overlap():
+    folds = cross_validation.rolling_origins(240, folds=4, min_train=0.25)
+    assert folds == [(60, 105), (105, 150), (150, 195), (195, 240)]
+    for (_, end), (origin, _) in zip(folds, folds[1:]):
+        assert end == origin
+
+
+def test_rolling_origins_drop_the_remainder_at_the_end():
+    folds = cross_validation.rolling_origins(100, folds=3, min_train=0.3)
+    assert folds[0][0] == 30 and folds[-1][1] <= 100
+    assert len({end - origin for origin, end in folds}) == 1
+
+
+def test_rolling_origins_rejects_too_many_folds():
+    with pytest.raises(ValueError):
+        cross_validation.rolling_origins(20, folds=10, min_train=0.25)
+
+
+def test_prefix_rmse_matches_direct_computation():
+    sim = [math.sin(t / 3.0) for t in range(50)]
+    obs = [0.1 * t for t in range(50)]
+    ends = [40, 10, 25, 10]
+    direct = [math.sqrt(sum((s - o) ** 2 for s, o in zip(sim[:e], obs[:e])) / e) for e in ends]
+    assert cross_validation.prefix_rmse(sim, obs, ends) == pytest.approx(direct, rel=1e-12)
+
+
+def test_aggregate_uses_sample_std():
+    folds = [{"edi": 0.1}, {"edi": 0.3}, {"edi": 0.5}]
+    summary = cross_validation.aggregate(folds, ["edi"])["edi"]
+    assert summary["mean"] == pytest.approx(0.3)
+    assert summary["std"] == pytest.approx(0.2)
+    assert (summary["min"], summary["max"]) == (0.1, 0.5)
@@ -0,0 +1,51 @@
+import math
+
+import ode_batch
+
+FORCING = [0.003 * t + 0.5 * math.sin(2.0 * math.pi * t / 12) for t in range(96)]
+
+
+def _reference_ode(params, steps):
+    """La ecuación del módulo, paso a paso (σ = 0)."""
+    x, out = params.get("t0", 0.0), []
+    for t in range(steps):
+        out.append(x)
+        x += params["ode_alpha"] * (params["forcing_series"][t] - params["ode_beta"] * x)
+    return out
+
+
+def _other_ode(params, steps):
+    """Otra forma (β fuera del paréntesis): el lote no debe pasar por equivalente."""
+    x, out = params.get("t0", 0.0), []
+    for t in range(steps):
+        out.append(x)
+        x += params["ode_alpha"] * params["forcing_series"][t] - params["ode_beta"] * x
+    return out
+
+
+def test_reference_gap_detects_model_mismatch():
+    p = {"ode_alpha": 0.08, "ode_beta": 0.3, "t0": 0.2, "forcing_series": FORCING}
+    assert ode_batch.reference_gap(_reference_ode(p, 96), p, 96) < 1e-12
+    assert ode_batch.reference_gap(_other_ode(p, 96), p, 96) > 1e-3
+
+
+def test_profile_scan_batch_matches_explicit_simulation():
+    obs = [0.1 * math.sin(t / 5.0) + 0.002 * t for t in range(96)]
+    batch = ode_batch.profile_scan(obs, FORCING, obs[0], 0.06, 0.2, points=5)
+    loop = ode_batch.profile_scan(obs, FORCING, obs[0], 0.06, 0.2, points=5,
+                                  simulate=_reference_ode)
+    assert batch["alpha"] == loop["alpha"] and batch["beta"] == loop["beta"]
+    for row_b, row_l in zip(batch["rmse"], loop["rmse"]):
+        assert max(abs(a - b) for a, b in zip(row_b, row_l)) < 1e-12
+
+
+def test_noise_response_has_the_model_variance():
+    p = {"ode_alpha": 0.1, "ode_beta": 0.5, "ode_noise": 0.2, "t0": 0.0,
+         "forcing_series": [0.0] * 400}
+    rows = ode_batch.simulate_ode_batch([p], 400, seeds=range(200))
+    # n(t+1) = (1 − αβ)·n + σ·ξ → varianza estacionaria σ² / (1 − (1 − αβ)²)
+    phi = 1.0 - p["ode_alpha"] * p["ode_beta"]
+    expected = p["ode_noise"] ** 2 / (1.0 - phi ** 2)
+    last = [row[-1] for row in rows]
+    var = sum(v * v for v in last) / len(last)
+    assert abs(var / expected - 1.0) < 0.3
@@ -0,0 +1,57 @@
+import math
+
+import abm_engine
+from online_indicators import CohesionAccumulator, DominanceAccumulator
+
+
+def _params(noise=0.02):
+    forcing = [0.003 * t + 0.5 * math.sin(2.0 * math.pi * t / 12) for t in range(80)]
+    return {
+        "grid_size": 6, "diffusion": 0.2, "noise": noise, "macro_coupling": 0.4,
+        "t0": 0.0, "h0": 0.5, "forcing_series": forcing, "forcing_scale": 0.1,
+        "damping": 0.05, "ode_alpha": 0.05, "ode_beta": 0.02,
+    }
+
+
+def _corr(xs, ys):
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    sxx = sum((x - mx) ** 2 for x in xs)
+    syy = sum((y - my) ** 2 for y in ys)
+    return sxy / math.sqrt(sxx * syy) if sxx * syy > 0 else 0.0
+
+
+def _two_pass(history, forcing):
+    """Las definiciones del módulo, en dos pasadas sobre la historia grabada."""
+    n = len(history[0])
+    tbar = [sum(map(sum, g)) / (n * n) for g in history]
+    series = [[g[i][j] for g in history] for i in range(n) for j in range(n)]
+    internal = sum(_corr(s, tbar) for s in series) / len(series)
+    external = sum(abs(_corr(s, forcing)) for s in series) / len(series)
+    variances = [sum((x - sum(s) / len(s)) ** 2 for x in s) for s in series]
+    return internal, external, max(variances) / sum(variances)
+
+
+def test_accumulators_match_two_pass_definitions():
+    params = _params()
+    cohesion, dominance = CohesionAccumulator(), DominanceAccumulator()
+    sim = abm_engine.simulate_abm(params, 80, seed=3, observers=[cohesion, dominance])
+    internal, external, dom = _two_pass(list(sim["grid"]), sim["forcing"])
+    online_int, online_ext = cohesion.result()
+    assert abs(online_int - internal) < 1e-9
+    assert abs(online_ext - external) < 1e-9
+    assert abs(dominance.result() - dom) < 1e-9
+    assert cohesion.degenerate == 0
+
+
+def test_constant_series_are_counted_as_degenerate():
+    cohesion, dominance = CohesionAccumulator(), DominanceAccumulator()
+    for t in range(5):
+        grid = [[1.0, 2.0], [3.0, 4.0 + t]]
+        cohesion.observe(t, grid, 0.5)
+        dominance.observe(t, grid, 0.5)
+    internal, external = cohesion.result()
+    # Tres celdas constantes (sin correlación interna) y un forzante constante
+    assert cohesion.degenerate == 3 + 4
+    assert abs(internal - 0.25) < 1e-12 and external == 0.0
+    assert dominance.result() == 1.0
@@ -0,0 +1,119 @@
+import math
+import random
+from array import array
+from datetime import date
+
+import pytest
+
+import real_data
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _day(y, m, d):
+    return float(date(y, m, d).toordinal() - EPOCH)
+
+
+# Pares (día, valor): enero 2000 completo, febrero con un NaN, marzo sin
+# datos, abril con un valor, y filas fuera del rango pedido
+ROWS = [(_day(2000, 1, d), float(d)) for d in range(1, 32)]
+ROWS += [(_day(2000, 2, 1), 10.0), (_day(2000, 2, 15), math.nan), (_day(2000, 2, 28), 20.0)]
+ROWS += [(_day(2000, 4, 30), 7.0), (_day(1999, 12, 31), 1e6), (_day(2000, 5, 1), 1e6)]
+ROWS.sort()
+EXPECTED_VALUES = [16.0, 15.0, None, 7.0]
+EXPECTED_COUNTS = [31, 2, 0, 1]
+
+
+def _write_bin(path, rows):
+    data = array("d", [x for row in rows for x in row])
+    path.write_bytes(data.tobytes())
+    return path
+
+
+def _check(series):
+    assert series.months == ["2000-01", "2000-02", "2000-03", "2000-04"]
+    assert series.counts == EXPECTED_COUNTS
+    for got, expected in zip(series.values, EXPECTED_VALUES):
+        assert math.isnan(got) if expected is None else got == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("chunk", [1 << 20, 6, 8])
+def test_binary_sorted_in_chunks(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(real_data, "CHUNK_VALUES", chunk)
+    path = _write_bin(tmp_path / "obs.bin", ROWS)
+    _check(real_data.load_monthly_series(path, "2000-01", "2000-04", cache_dir=None))
+
+
+@pytest.mark.parametrize("chunk", [1 << 20, 6])
+def test_binary_unsorted_matches_sorted(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(real_data, "CHUNK_VALUES", chunk)
+    rows = list(ROWS)
+    random.Random(4).shuffle(rows)
+    path = _write_bin(tmp_path / "obs.f64", rows)
+    _check(real_data.load_monthly_series(path, "2000-01", "2000-04", cache_dir=None))
+
+
+def test_binary_nan_day_is_skipped(tmp_path):
+    path = _write_bin(tmp_path / "obs.bin", ROWS + [(math.nan, 5.0)])
+    _check(real_data.load_monthly_series(path, "2000-01", "2000-04", cache_dir=None))
+
+
+def test_binary_rejects_truncated_file(tmp_path):
+    path = tmp_path / "obs.bin"
+    path.write_bytes(array("d", [1.0, 2.0, 3.0]).tobytes())
+    with pytest.raises(ValueError):
+        real_data.load_monthly_series(path, "2000-01", "2000-04", cache_dir=None)
+
+
+def test_csv_matches_binary(tmp_path):
+    lines = ["fecha,otra,valor"]
+    for day, value in ROWS:
+        d = date.fromordinal(int(day) + EPOCH)
+        lines.append(f"{d.isoformat()}T00:00,x,{value}")
+    lines += ["2000-04-02,x,no-es-numero", "2000-04-03,x"]
+    path = tmp_path / "obs.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _check(real_data.load_monthly_series(path, "2000-01", "2000-04", date_column="fecha",
+                                         value_column="valor", cache_dir=None))
+
+
+def test_cache_round_trip_and_invalidation(tmp_path, monkeypatch):
+    path = _write_bin(tmp_path / "obs.bin", ROWS)
+    cache = tmp_path / "cache"
+    first = real_data.load_monthly_series(path, "2000-01", "2000-04", cache_dir=cache)
+    assert len(list(cache.iterdir())) == 1
+
+    def fail(*args):
+        raise AssertionError("debió leerse de la caché")
+
+    monkeypatch.setattr(real_data, "_accumulate_binary", fail)
+    cached = real_data.load_monthly_series(path, "2000-01", "2000-04", cache_dir=cache)
+    _check(cached)
+    assert cached.counts == first.counts
+    with pytest.raises(AssertionError):
+        real_data.load_monthly_series(path, "2000-01", "2000-05", cache_dir=cache)
+
+    monkeypatch.undo()
+    _write_bin(path, ROWS + [(_day(2000, 3, 10), 3.0)])
+    changed = real_data.load_monthly_series(path, "2000-01", "2000-04", cache_dir=cache)
+    assert changed.counts == [31, 2, 1, 1]
+
+
+def test_filled_interpolates_inside_and_holds_the_ends():
+    nan = float("nan")
+    series = real_data.MonthlySeries(real_data.month_range("2000-01", "2000-06"),
+                                     [nan, 1.0, nan, nan, 4.0, nan], [0, 3, 0, 0, 1, 0], "x")
+    assert series.filled() == pytest.approx([1.0, 1.0, 2.0, 3.0, 4.0, 4.0])
+    assert series.coverage == pytest.approx(2 / 6)
+    empty = real_data.MonthlySeries(["2000-01"], [nan], [0], "x")
+    with pytest.raises(ValueError):
+        empty.filled()
+
+
+def test_outlier_share():
+    values = [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 25.0, float("nan")]
+    counts = [1] * 7 + [0]
+    series = real_data.MonthlySeries(["m"] * 8, values, counts, "x")
+    assert series.outlier_share == pytest.approx(1 / 7)
+    flat = real_data.MonthlySeries(["m"] * 4, [2.0] * 4, [1] * 4, "x")
+    assert flat.outlier_share == 0.0
@@ -0,0 +1,61 @@
+import pytest
+
+import response_surface
+from sensitivity import halton
+
+
+def test_solve_known_system():
+    a = [[0.0, 2.0, 1.0], [1.0, 1.0, 0.0], [3.0, 0.0, 1.0]]
+    x = response_surface._solve(a, [5.0, 3.0, 4.0])  # requiere pivotear en la primera columna
+    assert x == pytest.approx([1.0, 2.0, 1.0])
+
+
+def test_solve_rejects_singular_system():
+    with pytest.raises(ValueError):
+        response_surface._solve([[1.0, 2.0], [2.0, 4.0]], [1.0, 2.0])
+
+
+def test_rbf_interpolates_the_data_points():
+    points = halton(12, 3)
+    values = [sum((v - 0.4) ** 2 for v in x) + x[0] * x[2] for x in points]
+    surface = response_surface.CubicRBF(points, values)
+    assert [surface(x) for x in points] == pytest.approx(values, abs=1e-8)
+
+
+def test_rbf_reproduces_linear_functions():
+    def linear(x):
+        return 0.7 - 1.3 * x[0] + 2.1 * x[1]
+
+    surface = response_surface.CubicRBF(halton(8, 2), [linear(x) for x in halton(8, 2)])
+    for x in ([0.1, 0.9], [0.5, 0.5], [0.95, 0.05]):
+        assert surface(x) == pytest.approx(linear(x), abs=1e-8)
+    assert max(abs(l) for l in surface.lam) < 1e-8
+
+
+def _bowl(params):
+    """Cuadrática con mínimo 0.1 en el centro de la caja de forcing_scale/damping."""
+    return 0.1 + sum(((params[k] - (lo + hi) / 2) / (hi - lo)) ** 2
+                     for k, (lo, hi) in response_surface.CALIBRATION_BOX.items()
+                     if k in ("forcing_scale", "damping"))
+
+
+def test_calibrate_finds_the_minimum_within_budget():
+    keys = ["forcing_scale", "damping"]
+    out = response_surface.calibrate(_bowl, {"noise": 0.02}, keys=keys, budget=20, seed=3)
+    assert out["simulations"] == 20
+    assert set(out["params"]) == set(keys)
+    assert out["train_rmse"] == pytest.approx(0.1, abs=5e-3)
+
+
+def test_calibrate_starts_from_the_given_point():
+    keys = ["forcing_scale", "damping"]
+    seen = []
+
+    def evaluate(params):
+        seen.append((params["forcing_scale"], params["damping"]))
+        return _bowl(params)
+
+    start = {"forcing_scale": 0.525, "damping": 0.08}
+    out = response_surface.calibrate(evaluate, {}, keys=keys, budget=6, seed=1, start=start)
+    assert seen[0] == pytest.approx((0.525, 0.08))
+    assert out["train_rmse"] == pytest.approx(0.1)
@@ -0,0 +1,90 @@
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import run_ledger
+import tesis
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _ev(t, event, run_id, source="regenerate", worker="w1", **fields):
+    ts = (T0 + timedelta(seconds=t)).isoformat(timespec="milliseconds")
+    return dict(ts=ts, event=event, run_id=run_id, source=source, worker=worker, **fields)
+
+
+EVENTS = [
+    # r1: un worker, dos fases, termina bien
+    _ev(0, "run_start", "r1"),
+    _ev(40, "phase_end", "r1", case="c1", unit="synthetic", status="ok", seconds=40.0,
+        simulations=30, simulated_steps=6000),
+    _ev(100, "phase_end", "r1", case="c1", unit="real", status="ok", seconds=60.0,
+        simulations=20, simulated_steps=4000),
+    _ev(100, "run_end", "r1", status="ok", seconds=100.0),
+    # r2: dos workers de la cola, una fase falla
+    _ev(200, "worker_start", "r2", source="worker", worker="a"),
+    _ev(200, "worker_start", "r2", source="worker", worker="b"),
+    _ev(210, "phase_end", "r2", source="worker", worker="a", case="c1", unit="synthetic",
+        status="ok", seconds=10.0, simulations=5, simulated_steps=1000),
+    _ev(215, "phase_end", "r2", source="worker", worker="b", case="c2", unit="synthetic",
+        status="error", seconds=15.0),
+    _ev(220, "worker_end", "r2", source="worker", worker="a", status="ok", seconds=20.0),
+    # r3: validate con un caso omitido, sin cierre (interrumpida)
+    _ev(300, "run_start", "r3", source="validate"),
+    _ev(300, "case_end", "r3", source="validate", case="c1", status="skipped", seconds=0.0),
+    _ev(330, "case_end", "r3", source="validate", case="c2", status="ok", seconds=30.0),
+    _ev(331, "phase_start", "r3", source="validate", case="c3"),
+    # sin run_id: no pertenece a ninguna corrida
+    _ev(400, "phase_end", None, case="x", status="ok", seconds=999.0),
+]
+
+
+def test_summarize_aggregates_each_run():
+    runs, _ = run_ledger.summarize(EVENTS)
+    assert [r["run_id"] for r in runs] == ["r1", "r2", "r3"]
+    r1, r2, r3 = runs
+
+    assert r1["wall_seconds"] == 100.0 and r1["workers"] == 1
+    assert (r1["cases"], r1["phases"], r1["simulations"]) == (1, 2, 50)
+    assert r1["simulated_steps"] == 10000 and r1["steps_per_second"] == 100.0
+    assert r1["finished"] and r1["failures"] == 0
+
+    assert r2["source"] == "worker" and r2["workers"] == 2
+    assert r2["cases"] == 2 and r2["phases"] == 2 and r2["failures"] == 1
+    assert r2["steps_per_second"] == pytest.approx(1000 / 20)
+    assert r2["finished"]
+
+    assert not r3["finished"] and r3["failures"] == 0
+    assert r3["cases"] == 2 and r3["phases"] == 0 and r3["steps_per_second"] is None
+    assert r3["wall_seconds"] == 31.0
+
+
+def test_summarize_limits_and_slowest_units():
+    runs, slowest = run_ledger.summarize(EVENTS, last=2, top=3)
+    assert [r["run_id"] for r in runs] == ["r2", "r3"]
+    # sólo unidades de las corridas mostradas; los casos omitidos no cuentan
+    assert [(e["run_id"], e["seconds"]) for e in slowest] == [
+        ("r3", 30.0), ("r2", 15.0), ("r2", 10.0)]
+
+    _, slowest = run_ledger.summarize(EVENTS, top=1)
+    assert [(e["run_id"], e["unit"]) for e in slowest] == [("r1", "real")]
+
+
+def test_read_events_skips_corrupt_lines(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    path.write_text('{"event": "a"}\n{"event": "b"\n{"event": "c"}\n')
+    assert [e["event"] for e in run_ledger.read_events(path)] == ["a", "c"]
+
+
+def test_runs_command_prints_state_of_each_run(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "ledger.jsonl"
+    path.write_text("".join(json.dumps(e) + "\n" for e in EVENTS))
+    monkeypatch.setattr(run_ledger, "LEDGER_PATH", path)
+    assert tesis.cmd_runs(argparse.Namespace(last=10, top=2)) == 0
+    lines = capsys.readouterr().out.splitlines()
+    state = {line.split()[0]: line for line in lines if line.strip().startswith("r")}
+    assert state["r1"].endswith("✅")
+    assert state["r2"].endswith("❌ 1 fallo(s)")
+    assert state["r3"].endswith("⏳ sin cierre")
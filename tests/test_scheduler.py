@@ -0,0 +1,81 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+import scheduler
+import shared_series
+
+
+def test_budget_sections(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"case_budgets": {
+        "validate": {"default": {"memory_mb": 512}, "lento": {"timeout": 900}},
+    }}))
+    validate = scheduler.load_budgets("validate", manifest)
+    regenerate = scheduler.load_budgets("regenerate", manifest)
+    assert scheduler.case_budget("x", validate) == {"timeout": 300, "memory_mb": 512}
+    assert scheduler.case_budget("lento", validate) == {"timeout": 900, "memory_mb": 512}
+    assert scheduler.case_budget("x", regenerate) == {"timeout": None, "memory_mb": None}
+    assert scheduler.case_budget("x", regenerate, {"timeout": 60, "memory_mb": None}) == {
+        "timeout": 60, "memory_mb": None}
+
+
+def test_make_jobs_longest_first_and_unknown_first():
+    jobs = scheduler.make_jobs(["a", "b", "c"], {"a": 10.0, "b": 50.0},
+                               scheduler.load_budgets("regenerate", "/no/existe.json"))
+    assert [j.name for j in jobs] == ["c", "b", "a"]
+    assert jobs[0].expected == 50.0 and jobs[0].timeout is None
+
+
+def _alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            return fh.read().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="requiere /proc")
+def test_group_popen_kill_reaches_grandchildren(tmp_path):
+    pid_file = tmp_path / "nieto.pid"
+    code = ("import subprocess, sys, time\n"
+            "c = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            f"open({str(pid_file)!r}, 'w').write(str(c.pid))\n"
+            "time.sleep(60)\n")
+    proc = scheduler.GroupPopen([sys.executable, "-c", code])
+    deadline = time.monotonic() + 10
+    while not pid_file.exists() or not pid_file.read_text():
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    grandchild = int(pid_file.read_text())
+    proc.kill()
+    proc.wait()
+    deadline = time.monotonic() + 5
+    while _alive(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(grandchild)
+
+
+@pytest.mark.skipif(not shared_series.SHM_DIR.is_dir(), reason="requiere /dev/shm")
+def test_cleanup_owner_frees_blocks_of_a_killed_process():
+    code = ("import sys, time\n"
+            f"sys.path.insert(0, {os.path.dirname(shared_series.__file__)!r})\n"
+            "from shared_series import SharedSeries\n"
+            "s = SharedSeries([1.0, 2.0])\n"
+            "print(s.handle.name, flush=True)\n"
+            "time.sleep(60)\n")
+    # En su propio grupo, como un caso de --workers: el SIGKILL alcanza también
+    # al resource_tracker del hijo, que si no liberaría el bloque por su cuenta
+    proc = scheduler.GroupPopen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+    name = proc.stdout.readline().strip()
+    assert (shared_series.SHM_DIR / name).exists()
+    os.killpg(proc.pid, signal.SIGKILL)
+    proc.wait()
+    proc.stdout.close()
+    assert shared_series.cleanup_owner(proc.pid) == 1
+    assert not (shared_series.SHM_DIR / name).exists()
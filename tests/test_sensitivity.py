@@ -0,0 +1,36 @@
+import pytest
+
+import sensitivity
+
+BASE = {"diffusion": 0.2, "macro_coupling": 0.6, "forcing_scale": 0.4, "damping": 0.05,
+        "noise": 0.02}
+COEFS = {"diffusion": 1.0, "macro_coupling": -2.0, "forcing_scale": 3.0, "damping": 0.0,
+         "noise": 5.0}
+
+
+def _linear(params):
+    return sum(COEFS[k] * params[k] for k in COEFS)
+
+
+def test_halton_radical_inverse():
+    assert sensitivity.halton(3, 2) == [[0.5, 1 / 3], [0.25, 2 / 3], [0.75, 1 / 9]]
+    assert sensitivity.halton(2, 2, skip=1) == sensitivity.halton(3, 2)[1:]
+
+
+def test_morris_recovers_linear_effects():
+    out = sensitivity.run_gsa("morris", _linear, BASE, pct=0.1, seed=3, skip=12345)
+    for key, idx in out["indices"].items():
+        expected = COEFS[key] * BASE[key] * 0.2  # salto unitario = 2·pct·base
+        assert idx["mu"] == pytest.approx(expected)
+        assert idx["sigma"] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_skip_and_seed_are_independent():
+    a = sensitivity.run_gsa("sobol", _linear, BASE, samples=8, seed=1, skip=10, resamples=20)
+    b = sensitivity.run_gsa("sobol", _linear, BASE, samples=8, seed=2, skip=10, resamples=20)
+    c = sensitivity.run_gsa("sobol", _linear, BASE, samples=8, seed=1, skip=10_000_000,
+                            resamples=20)
+    # Misma skip → mismo diseño y mismos índices puntuales; otra skip → otro diseño
+    assert a["output_min"] == b["output_min"] and a["output_max"] == b["output_max"]
+    assert a["indices"]["noise"]["S1"] == b["indices"]["noise"]["S1"]
+    assert (a["output_min"], a["output_max"]) != (c["output_min"], c["output_max"])
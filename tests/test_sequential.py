@@ -0,0 +1,43 @@
+import pytest
+
+import sequential
+
+# Cuantiles de tablas de la t de Student
+T_TABLE = [
+    (0.975, 1, 12.706), (0.975, 2, 4.303), (0.975, 3, 3.182), (0.975, 5, 2.571),
+    (0.975, 10, 2.228), (0.975, 30, 2.042), (0.95, 3, 2.353), (0.95, 10, 1.812),
+    (0.995, 3, 5.841), (0.995, 4, 4.604), (0.995, 10, 3.169),
+]
+
+
+@pytest.mark.parametrize("p, df, expected", T_TABLE)
+def test_t_quantile_matches_tables(p, df, expected):
+    assert sequential.t_quantile(p, df) == pytest.approx(expected, rel=0.01)
+
+
+def test_t_quantile_is_symmetric_and_tends_to_normal():
+    assert sequential.t_quantile(0.025, 7) == pytest.approx(-sequential.t_quantile(0.975, 7))
+    assert sequential.t_quantile(0.975, 10_000) == pytest.approx(1.95996, abs=1e-3)
+
+
+def test_running_stats_matches_two_pass():
+    values = [0.3, 1.2, -0.7, 2.5, 0.0, 1.1]
+    stats = sequential.RunningStats()
+    for v in values:
+        stats.push(v)
+    mu = sum(values) / len(values)
+    assert stats.mean == pytest.approx(mu)
+    assert stats.variance == pytest.approx(sum((v - mu) ** 2 for v in values) / 5)
+
+
+def test_clear_cases_stop_after_one_batch():
+    far = sequential.sequential_test(lambda i: 0.01 * (i % 2), 0.3, batch=4)
+    assert far["pass"] and far["replicas"] == 4 and far["decided_by"] == "ci"
+    above = sequential.sequential_test(lambda i: 1.0 + 0.01 * (i % 2), 0.3, batch=4)
+    assert not above["pass"] and above["replicas"] == 4
+
+
+def test_borderline_case_runs_to_the_cap():
+    out = sequential.sequential_test(lambda i: 0.3 + (0.2 if i % 2 else -0.2), 0.3,
+                                     batch=4, max_replicas=12)
+    assert out["decided_by"] == "cap" and out["replicas"] == 12
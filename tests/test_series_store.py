@@ -0,0 +1,68 @@
+import math
+
+import pytest
+
+import series_store
+
+SERIES = {
+    "obs": [0.1 * t for t in range(50)],
+    "abm": [math.sin(t / 7.0) for t in range(50)],
+    "vacia": [],
+}
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "series" / "synthetic.npz"
+    series_store.write_npz(path, SERIES)
+    loaded = series_store.read_npz(path)
+    assert set(loaded) == set(SERIES)
+    for name, values in SERIES.items():
+        assert list(loaded[name]) == values
+    assert [p.name for p in (tmp_path / "series").iterdir()] == ["synthetic.npz"]
+
+
+def test_npy_header_is_aligned():
+    data = series_store.npy_bytes([1.0, 2.0, 3.0])
+    assert data.startswith(series_store.NPY_MAGIC)
+    assert (len(data) - 3 * 8) % 64 == 0
+
+
+def test_same_content_same_digest(tmp_path):
+    a = series_store.write_npz(tmp_path / "a.npz", SERIES)
+    b = series_store.write_npz(tmp_path / "b.npz", SERIES)
+    c = series_store.write_npz(tmp_path / "c.npz", dict(SERIES, obs=[0.0] * 50))
+    assert a == b == series_store.file_sha256(tmp_path / "a.npz")
+    assert a != c
+
+
+def test_load_series_verifies_digest(tmp_path):
+    digest = series_store.write_npz(tmp_path / "series" / "s.npz", SERIES)
+    ref = {"path": "series/s.npz", "sha256": digest}
+    assert list(series_store.load_series(tmp_path, ref)["obs"]) == SERIES["obs"]
+    with pytest.raises(ValueError):
+        series_store.load_series(tmp_path, dict(ref, sha256="0" * 64))
+    assert "obs" in series_store.load_series(tmp_path, dict(ref, sha256="0" * 64), verify=False)
+
+
+def test_numpy_reads_our_files(tmp_path):
+    np = pytest.importorskip("numpy")
+    series_store.write_npz(tmp_path / "s.npz", SERIES)
+    with np.load(tmp_path / "s.npz") as loaded:
+        for name, values in SERIES.items():
+            assert loaded[name].dtype == np.float64
+            assert loaded[name].tolist() == values
+
+
+def test_we_read_numpy_savez(tmp_path):
+    np = pytest.importorskip("numpy")
+    np.savez(tmp_path / "s.npz", **{k: np.asarray(v, dtype="<f8") for k, v in SERIES.items()})
+    loaded = series_store.read_npz(tmp_path / "s.npz")
+    for name, values in SERIES.items():
+        assert list(loaded[name]) == values
+
+
+def test_compressed_members_are_rejected(tmp_path):
+    np = pytest.importorskip("numpy")
+    np.savez_compressed(tmp_path / "s.npz", obs=np.arange(10.0))
+    with pytest.raises(ValueError):
+        series_store.read_npz(tmp_path / "s.npz")
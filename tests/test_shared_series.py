@@ -0,0 +1,61 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+
+import shared_series
+from shared_series import SharedSeries
+
+
+def test_views_and_shift():
+    with SharedSeries([1.0, 2.0, 3.0]) as shared:
+        h = shared.handle
+        assert list(shared_series.resolve(h)) == [1.0, 2.0, 3.0]
+        assert list(shared_series.resolve(h.prefix(2))) == [1.0, 2.0]
+        assert list(shared_series.resolve(h.shifted(0.5))) == [1.5, 2.5, 3.5]
+
+
+def test_as_list_builds_each_handle_once_and_forgets_on_close():
+    with SharedSeries([1.0, 2.0, 3.0]) as shared:
+        h = shared.handle
+        params = {"forcing_series": h, "alt": h.shifted(1.0), "noise": 0.1}
+        first = shared_series.resolve_params(params, materialize=True)
+        second = shared_series.resolve_params(params, materialize=True)
+        assert first["forcing_series"] == [1.0, 2.0, 3.0]
+        assert first["alt"] == [2.0, 3.0, 4.0]
+        assert first["forcing_series"] is second["forcing_series"]
+        assert first["alt"] is second["alt"]
+    assert not any(k.name == h.name for k in shared_series._MATERIALIZED)
+
+
+POOL_SCRIPT = """\
+import multiprocessing, sys
+sys.path.insert(0, {path!r})
+import shared_series
+
+def total(handle):
+    return sum(shared_series.resolve(handle))
+
+if __name__ == "__main__":
+    with shared_series.SharedSeries([1.0, 2.0, 3.0]) as shared:
+        with multiprocessing.get_context({method!r}).Pool(2) as pool:
+            assert pool.map(total, [shared.handle] * 4) == [6.0] * 4
+        # los workers ya salieron: el bloque sigue siendo del dueño
+        assert list(shared_series.resolve(shared.handle)) == [1.0, 2.0, 3.0]
+        name = shared.handle.name
+    assert not (shared_series.SHM_DIR / name).exists()
+"""
+
+
+@pytest.mark.parametrize("method", [m for m in ("spawn", "forkserver", "fork")
+                                    if m in multiprocessing.get_all_start_methods()])
+def test_pool_workers_leave_the_owner_registration_alone(tmp_path, method):
+    script = tmp_path / "pool.py"
+    script.write_text(POOL_SCRIPT.format(path=os.path.dirname(shared_series.__file__),
+                                         method=method))
+    proc = subprocess.run([sys.executable, str(script)], capture_output=True, text=True,
+                          timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert "KeyError" not in proc.stderr and "leaked" not in proc.stderr
@@ -0,0 +1,61 @@
+import cmath
+import math
+
+import pytest
+
+import surrogates
+
+
+def _series(n=60):
+    return [0.01 * t + math.sin(2.0 * math.pi * t / 12) + 0.3 * math.cos(t) for t in range(n)]
+
+
+def _dft(x):
+    n = len(x)
+    return [sum(x[j] * cmath.exp(-2j * math.pi * j * k / n) for j in range(n)) for k in range(n)]
+
+
+@pytest.mark.parametrize("n", [60, 64, 49])
+def test_fft_matches_direct_dft(n):
+    x = _series(n)
+    for a, b in zip(surrogates._fft(x), _dft(x)):
+        assert abs(a - b) < 1e-9
+    back = surrogates._fft(surrogates._fft(x), inverse=True)
+    assert max(abs(b.real / n - v) for b, v in zip(back, x)) < 1e-9
+
+
+def test_phase_surrogates_keep_mean_and_amplitude_spectrum():
+    x = _series()
+    mu = sum(x) / len(x)
+    amps = [abs(c) for c in _dft([v - mu for v in x])]
+    surr = surrogates.phase_randomized(x, 3, seed=1)
+    assert surr != surrogates.phase_randomized(x, 3, seed=2)
+    for s in surr:
+        assert abs(sum(s) / len(s) - mu) < 1e-9
+        s_amps = [abs(c) for c in _dft([v - mu for v in s])]
+        assert max(abs(a - b) for a, b in zip(amps[1:], s_amps[1:])) < 1e-8
+        assert s != x
+
+
+def test_block_bootstrap_draws_circular_blocks():
+    x = list(range(30))
+    for s in surrogates.block_bootstrap(x, 5, seed=0, block=4):
+        assert len(s) == len(x)
+        for start in range(0, len(s) - 4, 4):
+            block = s[start:start + 4]
+            assert all((b - a) % len(x) == 1 for a, b in zip(block, block[1:]))
+
+
+def test_make_surrogates_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        surrogates.make_surrogates([1.0, 2.0], 1, method="shuffle")
+
+
+def test_null_summary_p_value():
+    null = [0.1 * i for i in range(9)]  # 0.0 … 0.8
+    assert surrogates.null_summary(0.75, null)["p_value"] == pytest.approx(2 / 10)
+    assert surrogates.null_summary(5.0, null)["p_value"] == pytest.approx(1 / 10)
+    summary = surrogates.null_summary(-1.0, null)
+    assert summary["p_value"] == pytest.approx(1.0)
+    assert summary["null_mean"] == pytest.approx(0.4)
+    assert summary["null_q95"] == pytest.approx(0.8)
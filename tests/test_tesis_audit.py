@@ -0,0 +1,34 @@
+import os
+
+import tesis
+
+
+def _rule(ctx):
+    return ["x"] if ctx.exists(ctx.case_dir / "x") else []
+
+
+def test_rule_key_follows_module_source(monkeypatch):
+    before = tesis._rule_key("r", _rule, {})
+    assert tesis._rule_key("r", _rule, {}) == before
+    monkeypatch.setitem(tesis._SOURCE_DIGESTS, tesis.__file__, "otro")
+    assert tesis._rule_key("r", _rule, {}) != before
+
+
+def test_reused_entry_refreshes_at_ns(tmp_path):
+    dep = tmp_path / "README.md"
+    dep.write_text("hola")
+    old = dep.stat().st_mtime_ns - 10_000_000_000
+    os.utime(dep, ns=(old, old))
+
+    def rule(ctx):
+        ctx.read_text(dep)
+        return []
+
+    _, entry, cached = tesis._run_rule(tmp_path, "r", rule, {}, "k", None)
+    assert not cached
+    entry = dict(entry, at_ns=old - 5_000_000_000)  # auditoría más vieja que el archivo
+    _, reused, cached = tesis._run_rule(tmp_path, "r", rule, {}, "k", entry)
+    assert cached
+    assert reused["at_ns"] > dep.stat().st_mtime_ns
+    _, _, cached = tesis._run_rule(tmp_path, "r", rule, {}, "otra", reused)
+    assert not cached
@@ -0,0 +1,37 @@
+import json
+import subprocess
+
+import tesis
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=cwd,
+                   check=True, capture_output=True)
+
+
+def test_metrics_at_uses_repo_fallbacks_and_skips_broken_json(tmp_path, monkeypatch, capsys):
+    cases = tmp_path / "TesisDesarrollo" / "02_Modelado_Simulacion"
+    sim = tmp_path / "repos" / "Simulaciones"
+    for name in ("04_caso_a", "05_caso_b", "06_caso_c"):
+        (cases / name).mkdir(parents=True)
+        (cases / name / "README.md").write_text(name)
+    (cases / "04_caso_a" / "metrics.json").write_text(json.dumps({"phases": {"a": {}}}))
+    (cases / "05_caso_b" / "metrics.json").write_text("{roto")
+    (sim / "caso_b").mkdir(parents=True)
+    (sim / "caso_b" / "metrics.json").write_text(json.dumps({"phases": {"b": {}}}))
+    (sim / "caso_c" / "outputs").mkdir(parents=True)
+    (sim / "caso_c" / "outputs" / "metrics.json").write_text(json.dumps({"phases": {"c": {}}}))
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "casos")
+    monkeypatch.setattr(tesis, "REPOS_SIM", sim)
+
+    reader = tesis.GitBatchReader(cases)
+    try:
+        found = tesis._metrics_at(reader, ["HEAD"], base=cases)["HEAD"]
+    finally:
+        reader.close()
+
+    assert found == {"04_caso_a": {"phases": {"a": {}}}, "05_caso_b": {"phases": {"b": {}}},
+                     "06_caso_c": {"phases": {"c": {}}}}
+    assert "05_caso_b/metrics.json ilegible" in capsys.readouterr().out
@@ -0,0 +1,102 @@
+import random
+import re
+
+import tesis
+
+METRICS = {
+    "generated_at": "2026-01-01T00:00:00Z",
+    "phases": {
+        "synthetic": {
+            "errors": {"rmse_abm": 1.0, "rmse_ode": 1.5, "rmse_reduced": 2.0},
+            "correlations": {"abm_obs": 0.9, "ode_obs": 0.8},
+            "symploke": {"pass": True, "internal": 0.4, "external": 0.2},
+            "c1_convergence": True, "c2_robustness": False, "c3_replication": True,
+            "c4_validity": True, "c5_uncertainty": None,
+            "emergence": {"pass": True},
+            "sensitivity": {
+                "mean_min": 0.1, "mean_max": 0.3,
+                "global": {"method": "morris", "indices": {
+                    "damping": {"mu_star": 0.02}, "forcing_scale": {"mu_star": 0.5}}},
+            },
+            "timings": {"stages": {"calibration_abm": 2.5, "c1": 0.1},
+                        "total_seconds": 3.0, "simulated_steps": 2400},
+        },
+    },
+}
+SUMMARY = tesis._extract_summary(METRICS)
+
+
+def _old_replace(content, summary):
+    """El reemplazo por expresiones regulares anterior (sólo RESULTS e inline)."""
+    block = tesis.AUTO_BLOCKS["RESULTS"](summary, {})
+    content = re.sub(r'<!-- AUTO:RESULTS:START -->.*?<!-- AUTO:RESULTS:END -->',
+                     lambda m: f"<!-- AUTO:RESULTS:START -->\n{block}\n<!-- AUTO:RESULTS:END -->",
+                     content, flags=re.DOTALL)
+    return re.sub(r'<!-- AUTO:(\w+) -->(.+?)<!-- /AUTO:\1 -->',
+                  lambda m: (f"<!-- AUTO:{m.group(1)} -->{summary.get(m.group(1), m.group(2))}"
+                             f"<!-- /AUTO:{m.group(1)} -->"),
+                  content)
+
+
+DOCS = [
+    "# Caso\n\nEDI: <!-- AUTO:edi -->0.000<!-- /AUTO:edi --> y CR "
+    "<!-- AUTO:synthetic_cr -->?<!-- /AUTO:synthetic_cr -->.\n\n"
+    "<!-- AUTO:RESULTS:START -->\nviejo\n<!-- AUTO:RESULTS:END -->\nfin\n",
+    "sin marcadores\n",
+    "<!-- AUTO:desconocida -->se queda<!-- /AUTO:desconocida --> "
+    "<!-- AUTO:edi --><!-- /AUTO:edi --> <!-- AUTO:edi -->x\ny<!-- /AUTO:edi -->\n",
+    "<!-- AUTO:RESULTS:START --><!-- AUTO:RESULTS:END -->"
+    "<!-- AUTO:RESULTS:START -->a<!-- AUTO:RESULTS:END --><!-- AUTO:status -->z<!-- /AUTO:status -->",
+    "<!-- AUTO:edi -->1<!-- /AUTO:cr --> <!-- AUTO:roto sin cierre",
+    "<!-- AUTO:edi --><!-- /AUTO:edi --> texto <!-- /AUTO:edi -->\n",
+]
+
+
+def test_results_and_inline_match_the_old_replacer():
+    for doc in DOCS:
+        assert tesis._replace_auto_blocks(doc, SUMMARY, METRICS) == _old_replace(doc, SUMMARY)
+
+
+def test_random_documents_match_the_old_replacer():
+    pieces = ["<!-- AUTO:edi -->", "<!-- /AUTO:edi -->", "<!-- AUTO:cr -->", "<!-- /AUTO:cr -->",
+              "<!-- AUTO:RESULTS:START -->", "<!-- AUTO:RESULTS:END -->", "<!-- AUTO:",
+              " -->", "texto", "\n", "v", ""]
+    rng = random.Random(38)
+    for _ in range(2000):
+        doc = "".join(rng.choice(pieces) for _ in range(rng.randrange(1, 12)))
+        assert tesis._replace_auto_blocks(doc, SUMMARY, METRICS) == _old_replace(doc, SUMMARY), doc
+
+
+def test_inline_values_and_results_block():
+    out = tesis._replace_auto_blocks(DOCS[0], SUMMARY, METRICS)
+    assert f"<!-- AUTO:edi -->{SUMMARY['edi']}<!-- /AUTO:edi -->" in out
+    assert "viejo" not in out and "| EDI     | 0.500 | — |" in out
+    assert out.endswith("<!-- AUTO:RESULTS:END -->\nfin\n")
+
+
+def test_block_renderers():
+    doc = ("<!-- AUTO:CRITERIA:START -->\n<!-- AUTO:CRITERIA:END -->\n"
+           "<!-- AUTO:SENSITIVITY:START -->\n<!-- AUTO:SENSITIVITY:END -->\n"
+           "<!-- AUTO:TIMINGS:START -->\n<!-- AUTO:TIMINGS:END -->\n")
+    out = tesis._replace_auto_blocks(doc, SUMMARY, METRICS)
+    assert "| C1 | Convergencia | ✅ | — |" in out
+    assert "| C2 | Robustez | ❌ | — |" in out
+    assert "| C5 | Incertidumbre | — | — |" in out
+    assert "| Sintético | 0.1000 | 0.3000 | morris | forcing_scale (mu_star=0.5) |" in out
+    assert "| calibration_abm | 2.5 | — |" in out
+    assert "| **Total (s)** | 3 | — |" in out
+    assert out.count(":START -->") == out.count(":END -->") == 3
+    assert tesis._replace_auto_blocks(out, SUMMARY, METRICS) == out
+
+
+def test_unknown_block_is_copied():
+    doc = "a\n<!-- AUTO:OTRO:START -->\nprosa humana\n<!-- AUTO:OTRO:END -->\nb\n"
+    assert tesis._replace_auto_blocks(doc, SUMMARY, METRICS) == doc
+
+
+def test_unterminated_block_leaves_the_rest_untouched():
+    doc = ("<!-- AUTO:RESULTS:START -->\nprosa que no es del bloque\n\n"
+           "EDI <!-- AUTO:edi -->0<!-- /AUTO:edi -->\n")
+    out = tesis._replace_auto_blocks(doc, SUMMARY, METRICS)
+    assert out == doc.replace("-->0<!--", f"-->{SUMMARY['edi']}<!--")
+    assert "prosa que no es del bloque" in out
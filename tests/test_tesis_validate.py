@@ -0,0 +1,88 @@
+import argparse
+import json
+
+import run_ledger
+import tesis
+
+VALIDATE_PY = """\
+from pathlib import Path
+repo = Path(__file__).resolve().parent.parent
+(repo / "outputs").mkdir(exist_ok=True)
+(repo / "outputs" / "metrics.json").write_text("{}")
+with open(repo / "corridas.txt", "a") as fh:
+    fh.write("x")
+"""
+
+MANIFEST = {
+    "validation_thresholds": {"edi_min": 0.3},
+    "diff_tolerances": {"edi": 0.001},
+    "case_budgets": {"validate": {"default": {"timeout": 60}}},
+}
+
+
+def _case(root):
+    repo = root / "caso_x"
+    (repo / "src").mkdir(parents=True)
+    (repo / "data").mkdir()
+    (repo / "src" / "validate.py").write_text(VALIDATE_PY)
+    (repo / "data" / "obs.csv").write_text("date,value\n2000-01-01,1.0\n")
+    return repo
+
+
+def _runs(repo):
+    path = repo / "corridas.txt"
+    return len(path.read_text()) if path.exists() else 0
+
+
+def test_input_digest_tracks_files_and_settings(tmp_path):
+    repo = _case(tmp_path)
+    settings = tesis.validate_settings(MANIFEST, {"timeout": 60, "memory_mb": None})
+    digest, files = tesis.case_input_digest(repo, settings=settings)
+    assert set(files) == {"src/validate.py", "data/obs.csv"}
+    stamp = {"files": files, "at_ns": 0}
+    assert tesis.case_input_digest(repo, stamp, settings)[0] == digest
+
+    other = tesis.validate_settings(dict(MANIFEST, diff_tolerances={"edi": 0.01}),
+                                    {"timeout": 60, "memory_mb": None})
+    assert tesis.case_input_digest(repo, stamp, other)[0] != digest
+    budget = tesis.validate_settings(MANIFEST, {"timeout": 60, "memory_mb": 512})
+    assert tesis.case_input_digest(repo, stamp, budget)[0] != digest
+
+    (repo / "data" / "obs.csv").write_text("date,value\n2000-01-01,2.0\n")
+    assert tesis.case_input_digest(repo, stamp, settings)[0] != digest
+
+
+def test_validate_skips_up_to_date_cases(tmp_path, monkeypatch, capsys):
+    sims = tmp_path / "Simulaciones"
+    repo = _case(sims)
+    manifest_path = tmp_path / "tesis_manifest.json"
+    monkeypatch.setattr(tesis, "REPOS_SIM", sims)
+    monkeypatch.setattr(tesis, "MANIFEST_PATH", manifest_path)
+    monkeypatch.setattr(run_ledger, "LEDGER_PATH", tmp_path / "ledger.jsonl")
+    args = argparse.Namespace(case=None, no_sync=True, force=False, jobs=1, timeout=None,
+                              memory_mb=None, plan=False)
+
+    def validate(manifest=MANIFEST, **kw):
+        manifest_path.write_text(json.dumps(manifest))
+        capsys.readouterr()
+        assert tesis.cmd_validate(argparse.Namespace(**dict(vars(args), **kw))) == 0
+        return capsys.readouterr().out
+
+    assert "Ejecutando 1 validación(es)" in validate()
+    assert _runs(repo) == 1
+
+    out = validate()
+    assert "Ejecutando 0 validación(es) en 1 slot(s); 1 al día" in out
+    assert "⏭  caso_x" in out and _runs(repo) == 1
+
+    validate(force=True)
+    assert _runs(repo) == 2
+
+    (repo / "data" / "obs.csv").write_text("date,value\n2000-01-01,1.0\n2000-02-01,3.0\n")
+    validate()
+    assert _runs(repo) == 3
+
+    validate(dict(MANIFEST, validation_thresholds={"edi_min": 0.4}))
+    assert _runs(repo) == 4
+    validate(dict(MANIFEST, validation_thresholds={"edi_min": 0.4}))
+    assert _runs(repo) == 4
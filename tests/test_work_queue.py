@@ -0,0 +1,104 @@
+import multiprocessing
+import time
+
+import pytest
+
+# work_queue importa regenerate_fair_metrics, que necesita el motor de caso_clima
+work_queue = pytest.importorskip("work_queue")
+rfm = work_queue.rfm
+
+
+def _drain(path, worker):
+    """Worker de prueba: reclama y completa tareas hasta vaciar la cola."""
+    queue = work_queue.WorkQueue(path)
+    claimed = []
+    try:
+        while True:
+            task = queue.claim(worker, lease=30.0)
+            if task is None:
+                return claimed
+            claimed.append(task["id"])
+            time.sleep(0.01)  # deja que el otro worker intercale sus reclamos
+            queue.complete(task["id"], worker)
+    finally:
+        queue.close()
+
+
+def _queue(tmp_path, tasks):
+    queue = work_queue.WorkQueue(tmp_path / "queue.sqlite")
+    queue.enqueue(tasks)
+    return queue
+
+
+def test_two_workers_never_share_a_task(tmp_path):
+    queue = _queue(tmp_path, [("caso", "synthetic", r) for r in range(20)])
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(2) as pool:
+        claimed = pool.starmap(_drain, [(queue.path, "a"), (queue.path, "b")])
+    ids = claimed[0] + claimed[1]
+    assert sorted(ids) == [t["id"] for t in queue.tasks()]
+    assert queue.counts() == {"done": 20}
+    queue.close()
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = _queue(tmp_path, [("caso", "synthetic", 0)])
+    first = queue.claim("a", lease=0.05)
+    assert queue.claim("b", lease=30.0) is None
+    time.sleep(0.1)
+    second = queue.claim("b", lease=30.0)
+    assert second["id"] == first["id"]
+    assert not queue.renew(first["id"], "a")
+    queue.complete(first["id"], "a")  # el worker que perdió el lease no la cierra
+    assert queue.counts() == {"running": 1}
+    assert queue.tasks()[0]["worker"] == "b" and queue.tasks()[0]["attempts"] == 2
+    queue.close()
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    queue = _queue(tmp_path, [("caso", "synthetic", 0)])
+    for attempt in (1, 2):
+        task = queue.claim("a", max_attempts=2)
+        assert task is not None
+        queue.fail(task["id"], "a", f"error {attempt}", max_attempts=2)
+    assert queue.claim("a", max_attempts=2) is None
+    (task,) = queue.tasks()
+    assert task["status"] == "failed" and task["attempts"] == 2 and task["error"] == "error 2"
+    queue.close()
+
+
+def test_expired_lease_after_last_attempt_is_dead(tmp_path):
+    queue = _queue(tmp_path, [("caso", "synthetic", 0)])
+    queue.claim("a", lease=0.01, max_attempts=1)
+    time.sleep(0.05)
+    assert queue.claim("b", max_attempts=1) is None
+    assert queue.tasks()[0]["status"] == "failed"
+    queue.close()
+
+
+def _block(edi):
+    return {"errors": {"edi_control": edi, "rmse_abm": 1.0}, "overall_pass": True}
+
+
+def test_merge_waits_for_incomplete_cases_unless_forced(tmp_path, monkeypatch):
+    monkeypatch.setattr(rfm, "RUNS_DIR", tmp_path)
+    written = {}
+    monkeypatch.setattr(rfm, "write_case_metrics",
+                        lambda case, phases, checkpoint=None: written.setdefault(case, phases))
+    checkpoint = rfm.RunCheckpoint("lote")
+    queue = work_queue.WorkQueue(work_queue.queue_path(checkpoint))
+    queue.enqueue([("caso", "synthetic", r) for r in range(3)])
+    for r, edi in ((0, 0.2), (1, 0.4)):
+        task = queue.claim("a")
+        checkpoint.save("caso", rfm.phase_unit("synthetic", r), _block(edi))
+        queue.complete(task["id"], "a")
+    task = queue.claim("a", max_attempts=1)
+    queue.fail(task["id"], "a", "murió", max_attempts=1)
+    queue.close()
+
+    assert work_queue.merge("lote") is False
+    assert written == {}
+    work_queue.merge("lote", force=True)
+    summary = written["caso"]["synthetic"]["replicates"]
+    assert summary["count"] == 2
+    assert summary["edi_control"]["mean"] == pytest.approx(0.3)
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+work_queue.py — Cola de trabajo en SQLite para repartir una regeneración.
+
+Un coordinador encola tareas caso × fase × réplica en
+``runs/<run_id>/queue.sqlite``; cualquier número de workers (procesos locales
+o máquinas que compartan el sistema de archivos) las reclaman con un lease,
+ejecutan ``evaluate_phase`` y guardan el resultado como checkpoint en
+``runs/<run_id>/<caso>/``, igual que ``regenerate_fair_metrics.py --resume``.
+``merge`` arma metrics.json de cada caso cuyas tareas terminaron.
+
+- El lease se renueva en segundo plano mientras la tarea corre; si un worker
+  muere, su tarea vuelve a estar disponible al vencer el lease.
+- Las semillas salen de ``SeedStream`` (root_seed del manifiesto), así que
+  ejecutar una tarea dos veces da el mismo resultado: un lease vencido por
+  error sólo cuesta cómputo repetido, nunca un resultado distinto.
+- La réplica 0 usa los flujos de la corrida secuencial; las demás, flujos
+  ``<fase>/replicate/<r>`` sobre las mismas observaciones.
+- Sin broker externo: sólo sqlite3 (modo journal clásico, no WAL, para que
+  el bloqueo funcione en sistemas de archivos compartidos).
+
+Uso:
+    python3 repos/scripts/work_queue.py enqueue --run-id lote1 --replicates 4 --engine local
+    python3 repos/scripts/work_queue.py worker lote1 --processes 4
+    python3 repos/scripts/work_queue.py status lote1
+    python3 repos/scripts/work_queue.py merge lote1
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import regenerate_fair_metrics as rfm
+import run_ledger
+from rng_streams import DEFAULT_ROOT_SEED, SeedStream
+
+DEFAULT_LEASE = 600.0  # segundos
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    case_name TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    replicate INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    started_at REAL,
+    finished_at REAL,
+    UNIQUE (case_name, phase, replicate)
+)
+"""
+
+
+class WorkQueue:
+    """Tabla de tareas con estados pending → running → done | failed."""
+
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.conn = sqlite3.connect(str(path), timeout=timeout, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.execute(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE toma el bloqueo de escritura antes de leer: dos
+        # workers no pueden reclamar la misma tarea
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, tasks):
+        """Agrega tareas (caso, fase, réplica); las ya existentes se ignoran."""
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (case_name, phase, replicate) VALUES (?, ?, ?)",
+                tasks)
+            return conn.total_changes - before
+
+    def claim(self, worker, lease=DEFAULT_LEASE, max_attempts=MAX_ATTEMPTS):
+        """Reclama la siguiente tarea pendiente (o con lease vencido); None si no hay."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease vencido' "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, max_attempts))
+            row = conn.execute(
+                "SELECT * FROM tasks WHERE status = 'pending' "
+                "OR (status = 'running' AND lease_until < ?) ORDER BY id LIMIT 1",
+                (now,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'running', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, started_at = ?, error = NULL WHERE id = ?",
+                (worker, now + lease, now, row["id"]))
+            return dict(row)
+
+    def renew(self, task_id, worker, lease=DEFAULT_LEASE):
+        """Extiende el lease; False si la tarea ya no pertenece a ``worker``."""
+        cur = self.conn.execute(
+            "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + lease, task_id, worker))
+        return cur.rowcount == 1
+
+    def complete(self, task_id, worker):
+        self.conn.execute(
+            "UPDATE tasks SET status = 'done', finished_at = ? WHERE id = ? AND worker = ?",
+            (time.time(), task_id, worker))
+
+    def fail(self, task_id, worker, error, max_attempts=MAX_ATTEMPTS):
+        """Registra el error; la tarea se reintenta hasta ``max_attempts`` veces."""
+        self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_until = NULL WHERE id = ? AND worker = ?",
+            (max_attempts, error, task_id, worker))
+
+    def counts(self):
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+        return {status: n for status, n in rows}
+
+    def tasks(self):
+        return [dict(r) for r in self.conn.execute("SELECT * FROM tasks ORDER BY id")]
+
+    def close(self):
+        self.conn.close()
+
+
+def queue_path(checkpoint):
+    return checkpoint.dir / "queue.sqlite"
+
+
+class _LeaseKeeper(threading.Thread):
+    """Renueva el lease de una tarea cada lease/3 segundos mientras corre."""
+
+    def __init__(self, queue_file, task_id, worker, lease):
+        super().__init__(daemon=True)
+        self.queue_file = queue_file
+        self.task_id = task_id
+        self.worker = worker
+        self.lease = lease
+        self.stopped = threading.Event()
+
+    def run(self):
+        queue = WorkQueue(self.queue_file)  # conexión propia: sqlite3 no comparte entre hilos
+        try:
+            while not self.stopped.wait(self.lease / 3.0):
+                if not queue.renew(self.task_id, self.worker, self.lease):
+                    print(f"  ⚠️  {self.worker}: perdió el lease de la tarea {self.task_id}")
+                    return
+        finally:
+            queue.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_task(checkpoint, task):
+    """Ejecuta una tarea caso × fase × réplica y guarda su checkpoint."""
+    case_name, phase, replicate = task["case_name"], task["phase"], task["replicate"]
+    cfg = rfm.case_config(case_name, checkpoint.options)
+    root = SeedStream(checkpoint.root_seed, case_name)
+    obs, forcing, phase_cfg, data_info = rfm.phase_inputs(case_name, phase, cfg, root)
+    return rfm.checkpointed_phase(checkpoint, case_name, phase, obs, forcing, phase_cfg,
+                                  rfm.phase_stream(root, phase, replicate),
+                                  data_info=data_info, unit=rfm.phase_unit(phase, replicate))
+
+
+def run_worker(run_id, lease=DEFAULT_LEASE, poll=5.0, max_attempts=MAX_ATTEMPTS):
+    """Reclama y ejecuta tareas hasta que no quede ninguna pendiente ni en curso."""
+    checkpoint = rfm.RunCheckpoint(run_id, resume=True)
+    queue = WorkQueue(queue_path(checkpoint))
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    run_ledger.configure(run_id=run_id, source="worker", worker=worker)
+    done = 0
+    with run_ledger.span("worker") as ledger_end:
+        try:
+            while True:
+                task = queue.claim(worker, lease, max_attempts)
+                if task is None:
+                    counts = queue.counts()
+                    if not counts.get("pending") and not counts.get("running"):
+                        break
+                    time.sleep(poll)  # otras tareas en curso: esperar por si vence un lease
+                    continue
+
+                label = f"{task['case_name']}/{rfm.phase_unit(task['phase'], task['replicate'])}"
+                print(f"  ▶ [{worker}] {label}", flush=True)
+                keeper = _LeaseKeeper(queue_path(checkpoint), task["id"], worker, lease)
+                keeper.start()
+                try:
+                    run_task(checkpoint, task)
+                except Exception as exc:
+                    queue.fail(task["id"], worker, traceback.format_exc(), max_attempts)
+                    print(f"  ❌ [{worker}] {label}: {exc}", flush=True)
+                else:
+                    queue.complete(task["id"], worker)
+                    done += 1
+                    print(f"  ✅ [{worker}] {label}", flush=True)
+                finally:
+                    keeper.stop()
+        finally:
+            queue.close()
+            ledger_end["tasks"] = done
+    print(f"  🏁 [{worker}] {done} tareas completadas")
+    return done
+
+
+def _stats(values):
+    n = len(values)
+    mu = sum(values) / n
+    sd = math.sqrt(sum((v - mu) ** 2 for v in values) / (n - 1)) if n > 1 else 0.0
+    return {"mean": mu, "std": sd, "min": min(values), "max": max(values)}
+
+
+def replicate_summary(blocks):
+    """Resumen de las réplicas de una fase (bloque ``replicates`` de metrics.json)."""
+    return {
+        "count": len(blocks),
+        "edi_control": _stats([b["errors"]["edi_control"] for b in blocks]),
+        "rmse_abm": _stats([b["errors"]["rmse_abm"] for b in blocks]),
+        "overall_pass_rate": sum(1 for b in blocks if b.get("overall_pass")) / len(blocks),
+    }
+
+
+def merge(run_id, force=False):
+    """Escribe metrics.json de cada caso cuyas tareas están todas terminadas.
+
+    Con ``force`` reescribe los casos ya escritos y escribe también los que
+    tienen réplicas pendientes o fallidas, siempre que la réplica 0 de cada
+    fase haya terminado: el resumen ``replicates`` usa sólo las terminadas.
+    """
+    checkpoint = rfm.RunCheckpoint(run_id, resume=True)
+    run_ledger.configure(run_id=run_id, source="merge")
+    queue = WorkQueue(queue_path(checkpoint))
+    by_case = {}
+    for task in queue.tasks():
+        by_case.setdefault(task["case_name"], []).append(task)
+    queue.close()
+
+    written, waiting = 0, 0
+    for case_name, tasks in by_case.items():
+        if not force and checkpoint.load(case_name, "written"):
+            continue
+        done = [t for t in tasks if t["status"] == "done"]
+        if len(done) < len(tasks):
+            base_done = {t["phase"] for t in done if t["replicate"] == 0}
+            if not force or base_done != {t["phase"] for t in tasks}:
+                waiting += 1
+                continue
+        print(f"  ▶ {case_name}...", end=" ", flush=True)
+        if len(done) < len(tasks):
+            print(f"(⚠️  {len(tasks) - len(done)} réplica(s) sin terminar)", end=" ")
+        phases = {}
+        for phase in sorted({t["phase"] for t in done}):
+            reps = sorted(t["replicate"] for t in done if t["phase"] == phase)
+            blocks = [checkpoint.load(case_name, rfm.phase_unit(phase, r)) for r in reps]
+            phases[phase] = blocks[0]
+            if len(blocks) > 1:
+                phases[phase]["replicates"] = replicate_summary(blocks)
+        if rfm.write_case_metrics(case_name, phases, checkpoint) is None:
+            print("⏭")  # fases cortadas por --screen: quedan sólo en el checkpoint
+            continue
+        print("✅")
+        written += 1
+    print(f"\nEscritos: {written} | Pendientes: {waiting}")
+    return waiting == 0
+
+
+def cmd_enqueue(args):
+    run_id = args.run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    try:
+        checkpoint = rfm.RunCheckpoint(run_id, root_seed=args.seed,
+                                       options=rfm.case_options(args))
+    except FileExistsError as exc:
+        print(f"❌ {exc}")
+        return 1
+    tasks = []
+    for case_name in args.cases or rfm.CASE_CONFIGS:
+        if not (rfm.CASES_DIR / case_name).exists():
+            print(f"  ⚠️  {case_name}: directorio no encontrado")
+            continue
+        for phase in rfm.case_phases(rfm.CASE_CONFIGS[case_name]):
+            tasks += [(case_name, phase, r) for r in range(args.replicates)]
+    queue = WorkQueue(queue_path(checkpoint))
+    added = queue.enqueue(tasks)
+    queue.close()
+    print(f"📥 Corrida {run_id}: {added} tareas encoladas en {queue_path(checkpoint)}")
+    return 0
+
+
+def cmd_worker(args):
+    try:
+        rfm.RunCheckpoint(args.run_id, resume=True)
+    except FileNotFoundError as exc:
+        print(f"❌ {exc}")
+        return 1
+    kwargs = {"lease": args.lease, "poll": args.poll, "max_attempts": args.max_attempts}
+    if args.processes <= 1:
+        run_worker(args.run_id, **kwargs)
+        return 0
+    procs = [multiprocessing.Process(target=run_worker, args=(args.run_id,), kwargs=kwargs)
+             for _ in range(args.processes)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    return 0 if all(p.exitcode == 0 for p in procs) else 1
+
+
+def cmd_status(args):
+    try:
+        checkpoint = rfm.RunCheckpoint(args.run_id, resume=True)
+    except FileNotFoundError as exc:
+        print(f"❌ {exc}")
+        return 1
+    queue = WorkQueue(queue_path(checkpoint))
+    counts = queue.counts()
+    print(f"📋 Corrida {args.run_id}: " + " | ".join(
+        f"{status}: {counts.get(status, 0)}" for status in ["pending", "running", "done", "failed"]))
+    now = time.time()
+    for task in queue.tasks():
+        if task["status"] == "running":
+            left = task["lease_until"] - now
+            print(f"  ⏳ {task['case_name']}/{rfm.phase_unit(task['phase'], task['replicate'])} "
+                  f"— {task['worker']} (lease {left:.0f}s)")
+        elif task["status"] == "failed":
+            last = (task["error"] or "").strip().splitlines()[-1:] or [""]
+            print(f"  ❌ {task['case_name']}/{rfm.phase_unit(task['phase'], task['replicate'])} "
+                  f"— {last[0]}")
+    queue.close()
+    return 0
+
+
+def cmd_merge(args):
+    try:
+        complete = merge(args.run_id, force=args.force)
+    except FileNotFoundError as exc:
+        print(f"❌ {exc}")
+        return 1
+    if complete:
+        print("\nSiguiente paso: python3 scripts/tesis.py sync && python3 scripts/tesis.py audit")
+    return 0 if complete else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cola de trabajo para regenerar métricas")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="Crea la corrida y encola caso × fase × réplica")
+    p.add_argument("--run-id", help="Identificador de la corrida (por defecto, timestamp UTC)")
+    p.add_argument("--seed", type=int, default=DEFAULT_ROOT_SEED,
+                   help="Semilla raíz de la que se derivan todas las demás")
+    p.add_argument("--replicates", type=int, default=1, help="Réplicas por caso × fase")
+    p.add_argument("--cases", nargs="+", choices=sorted(rfm.CASE_CONFIGS),
+                   help="Sólo estos casos (por defecto, todos)")
+    rfm.add_case_options(p)
+    p.set_defaults(func=cmd_enqueue)
+
+    p = sub.add_parser("worker", help="Reclama y ejecuta tareas hasta vaciar la cola")
+    p.add_argument("run_id")
+    p.add_argument("--processes", type=int, default=1, help="Workers locales a lanzar")
+    p.add_argument("--lease", type=float, default=DEFAULT_LEASE, help="Segundos de lease")
+    p.add_argument("--poll", type=float, default=5.0,
+                   help="Espera (s) cuando sólo quedan tareas en curso")
+    p.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    p.set_defaults(func=cmd_worker)
+
+    p = sub.add_parser("status", help="Estado de las tareas")
+    p.add_argument("run_id")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("merge", help="Escribe metrics.json de los casos terminados")
+    p.add_argument("run_id")
+    p.add_argument("--force", action="store_true",
+                   help="Reescribir casos ya escritos y escribir casos con réplicas "
+                        "pendientes o fallidas (si la réplica 0 de cada fase terminó)")
+    p.set_defaults(func=cmd_merge)
+
+    args = parser.parse_args()
+    rfm.check_case_options(parser, args)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())